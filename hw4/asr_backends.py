@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+ASR Backends
+A small interface over speech recognition engines so the app can switch
+between the reference OpenAI Whisper implementation and faster-whisper
+(CTranslate2) without changing any calling code.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+DEFAULT_BACKEND = "whisper"
+
+# Transcription options for each decode profile; the language hint is added per call
+DECODE_PROFILES = {
+    # Whisper's defaults: language detection and six-step temperature fallback
+    "default": {},
+    # Greedy decoding with at most two fallback passes, no cross-window conditioning
+    "fast": {
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": False,
+    },
+}
+
+# gTTS language codes whose Whisper code is different
+_WHISPER_LANGUAGE_ALIASES = {"iw": "he"}
+
+
+def whisper_language(tts_language: str) -> Optional[str]:
+    """Map a gTTS language code ('en', 'pt-br', 'zh-CN') to Whisper's, or None if unknown"""
+    code = tts_language.strip().lower()
+    code = _WHISPER_LANGUAGE_ALIASES.get(code, code.split("-")[0])
+    try:
+        from whisper.tokenizer import LANGUAGES
+    except ImportError:
+        return code or None
+    return code if code in LANGUAGES else None
+
+
+def decode_options(profile: str, tts_language: Optional[str] = None) -> Dict[str, Any]:
+    """Transcribe options for a profile, with a language hint in the fast profile"""
+    try:
+        options = dict(DECODE_PROFILES[profile])
+    except KeyError:
+        raise ValueError(f"Unknown decode profile '{profile}'; choose from {', '.join(DECODE_PROFILES)}")
+    if profile != "default" and tts_language:
+        # Skips Whisper's separate language-detection pass
+        language = whisper_language(tts_language)
+        if language:
+            options["language"] = language
+    return options
+
+
+def quantize_linear_layers(model):
+    """Replace a Whisper model's linear layers with dynamically quantized int8 versions"""
+    import torch
+
+    # Whisper subclasses nn.Linear only to cast weights for fp16; the quantizer
+    # accepts exact nn.Linear modules, and the fp32 forward pass is identical
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class ASRBackend(ABC):
+    """Transcribes 16 kHz mono float32 audio into a Whisper-style result dict"""
+
+    name = "base"
+    # Whether the loaded model may be shared with forked worker processes
+    fork_safe = False
+    # Whether batch_asr can decode several clips in one forward pass
+    supports_batching = False
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray, **options) -> Dict[str, Any]:
+        """Return {"text", "segments", "language"} for the audio"""
+
+    def __repr__(self) -> str:
+        return f"{self.name}:{self.model_name}"
+
+
+class WhisperBackend(ASRBackend):
+    """Reference PyTorch implementation from the openai-whisper package"""
+
+    name = "whisper"
+    supports_batching = True
+
+    def __init__(self,
+                 model_name: str = "base",
+                 device: Optional[str] = None,
+                 quantize: bool = False,
+                 threads: int = 0):
+        """
+        Load the model
+
+        Args:
+            model_name: Whisper model size ('tiny', 'base', 'small', 'medium', 'large')
+            device: Torch device; defaults to CUDA when available
+            quantize: Apply dynamic int8 quantization to the linear layers (CPU only)
+            threads: Torch intra-op threads (0 leaves torch's default)
+        """
+        super().__init__(model_name)
+        import torch
+        import whisper
+        if threads > 0:
+            torch.set_num_threads(threads)
+        self.model = whisper.load_model(model_name, device=device)
+        self.quantized = quantize and self.model.device.type == "cpu"
+        if self.quantized:
+            self.model = quantize_linear_layers(self.model)
+
+    @property
+    def fork_safe(self) -> bool:
+        # CUDA contexts don't survive a fork
+        return self.model.device.type == "cpu"
+
+    def transcribe(self, audio: np.ndarray, **options) -> Dict[str, Any]:
+        # Half precision only exists on GPU; asking for it on CPU just prints a warning
+        options.setdefault("fp16", self.model.device.type == "cuda")
+        return self.model.transcribe(audio, **options)
+
+    def __repr__(self) -> str:
+        return super().__repr__() + (" (int8)" if self.quantized else "")
+
+
+class FasterWhisperBackend(ASRBackend):
+    """CTranslate2 implementation from the faster-whisper package, much faster on CPU"""
+
+    name = "faster-whisper"
+
+    # Whisper transcribe options faster-whisper understands under the same name
+    _SUPPORTED_OPTIONS = (
+        "language", "task", "beam_size", "best_of", "patience", "temperature",
+        "condition_on_previous_text", "initial_prompt", "word_timestamps",
+        "compression_ratio_threshold", "no_speech_threshold",
+    )
+
+    def __init__(self,
+                 model_name: str = "base",
+                 device: str = "auto",
+                 compute_type: str = "default",
+                 cpu_threads: int = 0,
+                 quantize: bool = False,
+                 threads: int = 0):
+        """
+        Load the model
+
+        Args:
+            model_name: Whisper model size or a path to a converted CTranslate2 model
+            device: 'cpu', 'cuda' or 'auto'
+            compute_type: CTranslate2 precision ('int8', 'float16', 'float32', 'default')
+            cpu_threads: Threads used on CPU (0 lets CTranslate2 decide)
+            quantize: Shorthand for compute_type='int8'
+            threads: Alias for cpu_threads, shared with the other backends
+        """
+        super().__init__(model_name)
+        if quantize:
+            compute_type = "int8"
+        self.compute_type = compute_type
+        cpu_threads = threads or cpu_threads
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError("faster-whisper is not installed; run `pip install faster-whisper`") from e
+        self.model = WhisperModel(model_name, device=device, compute_type=compute_type,
+                                  cpu_threads=cpu_threads)
+
+    def transcribe(self, audio: np.ndarray, **options) -> Dict[str, Any]:
+        kwargs = {key: value for key, value in options.items() if key in self._SUPPORTED_OPTIONS}
+        if isinstance(kwargs.get("temperature"), tuple):
+            kwargs["temperature"] = list(kwargs["temperature"])
+        segments, info = self.model.transcribe(audio, **kwargs)
+
+        # Segments are generated lazily; decoding happens while iterating
+        results = [
+            {"id": i, "start": segment.start, "end": segment.end, "text": segment.text}
+            for i, segment in enumerate(segments)
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in results).strip(),
+            "segments": results,
+            "language": info.language,
+        }
+
+    def __repr__(self) -> str:
+        return super().__repr__() + (f" ({self.compute_type})" if self.compute_type != "default" else "")
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+
+def load_backend(backend: str, model_name: str, **kwargs) -> ASRBackend:
+    """Construct the named backend, e.g. load_backend('faster-whisper', 'small')"""
+    try:
+        backend_class = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown ASR backend '{backend}'; choose from {', '.join(BACKENDS)}")
+    return backend_class(model_name, **kwargs)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+ASR Backend Comparison
+Runs each configured backend over the same audio fixtures and reports
+real-time factor (processing time / audio duration) and word error rate.
+
+Fixtures are audio files with a same-named .txt reference transcript, e.g.
+fixtures/hello.wav + fixtures/hello.txt. Use --generate to synthesize a
+small set with gTTS.
+
+Usage:
+    python asr_benchmark.py fixtures/ whisper:base faster-whisper:base faster-whisper:small
+"""
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from asr_backends import load_backend
+from audio_io import WHISPER_SAMPLE_RATE, load_audio_file
+
+AUDIO_SUFFIXES = (".wav", ".flac", ".ogg", ".mp3", ".m4a")
+
+GENERATED_SENTENCES = [
+    "Hello, this is a test of the voice AI system.",
+    "What is the weather going to be like in Paris tomorrow afternoon?",
+    "Please remind me to call my sister after the meeting on Thursday.",
+    "Can you explain how a neural network learns from examples?",
+    "Set a timer for twenty five minutes and play some quiet music.",
+]
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase and strip punctuation so only word choice is scored"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length"""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+
+    # One row of the Levenshtein table at a time
+    previous = np.arange(len(hyp) + 1)
+    for i, ref_word in enumerate(ref, start=1):
+        current = np.empty_like(previous)
+        current[0] = i
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return float(previous[-1]) / len(ref)
+
+
+def load_fixtures(fixture_dir: Path) -> List[Tuple[str, np.ndarray, str]]:
+    """Return (name, 16 kHz samples, reference text) for every fixture with a transcript"""
+    fixtures = []
+    for audio_path in sorted(fixture_dir.iterdir()):
+        reference_path = audio_path.with_suffix(".txt")
+        if audio_path.suffix.lower() not in AUDIO_SUFFIXES or not reference_path.exists():
+            continue
+        samples = load_audio_file(str(audio_path))
+        if samples is None:
+            import whisper
+            samples = whisper.load_audio(str(audio_path))
+        fixtures.append((audio_path.name, samples, reference_path.read_text().strip()))
+    return fixtures
+
+
+def generate_fixtures(fixture_dir: Path, lang: str = "en") -> None:
+    """Synthesize the built-in sentences with gTTS as MP3 fixtures"""
+    from gtts import gTTS
+
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    for i, sentence in enumerate(GENERATED_SENTENCES):
+        stem = fixture_dir / f"sentence_{i:02d}"
+        gTTS(text=sentence, lang=lang, slow=False).save(str(stem.with_suffix(".mp3")))
+        stem.with_suffix(".txt").write_text(sentence + "\n")
+    print(f"✅ Generated {len(GENERATED_SENTENCES)} fixtures in {fixture_dir}")
+
+
+def benchmark(spec: str, fixtures: List[Tuple[str, np.ndarray, str]], language: str) -> Dict[str, float]:
+    """Load one backend ('backend:model') and score it on every fixture"""
+    backend_name, _, model_name = spec.partition(":")
+    started = time.perf_counter()
+    backend = load_backend(backend_name, model_name or "base")
+    load_seconds = time.perf_counter() - started
+
+    # Untimed warm-up so lazy initialization doesn't count against the first fixture
+    backend.transcribe(fixtures[0][1], language=language)
+
+    audio_seconds = processing_seconds = 0.0
+    errors = []
+    for name, samples, reference in fixtures:
+        started = time.perf_counter()
+        text = backend.transcribe(samples, language=language)["text"]
+        processing_seconds += time.perf_counter() - started
+        audio_seconds += len(samples) / WHISPER_SAMPLE_RATE
+        errors.append(word_error_rate(reference, text))
+
+    return {
+        "load_seconds": load_seconds,
+        "rtf": processing_seconds / audio_seconds,
+        "wer": float(np.mean(errors)),
+    }
+
+
+def main():
+    """Compare backends from the command line"""
+    parser = argparse.ArgumentParser(description="Compare ASR backends on the same fixtures")
+    parser.add_argument("fixtures", type=Path, help="Directory of audio files with .txt references")
+    parser.add_argument("backends", nargs="+", help="backend:model pairs, e.g. faster-whisper:small")
+    parser.add_argument("--language", default="en", help="Language hint passed to every backend")
+    parser.add_argument("--generate", action="store_true", help="Synthesize fixtures with gTTS first")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_fixtures(args.fixtures, args.language)
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"❌ No fixtures with reference transcripts found in {args.fixtures}")
+        return
+    total = sum(len(samples) for _, samples, _ in fixtures) / WHISPER_SAMPLE_RATE
+    print(f"🎧 {len(fixtures)} fixtures, {total:.1f}s of audio\n")
+
+    print(f"{'backend':<30} {'load (s)':>9} {'RTF':>7} {'WER':>7}")
+    for spec in args.backends:
+        try:
+            result = benchmark(spec, fixtures, args.language)
+            print(f"{spec:<30} {result['load_seconds']:9.1f} {result['rtf']:7.3f} {result['wer']:7.1%}")
+        except Exception as e:
+            print(f"{spec:<30} ❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
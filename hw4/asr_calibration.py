@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+ASR Model Selection
+Picks the largest Whisper model size that keeps transcription under a target
+real-time factor on this machine. Measurements are cached on disk so the
+calibration only runs once per host and configuration.
+
+The benchmark clip is a fixed English passage spoken by gTTS, cached on disk
+after the first download. Without network access a synthetic tone is used
+instead; decoding time depends on the words Whisper emits, so that result is
+only a rough estimate and is re-measured once real speech is available.
+"""
+
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from asr_backends import ASRBackend, load_backend
+from audio_io import WHISPER_SAMPLE_RATE, prepare_for_whisper
+
+# Smallest to largest, with approximate compute relative to 'tiny'
+# (from the relative speeds published for the reference implementation)
+MODEL_COSTS = {
+    "tiny": 1.0,
+    "base": 2.0,
+    "small": 5.5,
+    "medium": 16.0,
+    "large": 32.0,
+}
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.cache/voice_ai/asr_calibration.json")
+SPEECH_CLIP_PATH = os.path.expanduser("~/.cache/voice_ai/asr_calibration_speech.npy")
+CALIBRATION_SECONDS = 10.0
+CALIBRATION_TEXT = (
+    "Could you tell me what the weather will be like tomorrow morning? "
+    "I am planning a short walk to the market, and I would like to know "
+    "whether I should bring an umbrella or a warm jacket with me."
+)
+
+
+def calibration_clip(seconds: float = CALIBRATION_SECONDS) -> np.ndarray:
+    """
+    Deterministic speech-like test signal: a voiced harmonic tone with syllable-rate modulation
+
+    Good enough to warm a model up, but Whisper emits few tokens for it, so
+    decoding real speech is slower than the RTF measured on it.
+    """
+    t = np.arange(int(seconds * WHISPER_SAMPLE_RATE)) / WHISPER_SAMPLE_RATE
+    pitch = 140 + 25 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / WHISPER_SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    noise = np.random.default_rng(0).standard_normal(len(t)) * 0.01
+    return (0.1 * voiced * envelope + noise).astype(np.float32)
+
+
+def speech_clip(path: str = SPEECH_CLIP_PATH) -> Optional[np.ndarray]:
+    """CALIBRATION_TEXT spoken by gTTS at 16 kHz, cached on disk; None when it can't be synthesized"""
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+    try:
+        from gtts import gTTS
+        mp3 = io.BytesIO()
+        gTTS(text=CALIBRATION_TEXT, lang="en").write_to_fp(mp3)
+        try:
+            clip = prepare_for_whisper(mp3.getvalue())
+        except Exception:
+            # libsndfile without MP3 support; let Whisper's ffmpeg reader decode it
+            import whisper
+            with tempfile.NamedTemporaryFile(suffix=".mp3") as f:
+                f.write(mp3.getvalue())
+                f.flush()
+                clip = whisper.load_audio(f.name)
+    except Exception as e:
+        print(f"⚠️ Could not synthesize the calibration speech: {e}")
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, clip.astype(np.float32))
+    return clip
+
+
+def calibration_audio() -> Tuple[np.ndarray, str]:
+    """The benchmark clip and its kind: real speech when available, otherwise the synthetic tone"""
+    clip = speech_clip()
+    if clip is not None:
+        return clip, "speech"
+    print("⚠️ Calibrating on a synthetic tone; the selected model size is a rough estimate")
+    return calibration_clip(), "tone"
+
+
+def measure_rtf(backend: ASRBackend, clip: Optional[np.ndarray] = None) -> float:
+    """Processing time divided by audio duration for one transcription"""
+    clip = calibration_audio()[0] if clip is None else clip
+    options = {"language": "en", "temperature": 0.0, "condition_on_previous_text": False}
+    # The first call pays one-off setup costs
+    backend.transcribe(clip[:WHISPER_SAMPLE_RATE], **options)
+    started = time.perf_counter()
+    backend.transcribe(clip, **options)
+    return (time.perf_counter() - started) / (len(clip) / WHISPER_SAMPLE_RATE)
+
+
+def _cache_key(backend: str, quantize: bool, clip_kind: str) -> str:
+    """Measurements only transfer to the same machine, configuration and benchmark clip"""
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}|{backend}|int8={quantize}|{clip_kind}"
+
+
+def _load_cache(path: str) -> Dict[str, Dict[str, float]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path: str, cache: Dict[str, Dict[str, float]]) -> None:
+    """Write the cache atomically so concurrent processes never read a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def select_model_size(target_rtf: float,
+                      backend: str = "whisper",
+                      quantize: bool = False,
+                      cache_path: str = DEFAULT_CACHE_PATH) -> str:
+    """
+    Return the largest model size expected to transcribe within `target_rtf`
+
+    'tiny' is measured once; larger sizes are estimated from it with MODEL_COSTS,
+    and the chosen size is then measured itself, stepping down while it misses
+    the target. Only the measured sizes are downloaded, and every measurement is
+    cached per host, backend, quantization setting and benchmark clip.
+    """
+    clip, clip_kind = calibration_audio()
+    key = _cache_key(backend, quantize, clip_kind)
+    cache = _load_cache(cache_path)
+    measured = cache.setdefault(key, {})
+
+    def rtf_of(size: str) -> float:
+        if size not in measured:
+            print(f"⏱️ Calibrating Whisper '{size}' ({backend}{', int8' if quantize else ''})...")
+            measured[size] = measure_rtf(load_backend(backend, size, quantize=quantize), clip)
+            _save_cache(cache_path, cache)
+        return measured[size]
+
+    sizes = list(MODEL_COSTS)
+    tiny_rtf = rtf_of("tiny")
+    candidates = [size for size in sizes if tiny_rtf * MODEL_COSTS[size] <= target_rtf] or ["tiny"]
+
+    # Verify the estimate on the real model, falling back to smaller sizes
+    for size in reversed(candidates):
+        if size == "tiny" or rtf_of(size) <= target_rtf:
+            print(f"✅ Selected Whisper '{size}' (RTF {rtf_of(size):.2f}, target {target_rtf:.2f})")
+            return size
+    return "tiny"
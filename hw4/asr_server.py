@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Whisper Inference Server
+A local process that owns one warm Whisper model and transcribes audio for
+any number of client processes over a Unix socket. Samples are passed through
+shared memory, so only a small JSON header crosses the socket.
+
+Run with: python asr_server.py
+"""
+
+import json
+import os
+import socket
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+DEFAULT_SOCKET_PATH = "/tmp/voice_ai_asr.sock"
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open a client's shared memory block without taking ownership of it"""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        # Before Python 3.13 attaching also registers the block with this process's
+        # resource tracker, which would unlink it when the server exits
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(block._name, "shared_memory")
+    except Exception:
+        pass
+    return block
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Write one newline-terminated JSON message"""
+    sock.sendall(json.dumps(message, default=float).encode("utf-8") + b"\n")
+
+
+def _receive(sock_file) -> Dict[str, Any]:
+    """Read one newline-terminated JSON message"""
+    line = sock_file.readline()
+    if not line:
+        raise ConnectionError("ASR server closed the connection")
+    return json.loads(line)
+
+
+class ASRServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves transcription requests against a single shared Whisper model"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, model, workers: int = 1):
+        """
+        Initialize the server
+
+        Args:
+            socket_path: Filesystem path of the Unix socket to listen on
+            model: Loaded ASR backend (or anything with Whisper's transcribe method)
+            workers: Transcriptions run at the same time; further requests queue
+        """
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.model = model
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asr")
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def transcribe(self, audio: np.ndarray, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Run Whisper on the worker pool and wait for the result"""
+        return self.executor.submit(self.model.transcribe, audio, **options).result()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(wait=False)
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One request per connection: a header naming the audio block, then the result"""
+
+    def handle(self) -> None:
+        try:
+            request = _receive(self.rfile)
+            if request.get("describe"):
+                # The backend and model that actually decode, e.g. after WHISPER_MODEL=auto
+                _send(self.connection, {"model": repr(self.server.model)})
+                return
+            block = _attach(request["shm"])
+            try:
+                # Copy out so the client can release the block as soon as we reply
+                audio = np.ndarray((request["samples"],), dtype=np.float32, buffer=block.buf).copy()
+            finally:
+                block.close()
+            result = self.server.transcribe(audio, request.get("options", {}))
+            _send(self.connection, {"text": result["text"], "segments": result.get("segments", []),
+                                    "language": result.get("language")})
+        except Exception as e:
+            try:
+                _send(self.connection, {"error": f"{type(e).__name__}: {e}"})
+            except OSError:
+                pass
+
+
+class ASRClient:
+    """Sends audio to an ASRServer through shared memory"""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: Optional[float] = 300.0):
+        """
+        Initialize the client
+
+        Args:
+            socket_path: Unix socket the server listens on
+            timeout: Seconds to wait for a transcription before giving up
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def is_available(self) -> bool:
+        """Whether a server is listening on the socket"""
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.socket_path)
+            return True
+        except OSError:
+            return False
+
+    def model(self) -> str:
+        """Backend and model the server decodes with, e.g. 'whisper:small (int8)'"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            _send(sock, {"describe": True})
+            with sock.makefile("rb") as sock_file:
+                response = _receive(sock_file)
+        if "error" in response:
+            raise RuntimeError(f"ASR server error: {response['error']}")
+        return response["model"]
+
+    def transcribe(self, audio: np.ndarray, **options) -> Dict[str, Any]:
+        """Transcribe 16 kHz mono float32 samples; returns a Whisper-style result dict"""
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        block = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+        try:
+            np.ndarray(audio.shape, dtype=np.float32, buffer=block.buf)[:] = audio
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                _send(sock, {"shm": block.name, "samples": len(audio), "options": options})
+                with sock.makefile("rb") as sock_file:
+                    response = _receive(sock_file)
+        finally:
+            block.close()
+            block.unlink()
+
+        if "error" in response:
+            raise RuntimeError(f"ASR server error: {response['error']}")
+        return response
+
+
+def main():
+    """Load the model and serve until interrupted"""
+    from dotenv import load_dotenv
+    from asr_backends import load_backend
+
+    load_dotenv()
+    socket_path = os.getenv("ASR_SERVER_SOCKET") or DEFAULT_SOCKET_PATH
+    model_name = os.getenv("WHISPER_MODEL", "base")
+    backend = os.getenv("ASR_BACKEND", "whisper")
+    quantize = os.getenv("WHISPER_QUANTIZE", "false").strip().lower() in ("1", "true", "yes", "on")
+    if model_name == "auto":
+        from asr_calibration import select_model_size
+        model_name = select_model_size(float(os.getenv("WHISPER_TARGET_RTF", "0.5")), backend, quantize)
+    workers = int(os.getenv("ASR_WORKERS", "1"))
+
+    print(f"Loading Whisper model: {model_name} ({backend})")
+    model = load_backend(backend, model_name, quantize=quantize)
+
+    server = ASRServer(socket_path, model, workers=workers)
+    print(f"🎧 ASR server listening on {socket_path} ({workers} worker{'s' if workers != 1 else ''})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 ASR server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
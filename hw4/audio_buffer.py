@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Audio Ring Buffer
+Preallocated in-memory storage for microphone audio, ready to hand to Whisper.
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+from audio_io import WHISPER_SAMPLE_RATE
+
+
+class AudioRingBuffer:
+    """Fixed-size mono float32 ring buffer that keeps the most recent audio"""
+
+    def __init__(self, max_seconds: float, sample_rate: int = WHISPER_SAMPLE_RATE, channels: int = 1):
+        """
+        Initialize the ring buffer
+
+        Args:
+            max_seconds: Maximum duration of audio kept in the buffer
+            sample_rate: Sample rate of the incoming audio
+            channels: Number of interleaved channels in the incoming audio
+        """
+        if max_seconds <= 0:
+            raise ValueError("max_seconds must be positive")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.capacity = int(max_seconds * sample_rate)
+        self._buffer = np.zeros(self.capacity, dtype=np.float32)
+        self._write_pos = 0
+        self._size = 0
+        self._total_written = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def duration(self) -> float:
+        """Duration of the buffered audio in seconds"""
+        return self._size / self.sample_rate
+
+    @property
+    def total_written(self) -> int:
+        """Number of samples written since the last clear (an absolute stream position)"""
+        return self._total_written
+
+    @property
+    def overflowed(self) -> bool:
+        """Whether older audio has been overwritten since the last clear"""
+        return self._total_written > self.capacity
+
+    def clear(self) -> None:
+        """Discard all buffered audio without reallocating"""
+        with self._lock:
+            self._write_pos = 0
+            self._size = 0
+            self._total_written = 0
+
+    def write_pcm16(self, data: bytes) -> np.ndarray:
+        """Append interleaved 16-bit PCM bytes, downmixing to mono; returns the mono samples"""
+        samples = np.frombuffer(data, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples[: len(samples) - len(samples) % self.channels]
+            mono = samples.reshape(-1, self.channels).mean(axis=1, dtype=np.float32)
+        else:
+            mono = samples.astype(np.float32)
+        mono *= 1.0 / 32768.0
+        self.write(mono)
+        return mono
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append mono float32 samples, overwriting the oldest audio when full"""
+        samples = np.asarray(samples, dtype=np.float32).ravel()
+        n = len(samples)
+        if n == 0:
+            return
+
+        with self._lock:
+            self._total_written += n
+            if n >= self.capacity:
+                # Only the tail fits; it fills the whole buffer
+                self._buffer[:] = samples[-self.capacity:]
+                self._write_pos = 0
+                self._size = self.capacity
+                return
+
+            first = min(n, self.capacity - self._write_pos)
+            self._buffer[self._write_pos:self._write_pos + first] = samples[:first]
+            if first < n:
+                self._buffer[:n - first] = samples[first:]
+            self._write_pos = (self._write_pos + n) % self.capacity
+            self._size = min(self._size + n, self.capacity)
+
+    def read(self, last_seconds: Optional[float] = None) -> np.ndarray:
+        """Return a chronological copy of the buffered audio (optionally only the tail)"""
+        with self._lock:
+            count = self._size
+            if last_seconds is not None:
+                count = min(count, int(last_seconds * self.sample_rate))
+            return self._read_tail(count)
+
+    def read_from(self, position: int) -> np.ndarray:
+        """Return audio written since an absolute stream position (clamped to what is still buffered)"""
+        with self._lock:
+            count = min(self._size, self._total_written - max(position, 0))
+            return self._read_tail(count)
+
+    def _read_tail(self, count: int) -> np.ndarray:
+        """Copy the newest `count` samples; the caller must hold the lock"""
+        if count <= 0:
+            return np.zeros(0, dtype=np.float32)
+
+        start = (self._write_pos - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._buffer[start:start + count].copy()
+        return np.concatenate((self._buffer[start:], self._buffer[:self._write_pos]))
+
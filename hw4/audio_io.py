@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Audio Ingestion
+In-memory decode, downmix, sample-format conversion and polyphase resampling
+to the 16 kHz mono float32 input Whisper expects, without temp files or ffmpeg.
+"""
+
+import io
+import wave
+from math import gcd
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+# Whisper models expect 16 kHz mono float32 audio
+WHISPER_SAMPLE_RATE = 16000
+
+# Zero crossings of the windowed-sinc filter on each side of its center
+FILTER_ZERO_CROSSINGS = 10
+KAISER_BETA = 5.0
+# Output samples computed per vectorized block (bounds temporary memory)
+RESAMPLE_BLOCK = 16384
+
+_filter_cache: Dict[Tuple[int, int], np.ndarray] = {}
+
+
+def to_float32(audio: np.ndarray) -> np.ndarray:
+    """Convert integer or float PCM samples to float32 in [-1, 1]"""
+    audio = np.asarray(audio)
+    if audio.dtype == np.float32:
+        return audio
+    if np.issubdtype(audio.dtype, np.floating):
+        return audio.astype(np.float32)
+    if audio.dtype == np.uint8:
+        # 8-bit PCM is unsigned with a 128 offset
+        return (audio.astype(np.float32) - 128.0) / 128.0
+    if np.issubdtype(audio.dtype, np.integer):
+        scale = float(2 ** (8 * audio.dtype.itemsize - 1))
+        return audio.astype(np.float32) / scale
+    raise ValueError(f"Unsupported sample format: {audio.dtype}")
+
+
+def downmix(audio: np.ndarray) -> np.ndarray:
+    """Average channels of a (samples, channels) array into mono"""
+    if audio.ndim == 1:
+        return audio
+    if audio.ndim != 2:
+        raise ValueError(f"Expected 1-D or 2-D audio, got shape {audio.shape}")
+    # Gradio uses (samples, channels); tolerate (channels, samples) for short channel counts
+    if audio.shape[0] < audio.shape[1] and audio.shape[0] <= 8:
+        audio = audio.T
+    return audio.mean(axis=1, dtype=np.float32)
+
+
+def _polyphase_filter(up: int, down: int) -> np.ndarray:
+    """Kaiser-windowed sinc low-pass, arranged as (up, taps_per_phase)"""
+    key = (up, down)
+    if key not in _filter_cache:
+        factor = max(up, down)
+        half = FILTER_ZERO_CROSSINGS * factor
+        n = np.arange(-half, half + 1, dtype=np.float64)
+        # Cut off at the lower of the two Nyquist rates, in upsampled-grid units
+        h = np.sinc(n / factor) * np.kaiser(len(n), KAISER_BETA) * (up / factor)
+
+        taps = -(-len(h) // up)
+        padded = np.zeros(taps * up, dtype=np.float64)
+        padded[:len(h)] = h
+        # Row p holds h[p], h[p + up], h[p + 2*up], ...
+        _filter_cache[key] = padded.reshape(taps, up).T.astype(np.float32)
+    return _filter_cache[key]
+
+
+def resample_poly(audio: np.ndarray, orig_sr: int, target_sr: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """Polyphase resampling of mono float audio by the rational factor target_sr / orig_sr"""
+    audio = np.asarray(audio, dtype=np.float32)
+    if orig_sr == target_sr or len(audio) == 0:
+        return audio
+
+    g = gcd(int(orig_sr), int(target_sr))
+    up, down = int(target_sr) // g, int(orig_sr) // g
+    bank = _polyphase_filter(up, down)
+    taps = bank.shape[1]
+    half = FILTER_ZERO_CROSSINGS * max(up, down)
+
+    # Zero-pad so every filter tap has an input sample to read
+    padded = np.concatenate((np.zeros(taps, dtype=np.float32), audio, np.zeros(taps + 1, dtype=np.float32)))
+    n_out = -(-len(audio) * up // down)
+    out = np.empty(n_out, dtype=np.float32)
+    tap_offsets = np.arange(taps)
+
+    for start in range(0, n_out, RESAMPLE_BLOCK):
+        n = np.arange(start, min(start + RESAMPLE_BLOCK, n_out), dtype=np.int64)
+        # Position on the upsampled grid, shifted so the filter is centered
+        position = n * down + half
+        base, phase = np.divmod(position, up)
+        indices = (base + taps)[:, None] - tap_offsets[None, :]
+        out[start:start + len(n)] = np.einsum("ij,ij->i", bank[phase], padded[indices])
+    return out
+
+
+def _decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode PCM WAV bytes with the standard library"""
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        sample_rate = wf.getframerate()
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        frames = wf.readframes(wf.getnframes())
+
+    if width == 3:
+        # 24-bit PCM: widen to int32 by placing the three bytes in the high end
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+        samples = np.zeros((len(raw), 4), dtype=np.uint8)
+        samples[:, 1:] = raw
+        samples = samples.view("<i4").ravel()
+    else:
+        dtype = {1: np.uint8, 2: "<i2", 4: "<i4"}[width]
+        samples = np.frombuffer(frames, dtype=dtype)
+    return samples.reshape(-1, channels), sample_rate
+
+
+def decode_audio_bytes(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode encoded audio bytes in-process; returns (samples, sample_rate)"""
+    try:
+        import soundfile as sf
+        samples, sample_rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+        return samples, sample_rate
+    except ImportError:
+        pass
+    except Exception:
+        # libsndfile could not parse it; try the standard-library WAV reader below
+        pass
+    return _decode_wav(data)
+
+
+def prepare_for_whisper(audio: Union[np.ndarray, bytes, Tuple[int, np.ndarray]],
+                        sample_rate: Optional[int] = None) -> np.ndarray:
+    """
+    Convert audio to 16 kHz mono float32 entirely in memory
+
+    Args:
+        audio: A sample array, a Gradio-style (sample_rate, samples) tuple,
+            or encoded file bytes (WAV, FLAC, OGG, and MP3 with recent libsndfile)
+        sample_rate: Sample rate of a bare sample array (defaults to 16 kHz)
+    """
+    if isinstance(audio, tuple):
+        sample_rate, audio = audio
+    elif isinstance(audio, (bytes, bytearray, memoryview)):
+        audio, sample_rate = decode_audio_bytes(bytes(audio))
+
+    samples = downmix(to_float32(audio))
+    return resample_poly(samples, sample_rate or WHISPER_SAMPLE_RATE, WHISPER_SAMPLE_RATE)
+
+
+def load_audio_file(path: str) -> Optional[np.ndarray]:
+    """Read and convert an audio file in-process; returns None if it needs ffmpeg"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        return prepare_for_whisper(data)
+    except Exception:
+        return None
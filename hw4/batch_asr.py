@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Batched Speech Recognition
+Decodes several short clips in one Whisper forward pass, plus a micro-batching
+scheduler that groups concurrent requests arriving within a short window.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Tuple, Union
+
+import numpy as np
+import torch
+import whisper
+
+from audio_io import load_audio_file, prepare_for_whisper
+
+AudioInput = Union[str, bytes, np.ndarray, Tuple[int, np.ndarray]]
+
+# Whisper's encoder sees at most 30 seconds at a time
+MAX_BATCH_CLIP_SAMPLES = whisper.audio.N_SAMPLES
+
+
+def load_clip(audio: AudioInput) -> np.ndarray:
+    """Convert any supported input to 16 kHz mono float32 samples"""
+    if isinstance(audio, str):
+        # Decode in-process when possible; ffmpeg handles the remaining formats
+        samples = load_audio_file(audio)
+        return samples if samples is not None else whisper.load_audio(audio)
+    return prepare_for_whisper(audio)
+
+
+def _decoding_options(transcribe_options: dict) -> dict:
+    """Reduce transcribe options to the DecodingOptions fields of one decoding pass"""
+    fields = whisper.DecodingOptions.__dataclass_fields__
+    options = {key: value for key, value in transcribe_options.items() if key in fields}
+    if isinstance(options.get("temperature"), (tuple, list)):
+        # Batched decoding makes a single pass at the first temperature
+        options["temperature"] = options["temperature"][0]
+    return options
+
+
+def decode_clips(model, clips: List[np.ndarray], **decode_options) -> List[str]:
+    """Decode clips of at most 30 seconds together as one padded mel batch"""
+    mels = [
+        whisper.log_mel_spectrogram(whisper.pad_or_trim(clip), model.dims.n_mels)
+        for clip in clips
+    ]
+    batch = torch.stack(mels).to(model.device)
+
+    decode_options.setdefault("fp16", model.device.type == "cuda")
+    decode_options.setdefault("without_timestamps", True)
+    results = whisper.decode(model, batch, whisper.DecodingOptions(**decode_options))
+    return [result.text.strip() for result in results]
+
+
+def transcribe_batch(model,
+                     audios: List[AudioInput],
+                     **decode_options) -> List[Union[str, Exception]]:
+    """
+    Transcribe several inputs, batching the short ones into a single forward pass
+
+    Each entry of the result is either the transcript or the exception raised for
+    that input, so one unreadable upload never fails the rest of the batch.
+    """
+    results: List[Union[str, Exception, None]] = [None] * len(audios)
+    short_indices, short_clips = [], []
+
+    for i, audio in enumerate(audios):
+        try:
+            clip = load_clip(audio)
+        except Exception as e:
+            results[i] = e
+            continue
+
+        if len(clip) <= MAX_BATCH_CLIP_SAMPLES:
+            short_indices.append(i)
+            short_clips.append(clip)
+        else:
+            # Long inputs need Whisper's sliding 30-second window
+            try:
+                results[i] = model.transcribe(clip, **decode_options)["text"].strip()
+            except Exception as e:
+                results[i] = e
+
+    if short_clips:
+        try:
+            texts = decode_clips(model, short_clips, **_decoding_options(decode_options))
+            for i, text in zip(short_indices, texts):
+                results[i] = text
+        except Exception:
+            # Retry one by one so a single bad clip only fails its own request
+            for i, clip in zip(short_indices, short_clips):
+                try:
+                    results[i] = decode_clips(model, [clip], **_decoding_options(decode_options))[0]
+                except Exception as e:
+                    results[i] = e
+
+    return results
+
+
+class MicroBatcher:
+    """Collects requests that arrive within a short window and runs them as one batch"""
+
+    def __init__(self,
+                 batch_fn: Callable[[List[Any]], List[Any]],
+                 window_ms: float = 50.0,
+                 max_batch_size: int = 8):
+        """
+        Initialize the scheduler
+
+        Args:
+            batch_fn: Processes a list of inputs; each output is a result or an Exception
+            window_ms: How long to wait for more requests after the first one arrives
+            max_batch_size: Largest batch handed to `batch_fn`
+        """
+        self.batch_fn = batch_fn
+        self.window_seconds = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one input and return a future for its result"""
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _collect(self) -> list:
+        """Block for the first request, then gather more until the window closes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Scheduler loop"""
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                outputs = self.batch_fn(items)
+            except Exception as e:
+                outputs = [e] * len(batch)
+
+            for (_, future), output in zip(batch, outputs):
+                if isinstance(output, Exception):
+                    future.set_exception(output)
+                else:
+                    future.set_result(output)
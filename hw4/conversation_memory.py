@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Rolling Conversation Memory
+Keeps recent turns verbatim within a token budget and folds older turns into
+an incrementally updated summary, so prompt size stays flat in long sessions.
+Folding calls the LLM, so it runs on a background thread and never delays a reply.
+"""
+
+import threading
+from typing import Callable, List, Optional, Tuple
+
+# Rough token estimate for Gemini-style tokenizers (about four characters per token)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate that needs no API call"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def extractive_summary(summary: str, messages: list, max_chars: int) -> str:
+    """Fallback summarizer: append a trimmed transcript of the folded turns"""
+    lines = [summary] if summary else []
+    for i, msg in enumerate(messages):
+        role = "User" if i % 2 == 0 else "Assistant"
+        lines.append(f"{role}: {msg.content[:200]}")
+    text = "\n".join(lines)
+    # Keep the most recent part when the summary outgrows its share of the budget
+    return text[-max_chars:]
+
+
+class RollingConversationMemory:
+    """
+    Drop-in replacement for ConversationBufferMemory with a token budget
+
+    Exposes the same `chat_memory.messages`, `save_context` and `clear` surface that
+    VoiceAI and the Gradio app use, plus a running `summary` of folded turns.
+    """
+
+    def __init__(self,
+                 max_tokens: int = 2000,
+                 keep_turns: int = 4,
+                 summarize_fn: Optional[Callable[[str, list, int], str]] = None):
+        """
+        Initialize the memory
+
+        Args:
+            max_tokens: Token budget for the summary plus verbatim history
+            keep_turns: Most recent user/assistant turns always kept verbatim
+            summarize_fn: Folds messages into the summary:
+                (previous_summary, messages, max_summary_tokens) -> new_summary
+        """
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.summarize_fn = summarize_fn
+        self.summary = ""
+        self.summary_tokens = 0
+        self._entries: List[Tuple[object, int]] = []
+        self._history_tokens = 0
+        self._lock = threading.Lock()
+        # Background folding: at most one at a time; `clear` bumps the generation so
+        # a fold that started before it doesn't write into the new conversation
+        self._folding = False
+        self._generation = 0
+        self._fold_done = threading.Event()
+        self._fold_done.set()
+
+    @property
+    def chat_memory(self) -> "RollingConversationMemory":
+        # VoiceAI and the Gradio app read `memory.chat_memory.messages`
+        return self
+
+    @property
+    def messages(self) -> list:
+        """Verbatim messages, oldest first"""
+        return [message for message, _ in self._entries]
+
+    @property
+    def total_tokens(self) -> int:
+        return self.summary_tokens + self._history_tokens
+
+    def save_context(self, inputs: dict, outputs: dict) -> None:
+        """Record one user/assistant turn; older turns are folded in the background if over budget"""
+        from langchain.schema import AIMessage, HumanMessage
+
+        with self._lock:
+            for message in (HumanMessage(content=inputs["input"]), AIMessage(content=outputs["output"])):
+                # Token counts are computed once per message and cached alongside it
+                tokens = estimate_tokens(message.content)
+                self._entries.append((message, tokens))
+                self._history_tokens += tokens
+
+            self._schedule_fold()
+
+    def _schedule_fold(self) -> None:
+        """Start a background fold when over budget and none is running; the caller holds the lock"""
+        if self._folding or self.total_tokens <= self.max_tokens or len(self._entries) <= 2 * self.keep_turns:
+            return
+        self._folding = True
+        self._fold_done.clear()
+        threading.Thread(target=self._fold, args=(self._generation,), daemon=True).start()
+
+    def _fold(self, generation: int) -> None:
+        """Move all but the most recent turns into the summary; runs on a background thread"""
+        try:
+            with self._lock:
+                if generation != self._generation:
+                    return
+                folded = self._entries[:len(self._entries) - 2 * self.keep_turns]
+                previous = self.summary
+
+            # Summarizing may be an LLM round trip, so the lock isn't held meanwhile
+            max_summary_tokens = max(self.max_tokens // 4, 1)
+            messages = [message for message, _ in folded]
+            summary = None
+            if self.summarize_fn is not None:
+                try:
+                    summary = self.summarize_fn(previous, messages, max_summary_tokens)
+                except Exception as e:
+                    print(f"Warning: Could not summarize conversation, using extract: {e}")
+            if not summary:
+                summary = extractive_summary(previous, messages, max_summary_tokens * CHARS_PER_TOKEN)
+
+            with self._lock:
+                if generation != self._generation:
+                    return
+                # Turns are only ever appended, so the folded ones are still the oldest
+                self._entries = self._entries[len(folded):]
+                self._history_tokens -= sum(tokens for _, tokens in folded)
+                self.summary = summary.strip()[-max_summary_tokens * CHARS_PER_TOKEN:]
+                self.summary_tokens = estimate_tokens(self.summary)
+        finally:
+            with self._lock:
+                self._folding = False
+                self._fold_done.set()
+                # Turns saved during the fold may have pushed it over budget again
+                self._schedule_fold()
+
+    def wait_for_fold(self, timeout: Optional[float] = None) -> bool:
+        """Block until no fold is running; returns False on timeout"""
+        return self._fold_done.wait(timeout)
+
+    def clear(self) -> None:
+        """Forget the whole conversation"""
+        with self._lock:
+            self._generation += 1
+            self._entries = []
+            self._history_tokens = 0
+            self.summary = ""
+            self.summary_tokens = 0
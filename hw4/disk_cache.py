@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Disk Cache
+A size-bounded, content-addressed LRU cache of files on disk that several
+processes can share safely.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class DiskLRUCache:
+    """Content-addressed file cache with LRU eviction and hit/miss counters"""
+
+    def __init__(self, cache_dir: str, max_bytes: int, suffix: str = ""):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding the cached files (created if missing)
+            max_bytes: Total size above which the least recently used files are evicted
+            suffix: File extension for cached entries, e.g. ".mp3"
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash the key parts into a stable cache key"""
+        digest = hashlib.sha256()
+        for part in parts:
+            encoded = part.encode("utf-8")
+            # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+            digest.update(len(encoded).to_bytes(8, "little"))
+            digest.update(encoded)
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def contains_path(self, path: str) -> bool:
+        """Whether a file path lives inside this cache"""
+        try:
+            return Path(path).resolve().parent == self.cache_dir.resolve()
+        except OSError:
+            return False
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file path for a key, or None on a miss"""
+        path = self.path_for(key)
+        try:
+            # Touching the file marks it as recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return str(path)
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Return the cached contents for a key, or None on a miss"""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # Evicted by another process between the lookup and the read
+            return None
+
+    def put(self, key: str, data: bytes) -> str:
+        """Store data under a key atomically and return the cached file path"""
+        path = self.path_for(key)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=self.suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            # Readers only ever see a missing or a complete file
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self.evict()
+        return str(path)
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(".tmp-") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass  # Another process evicted it first
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Full-duplex Conversation
+Keeps the microphone open for the whole conversation, so the next turn is
+captured and transcribed while the previous reply is still playing. The reply
+leaking back into the microphone is gated out by comparing the input level
+with the playback level, and speaking over a reply interrupts it (barge-in).
+
+The microphone and the player measure level on different scales (input gain,
+speaker volume, distance), so the ratio between them is calibrated at start by
+playing a short probe and measuring how much of it the microphone picks up.
+"""
+
+import copy
+import math
+import threading
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from asr_calibration import calibration_clip
+from audio_buffer import AudioRingBuffer
+from audio_io import WHISPER_SAMPLE_RATE, downmix, to_float32
+from streaming_asr import StreamingTranscriber
+
+PROBE_SECONDS = 1.0
+# Never let a near-silent probe pick-up disable the gate completely
+MIN_ECHO_RATIO = 0.05
+
+
+class EchoGate:
+    """Mutes microphone frames that are no louder than the audio being played"""
+
+    def __init__(self,
+                 output_level: Callable[[], float],
+                 sample_rate: int,
+                 echo_ratio: float = 1.0,
+                 hold_seconds: float = 0.25):
+        """
+        Initialize the gate
+
+        Args:
+            output_level: Returns the RMS of the block currently sent to the speaker
+            sample_rate: Sample rate of the microphone frames
+            echo_ratio: Input must exceed this multiple of the playback level to count
+                as the user's voice; raise it for loud speakers close to the microphone
+            hold_seconds: How long the playback level is remembered, covering the
+                device latency and room reverberation between speaker and microphone
+        """
+        self.output_level = output_level
+        self.sample_rate = sample_rate
+        self.echo_ratio = echo_ratio
+        self.hold_seconds = hold_seconds
+        self._envelope = 0.0
+        self._coupling: Optional[List[float]] = None
+        self.frames_gated = 0
+
+    def filter(self, samples: np.ndarray) -> np.ndarray:
+        """Return the frame unchanged, or silence if it is explained by echo"""
+        if len(samples) == 0:
+            return samples
+        decay = math.exp(-len(samples) / (self.sample_rate * self.hold_seconds))
+        self._envelope = max(self.output_level(), self._envelope * decay)
+
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float32))))
+        if self._coupling is not None:
+            # Calibrating: everything heard is the probe, so nothing reaches the endpointer
+            if self._envelope > 0:
+                self._coupling.append(rms / self._envelope)
+            return np.zeros_like(samples)
+        if self._envelope > 0 and rms < self.echo_ratio * self._envelope:
+            self.frames_gated += 1
+            return np.zeros_like(samples)
+        return samples
+
+    def start_calibration(self) -> None:
+        """Start measuring microphone level against playback level; input is muted meanwhile"""
+        self._coupling = []
+
+    def finish_calibration(self, margin: float = 2.0) -> Optional[float]:
+        """
+        Set `echo_ratio` from the measured speaker-to-microphone coupling
+
+        The ratio becomes `margin` times the 95th percentile of the coupling, so the
+        echo stays gated while the user, who is louder than their own echo, is not.
+        Returns the new ratio, or None (keeping the old one) if nothing was measured.
+        """
+        coupling, self._coupling = self._coupling, None
+        if not coupling:
+            return None
+        self.echo_ratio = max(MIN_ECHO_RATIO, margin * float(np.percentile(coupling, 95)))
+        return self.echo_ratio
+
+
+class DuplexConversation:
+    """Hands-free turn loop: listen, reply in the background, and keep listening"""
+
+    def __init__(self,
+                 voice_ai,
+                 echo_ratio: Optional[float] = None,
+                 barge_in: bool = True,
+                 pre_roll_seconds: float = 0.3):
+        """
+        Initialize the conversation
+
+        Args:
+            voice_ai: VoiceAI used for transcription, replies and playback
+            echo_ratio: See EchoGate; when None it is calibrated with a probe at start
+            barge_in: Stop the reply as soon as the user starts speaking over it
+            pre_roll_seconds: Audio kept before the detected speech onset, so the
+                first syllable isn't clipped
+        """
+        self.voice_ai = voice_ai
+        self.barge_in = barge_in
+        self.pre_roll_seconds = pre_roll_seconds
+        self.sample_rate = voice_ai.sample_rate
+        self.channels = voice_ai.channels
+
+        self.audio_buffer = AudioRingBuffer(voice_ai.max_record_seconds, self.sample_rate, self.channels)
+        self.endpointer = copy.copy(voice_ai.endpointer)
+        self.endpointer.reset()
+        self.calibrate_echo_ratio = echo_ratio is None
+        self.gate = EchoGate(lambda: self._output_level(), self.sample_rate, echo_ratio or 1.0)
+
+        self.speech_started = threading.Event()
+        self.end_of_speech = threading.Event()
+        self._onset_position = 0
+        self._idle_seconds = 0.0
+        self._reply_thread: Optional[threading.Thread] = None
+        self._pyaudio = None
+        self._audio = None
+        self._stream = None
+        self.turns = 0
+        self.barge_ins = 0
+
+    def _output_level(self) -> float:
+        player = self.voice_ai._shared.player
+        return player.output_level if player is not None else 0.0
+
+    def _is_playing(self) -> bool:
+        player = self.voice_ai._shared.player
+        return player is not None and player.is_playing
+
+    def start(self) -> None:
+        """Open the microphone; it stays open until stop()"""
+        import pyaudio
+        self._pyaudio = pyaudio
+        self._audio = pyaudio.PyAudio()
+        self._stream = self._audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.voice_ai.chunk_size,
+            stream_callback=self._callback
+        )
+        self._stream.start_stream()
+
+    def calibrate_echo(self) -> float:
+        """Play a short speech-like probe and set the echo gate ratio from how loud it comes back"""
+        probe = calibration_clip(PROBE_SECONDS)
+        self.gate.start_calibration()
+        try:
+            player = self.voice_ai.player
+            player.play(probe, sample_rate=WHISPER_SAMPLE_RATE).wait()
+            # Keep measuring through the device latency and room reverberation
+            threading.Event().wait(self.gate.hold_seconds)
+        finally:
+            ratio = self.gate.finish_calibration()
+        if ratio is None:
+            print(f"⚠️ Echo calibration heard nothing; using echo gate ratio {self.gate.echo_ratio}")
+        else:
+            print(f"🔈 Echo gate calibrated: ratio {ratio:.2f}")
+        return self.gate.echo_ratio
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PyAudio input callback: gate echo, buffer the frame and update the endpointer"""
+        pcm = np.frombuffer(in_data, dtype=np.int16)
+        if self.channels > 1:
+            pcm = pcm[: len(pcm) - len(pcm) % self.channels].reshape(-1, self.channels)
+        samples = self.gate.filter(downmix(to_float32(pcm)))
+        self.audio_buffer.write(samples)
+
+        endpointer = self.endpointer
+        if not self.end_of_speech.is_set() and endpointer.process(samples):
+            self.end_of_speech.set()
+
+        if not self.speech_started.is_set():
+            if endpointer.speech_started:
+                pre_roll = endpointer.speech_seconds + endpointer.silence_seconds + self.pre_roll_seconds
+                self._onset_position = self.audio_buffer.total_written - int(pre_roll * self.sample_rate)
+                self.speech_started.set()
+                if self.barge_in and self._is_playing():
+                    self.barge_ins += 1
+                    self.voice_ai.stop_playback()
+            elif endpointer.speech_seconds > 0:
+                # Isolated clicks and blips shouldn't add up to an utterance over time
+                rms = float(np.sqrt(np.mean(np.square(samples)))) if len(samples) else 0.0
+                if endpointer.is_speech(rms):
+                    self._idle_seconds = 0.0
+                else:
+                    self._idle_seconds += len(samples) / self.sample_rate
+                if self._idle_seconds >= endpointer.silence_seconds:
+                    endpointer.reset()
+                    self._idle_seconds = 0.0
+        return (None, self._pyaudio.paContinue)
+
+    def listen(self, speculation=None) -> str:
+        """Wait for the next utterance and return its transcript; the mic stays open throughout"""
+        self.speech_started.wait()
+        transcriber = StreamingTranscriber(
+            self.voice_ai._run_whisper,
+            self.audio_buffer,
+            on_partial=self.voice_ai.partial_handler(speculation)
+        )
+        transcriber.start(max(self._onset_position, 0))
+
+        self.end_of_speech.wait(self.voice_ai.max_record_seconds)
+        # Re-arm before decoding the tail so the next turn is already being captured
+        self.endpointer.reset()
+        self._idle_seconds = 0.0
+        self.speech_started.clear()
+        self.end_of_speech.clear()
+        return transcriber.finish()
+
+    def respond(self, transcript: str, speculation=None) -> None:
+        """Reply in the background, so listening resumes immediately"""
+        self.turns += 1
+        self._reply_thread = threading.Thread(
+            target=self._reply,
+            args=(self._reply_thread, transcript, speculation),
+            daemon=True
+        )
+        self._reply_thread.start()
+
+    def _reply(self, previous: Optional[threading.Thread], transcript: str, speculation) -> None:
+        """Speak after the previous reply has finished or been interrupted"""
+        if previous is not None:
+            previous.join()
+        self.voice_ai.process_transcript(transcript, speculation)
+
+    def wait_for_reply(self) -> None:
+        """Block until the reply in progress has been spoken"""
+        if self._reply_thread is not None:
+            self._reply_thread.join()
+            self._reply_thread = None
+
+    def run(self) -> None:
+        """Converse until Ctrl+C"""
+        self.start()
+        if self.calibrate_echo_ratio:
+            try:
+                self.calibrate_echo()
+            except Exception as e:
+                print(f"❌ Error calibrating the echo gate: {e}")
+        print("🎤 Hands-free mode: just speak; talk over a reply to interrupt it (Ctrl+C to stop)")
+        try:
+            while True:
+                speculation = self.voice_ai.start_speculation()
+                transcript = self.listen(speculation)
+                if not transcript:
+                    if speculation is not None:
+                        speculation.cancel()
+                    continue
+                print(f"📝 Transcription: {transcript}")
+                self.respond(transcript, speculation)
+        except KeyboardInterrupt:
+            print()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Interrupt any reply and close the microphone"""
+        self.voice_ai.stop_playback()
+        self.wait_for_reply()
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._audio is not None:
+            self._audio.terminate()
+            self._audio = None
+        print(f"🎤 Hands-free mode ended: {self.turns} turns, {self.barge_ins} barge-ins, "
+              f"{self.gate.frames_gated} echo frames gated")
+
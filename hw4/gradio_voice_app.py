@@ -5,14 +5,19 @@ A web-based interface for the Voice AI application using Gradio.
 """
 
 import os
-import tempfile
+from typing import AsyncIterator, Optional, Tuple
+
 import gradio as gr
 from dotenv import load_dotenv
-from voice_ai_app import VoiceAI
+from voice_ai_app import VoiceAI, format_startup_report, _env_flag, llm_models_from_env
+from session_manager import SessionManager
 
 # Load environment variables
 load_dotenv()
 
+# Rough fixed cost of one session view on top of its conversation text
+SESSION_OVERHEAD_BYTES = 4096
+
 class GradioVoiceAI:
     """Gradio-based Voice AI interface"""
     
@@ -20,90 +25,168 @@ class GradioVoiceAI:
         """Initialize the Gradio Voice AI"""
         tts_language = os.getenv("DEFAULT_TTS_LANGUAGE", "en")
         whisper_model = os.getenv("WHISPER_MODEL", "base")
+        self.batch_window_ms = float(os.getenv("ASR_BATCH_WINDOW_MS", "0"))
+        self.max_batch_size = int(os.getenv("ASR_MAX_BATCH_SIZE", "8"))
         
+        # Shared Whisper model, Gemini client and caches; sessions get lightweight views
         self.voice_ai = VoiceAI(
             tts_language=tts_language,
-            whisper_model=whisper_model
+            whisper_model=whisper_model,
+            asr_backend=os.getenv("ASR_BACKEND", "whisper"),
+            whisper_quantize=_env_flag("WHISPER_QUANTIZE"),
+            target_rtf=float(os.getenv("WHISPER_TARGET_RTF", "0.5")),
+            decode_profile=os.getenv("WHISPER_DECODE_PROFILE", "default"),
+            batch_window_ms=self.batch_window_ms,
+            max_batch_size=self.max_batch_size,
+            tts_cache_dir=os.getenv("TTS_CACHE_DIR") or None,
+            tts_cache_max_mb=float(os.getenv("TTS_CACHE_MAX_MB", "100")),
+            tts_connections=int(os.getenv("TTS_CONNECTIONS", "8")),
+            asr_cache_dir=os.getenv("ASR_CACHE_DIR") or None,
+            asr_cache_max_mb=float(os.getenv("ASR_CACHE_MAX_MB", "20")),
+            memory_token_budget=int(os.getenv("MEMORY_TOKEN_BUDGET", "0")) or None,
+            memory_keep_turns=int(os.getenv("MEMORY_KEEP_TURNS", "4")),
+            asr_workers=int(os.getenv("ASR_WORKERS", "1")),
+            vad_trim=_env_flag("VAD_TRIM", True),
+            vad_energy_threshold=float(os.getenv("VAD_ENERGY_THRESHOLD", "0")) or None,
+            longform_workers=int(os.getenv("LONGFORM_WORKERS", "0")),
+            longform_min_seconds=float(os.getenv("LONGFORM_MIN_SECONDS", "60")),
+            asr_server_socket=os.getenv("ASR_SERVER_SOCKET") or None,
+            llm_models=llm_models_from_env(),
+            llm_hedging=_env_flag("LLM_HEDGING", True),
+            response_cache_size=int(os.getenv("RESPONSE_CACHE_SIZE", "500")),
+            response_cache_ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600")),
+            response_cache_embeddings=os.getenv("RESPONSE_CACHE_EMBEDDINGS") or None,
+            response_cache_threshold=float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0")) or None,
+            headless=True
+        )
+        
+        # Load and exercise Whisper in the background so the first upload is fast
+        if _env_flag("ASR_WARMUP", True):
+            self.voice_ai.start_asr_warm_up()
+        
+        # Each browser session has its own conversation memory and TTS language
+        self.sessions = SessionManager(
+            factory=self.voice_ai.for_session,
+            size_fn=lambda session: SESSION_OVERHEAD_BYTES + session.conversation_size(),
+            idle_ttl_seconds=float(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800")),
+            max_sessions=int(os.getenv("MAX_SESSIONS", "10000")),
+            max_total_bytes=int(float(os.getenv("SESSION_MEMORY_MB", "256")) * 1024 * 1024)
         )
         
         self.current_tts_language = tts_language
     
-    def process_audio_upload(self, audio_file) -> str:
-        """Process uploaded audio file"""
+    @staticmethod
+    def _session_id(request: Optional[gr.Request]) -> str:
+        """Identify the browser session a request belongs to"""
+        if request is None or not getattr(request, "session_hash", None):
+            return "default"
+        return request.session_hash
+    
+    @staticmethod
+    def _format_turn(transcript: Optional[str], response: str = "", status: str = "") -> str:
+        """Render the progress of one turn as Markdown"""
+        lines = []
+        if status:
+            lines.append(status)
+        if transcript:
+            lines.append(f"**Your message:** {transcript}")
+        if response:
+            lines.append(f"**AI Response:** {response}")
+        return "\n\n".join(lines)
+    
+    async def _stream_reply(self, voice_ai: VoiceAI, user_text: str,
+                            transcript: Optional[str] = None) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """Stream the reply text as it is generated, then attach its audio"""
+        yield self._format_turn(transcript, status="🤖 Thinking..."), None
+        
+        parts = []
+        async for chunk in voice_ai.astream_ai_response(user_text):
+            parts.append(chunk)
+            yield self._format_turn(transcript, "".join(parts), "💬 Responding..."), None
+        ai_response = "".join(parts).strip()
+        
+        yield self._format_turn(transcript, ai_response, "🔊 Generating voice..."), None
+        
+        # Convert to speech in memory so no temporary file is left behind
+        audio = await voice_ai.atext_to_speech_bytes(ai_response)
+        status = "✅ Processed successfully!" if audio else "⚠️ Could not generate voice response"
+        yield self._format_turn(transcript, ai_response, status), audio
+    
+    async def process_audio_upload(self, audio_file, request: gr.Request = None) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """Process uploaded audio file, showing the transcript, reply text and audio as each is ready"""
         if audio_file is None:
-            return "❌ Please upload an audio file"
+            yield "❌ Please upload an audio file", None
+            return
         
         try:
             # Handle different audio file formats from Gradio
             if isinstance(audio_file, tuple):
-                # Gradio returns a tuple (sample_rate, audio_data) for some formats
-                sample_rate, audio_data = audio_file
-                # Save to temporary file
-                import tempfile
-                import soundfile as sf
-                temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-                sf.write(temp_file.name, audio_data, sample_rate)
-                audio_path = temp_file.name
+                # Gradio returns a tuple (sample_rate, audio_data) for some formats;
+                # it is downmixed and resampled in memory, so no temporary file is written
+                audio_input = audio_file
             else:
                 # Regular file path - ensure it's a file, not a directory
-                audio_path = str(audio_file)
+                audio_input = str(audio_file)
+                
+                # Additional validation
+                if not audio_input.strip():
+                    yield "❌ No audio file provided", None
+                    return
                 
                 # Check if it's actually a file
-                if os.path.isdir(audio_path):
-                    return f"❌ Please select a file, not a directory: {audio_path}"
+                if os.path.isdir(audio_input):
+                    yield f"❌ Please select a file, not a directory: {audio_input}", None
+                    return
                 
-                if not os.path.isfile(audio_path):
-                    return f"❌ File not found: {audio_path}"
-            
-            # Additional validation
-            if not audio_path or audio_path.strip() == "":
-                return "❌ No audio file provided"
-            
-            # Process the audio file (but don't return the audio file path to avoid Gradio issues)
-            self.voice_ai.process_voice_input(audio_path)
+                if not os.path.isfile(audio_input):
+                    yield f"❌ File not found: {audio_input}", None
+                    return
             
-            # Get the last conversation from memory
-            chat_history = self.voice_ai.memory.chat_memory.messages
-            if len(chat_history) >= 2:
-                user_msg = chat_history[-2].content if hasattr(chat_history[-2], 'content') else str(chat_history[-2])
-                ai_msg = chat_history[-1].content if hasattr(chat_history[-1], 'content') else str(chat_history[-1])
-                return f"✅ Processed successfully!\n\n**Your message:** {user_msg}\n\n**AI Response:** {ai_msg}"
-            else:
-                return "✅ Audio processed successfully!"
+            async with self.sessions.acquire_async(self._session_id(request)) as voice_ai:
+                yield "🔄 Transcribing audio...", None
+                try:
+                    transcript = await voice_ai.atranscribe_audio(audio_input)
+                finally:
+                    voice_ai.cleanup_input_audio(audio_input)
+                
+                if not transcript:
+                    yield "❌ No speech could be transcribed from the audio", None
+                    return
+                
+                async for update in self._stream_reply(voice_ai, transcript, transcript):
+                    yield update
                 
         except Exception as e:
-            return f"❌ Error processing audio: {str(e)}"
+            yield f"❌ Error processing audio: {str(e)}", None
     
-    def process_text_input(self, user_text: str) -> str:
-        """Process text input"""
+    async def process_text_input(self, user_text: str, request: gr.Request = None) -> AsyncIterator[Tuple[str, Optional[bytes]]]:
+        """Process text input, streaming the reply text and then attaching its audio"""
         if not user_text.strip():
-            return "❌ Please enter some text"
+            yield "❌ Please enter some text", None
+            return
         
         try:
-            # Get AI response
-            ai_response = self.voice_ai.get_ai_response(user_text)
-            
-            # Convert to speech (but don't return the file path to avoid Gradio issues)
-            tts_file = self.voice_ai.text_to_speech(ai_response)
-            
-            return f"**AI Response:** {ai_response}"
+            async with self.sessions.acquire_async(self._session_id(request)) as voice_ai:
+                async for update in self._stream_reply(voice_ai, user_text):
+                    yield update
             
         except Exception as e:
-            return f"❌ Error processing text: {str(e)}"
+            yield f"❌ Error processing text: {str(e)}", None
     
-    def change_language(self, new_language: str) -> str:
-        """Change TTS language"""
-        if not new_language.strip():
-            return f"Current language: {self.current_tts_language}"
-        
-        self.voice_ai.tts_language = new_language.strip()
-        self.current_tts_language = new_language.strip()
+    async def change_language(self, new_language: str, request: gr.Request = None) -> str:
+        """Change TTS language for this session"""
+        async with self.sessions.acquire_async(self._session_id(request)) as voice_ai:
+            if not new_language.strip():
+                return f"Current language: {voice_ai.tts_language}"
+            
+            voice_ai.tts_language = new_language.strip()
         return f"✅ Language changed to: {new_language}"
     
-    def get_conversation_history(self) -> str:
+    async def get_conversation_history(self, request: gr.Request = None) -> str:
         """Get conversation history"""
         try:
-            messages = self.voice_ai.memory.chat_memory.messages
+            async with self.sessions.acquire_async(self._session_id(request)) as voice_ai:
+                messages = list(voice_ai.memory.chat_memory.messages)
             if not messages:
                 return "No conversation history yet."
             
@@ -117,25 +200,24 @@ class GradioVoiceAI:
         except Exception as e:
             return f"Error retrieving history: {str(e)}"
     
-    def clear_history(self) -> str:
+    async def clear_history(self, request: gr.Request = None) -> str:
         """Clear conversation history"""
         try:
-            self.voice_ai.memory.clear()
+            async with self.sessions.acquire_async(self._session_id(request)) as voice_ai:
+                voice_ai.memory.clear()
             return "✅ Conversation history cleared!"
         except Exception as e:
             return f"❌ Error clearing history: {str(e)}"
     
-    def check_api_connection(self) -> str:
+    async def check_api_connection(self, request: gr.Request = None) -> str:
         """Check if the API key is working"""
         try:
-            # Test with a simple prompt
-            test_response = self.voice_ai.get_ai_response("Hello, this is a test message.")
-            
-            # Check if we got a valid response
-            if test_response and not test_response.startswith("Sorry, I encountered an error"):
-                return "✅ API connection working! Gemini is responding correctly."
+            # Token count on the shared client: no generation, no session or memory touched
+            health = await self.voice_ai.acheck_llm_health()
+            if health["ok"]:
+                return f"✅ API connection working! {health['model']} responded in {health['latency']:.2f}s."
             else:
-                return "❌ API connection failed. Please check your API key."
+                return f"❌ API connection failed ({health['error']}). Please check your API key."
                 
         except Exception as e:
             return f"❌ API connection error: {str(e)}"
@@ -187,6 +269,7 @@ def create_gradio_interface():
                 
                 with gr.Column(scale=1):
                     audio_result = gr.Markdown(label="Audio Processing Result")
+                    audio_reply = gr.Audio(label="AI Voice Response", autoplay=True, interactive=False)
         
         with gr.Tab("💬 Text Chat"):
             with gr.Row():
@@ -200,6 +283,7 @@ def create_gradio_interface():
                 
                 with gr.Column(scale=1):
                     text_result = gr.Markdown(label="Chat Result")
+                    text_reply = gr.Audio(label="AI Voice Response", autoplay=True, interactive=False)
         
         with gr.Tab("⚙️ Settings"):
             with gr.Row():
@@ -225,16 +309,18 @@ def create_gradio_interface():
                     clear_history_btn = gr.Button("🗑️ Clear History", variant="stop")
         
         # Event handlers
+        # With micro-batching enabled, let enough uploads run at once to fill a batch
         process_audio_btn.click(
             fn=gradio_app.process_audio_upload,
             inputs=[audio_input],
-            outputs=[audio_result]
+            outputs=[audio_result, audio_reply],
+            concurrency_limit=gradio_app.max_batch_size if gradio_app.batch_window_ms > 0 else "default"
         )
         
         text_submit_btn.click(
             fn=gradio_app.process_text_input,
             inputs=[text_input],
-            outputs=[text_result]
+            outputs=[text_result, text_reply]
         )
         
         language_btn.click(
@@ -278,13 +364,17 @@ def main():
     print("🚀 Starting Voice AI Gradio Interface...")
     
     # Check for API key
-    if not os.getenv("GEMINI_API_KEY"):
+    offline = all(model == "stub" for model in llm_models_from_env())
+    if not os.getenv("GEMINI_API_KEY") and not offline:
         print("❌ Error: GEMINI_API_KEY not found in environment variables")
         print("Please create a .env file with your Gemini API key")
         return
     
     try:
         demo = create_gradio_interface()
+        print(format_startup_report())
+        # Sessions are isolated, so independent requests can run side by side
+        demo.queue(default_concurrency_limit=int(os.getenv("GRADIO_CONCURRENCY", "8")))
         demo.launch(
             server_name="0.0.0.0",
             server_port=7860,
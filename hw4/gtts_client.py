@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+gTTS Clients
+Send gTTS requests through shared, connection-pooled HTTP clients. gTTS splits
+long text at sentence and clause boundaries into ~100 character parts; the
+parts are fetched concurrently and their MP3 frames joined in order. The async
+client can be awaited instead of blocking a worker thread.
+"""
+
+import asyncio
+import base64
+import re
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import httpx
+import requests
+from gtts import gTTS
+from gtts.tts import gTTSError
+
+# gTTS's own pattern for the base64 MP3 payload in a batchexecute response
+_AUDIO_PATTERN = re.compile(r'jQ1olc","\[\\"(.*)\\"]')
+
+
+def _decode_part(tts: gTTS, status_code: int, reason: str, body: str) -> bytes:
+    """Extract one part's MP3 bytes from a batchexecute response"""
+    if status_code >= 400:
+        raise gTTSError(f"{status_code} ({reason}) from TTS API", tts=tts)
+
+    for line in body.splitlines():
+        if "jQ1olc" in line:
+            match = _AUDIO_PATTERN.search(line)
+            if match:
+                return base64.b64decode(match.group(1).encode("ascii"))
+    raise gTTSError(f"No audio stream in response. Unsupported language '{tts.lang}'?", tts=tts)
+
+
+class AsyncGTTSClient:
+    """Async transport for gTTS requests"""
+
+    def __init__(self, max_connections: int = 8, timeout: float = 10.0):
+        """
+        Initialize the client
+
+        Args:
+            max_connections: Connections kept open to the TTS endpoint
+            timeout: Per-request timeout in seconds
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Connection pools are bound to the loop that created them
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                timeout=self.timeout
+            )
+            self._loop = loop
+        return self._client
+
+    async def fetch_part(self, tts: gTTS, request) -> bytes:
+        """Send one prepared gTTS request and decode its MP3 bytes"""
+        response = await self._get_client().post(
+            request.url,
+            content=request.body,
+            headers=dict(request.headers)
+        )
+        return _decode_part(tts, response.status_code, response.reason_phrase, response.text)
+
+    async def synthesize(self, text: str, lang: str) -> bytes:
+        """Convert text to MP3 bytes, fetching all parts concurrently"""
+        tts = gTTS(text=text, lang=lang, slow=False)
+        # gTTS still tokenizes the text and builds the RPC payloads; only the transport is async.
+        # The pool's connection limit bounds how many parts are in flight at once
+        parts = await asyncio.gather(*(self.fetch_part(tts, request) for request in tts._prepare_requests()))
+        # MP3 is a sequence of self-contained frames, so parts concatenate directly
+        return b"".join(parts)
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class GTTSClient:
+    """Blocking counterpart of AsyncGTTSClient for the command-line app"""
+
+    def __init__(self, max_connections: int = 8, timeout: float = 10.0):
+        """
+        Initialize the client
+
+        Args:
+            max_connections: Parts fetched at once, each over a kept-alive connection
+            timeout: Per-request timeout in seconds
+        """
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="gtts")
+
+    def fetch_part(self, tts: gTTS, request) -> bytes:
+        """Send one prepared gTTS request and decode its MP3 bytes"""
+        response = self._session.send(request, proxies=urllib.request.getproxies(), timeout=self.timeout)
+        return _decode_part(tts, response.status_code, response.reason, response.text)
+
+    def synthesize(self, text: str, lang: str) -> bytes:
+        """Convert text to MP3 bytes, fetching all parts concurrently"""
+        tts = gTTS(text=text, lang=lang, slow=False)
+        prepared = tts._prepare_requests()
+        if len(prepared) == 1:
+            return self.fetch_part(tts, prepared[0])
+        # map keeps the parts in text order
+        return b"".join(self._executor.map(lambda request: self.fetch_part(tts, request), prepared))
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self._executor.shutdown(wait=False)
+        self._session.close()
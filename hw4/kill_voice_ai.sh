@@ -7,6 +7,7 @@ echo "🛑 Stopping Voice AI Application..."
 echo "Killing Gradio voice app processes..."
 pkill -f gradio_voice_app
 pkill -f voice_ai_app
+pkill -f asr_server
 
 # Kill processes on ports 7860 and 7861
 echo "Killing processes on ports 7860 and 7861..."
@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""
+LLM Routing
+Sends each request to the first healthy model in a fallback chain. When the
+model is slower than its own 95th-percentile latency, the request is hedged
+to the next model and whichever answers first wins. Models that keep failing
+are skipped by a circuit breaker until a cool-down has passed.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+STUB_MODEL = "stub"
+
+# How often a request still queued behind its model's other calls is re-checked
+# before its hedging deadline starts
+QUEUE_POLL_SECONDS = 0.05
+
+# Marks the end of one model's stream in the router's chunk queue
+_END = object()
+
+
+class LLMReply:
+    """Minimal stand-in for a LangChain message: the reply text as `.content`"""
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+class StubLLM:
+    """Offline backend that echoes the last message, for exercising the router without an API key"""
+
+    def __init__(self, latency: float = 0.0, fail: bool = False, reply: Optional[str] = None):
+        """
+        Initialize the stub
+
+        Args:
+            latency: Seconds each call takes
+            fail: Raise instead of replying
+            reply: Fixed reply; by default the last user message is echoed back
+        """
+        self.latency = latency
+        self.fail = fail
+        self.reply = reply
+
+    def _respond(self, messages) -> str:
+        time.sleep(self.latency)
+        return self._reply(messages)
+
+    def _reply(self, messages) -> str:
+        if self.fail:
+            raise RuntimeError("stub model failure")
+        if self.reply is not None:
+            return self.reply
+        last = messages if isinstance(messages, str) else getattr(messages[-1], "content", messages[-1])
+        return f"You said: {last}"
+
+    def invoke(self, messages) -> LLMReply:
+        return LLMReply(self._respond(messages))
+
+    async def ainvoke(self, messages) -> LLMReply:
+        await asyncio.sleep(self.latency)
+        return LLMReply(self._reply(messages))
+
+    def stream(self, messages) -> Iterator[LLMReply]:
+        for word in self._respond(messages).split(" "):
+            yield LLMReply(word + " ")
+
+    async def astream(self, messages) -> AsyncIterator[LLMReply]:
+        await asyncio.sleep(self.latency)
+        for word in self._reply(messages).split(" "):
+            yield LLMReply(word + " ")
+
+
+def _messages_to_prompt(messages) -> str:
+    """
+    Flatten chat messages into a plain-text prompt for the direct Google AI interface
+
+    System messages (the system prompt, the conversation summary) come first as
+    paragraphs, then the turns as "User:" / "Assistant:" lines, ending with an
+    open "Assistant:" for the reply.
+    """
+    if isinstance(messages, str):
+        return messages
+    roles = {"human": "User", "ai": "Assistant"}
+    parts = []
+    for msg in messages:
+        role = roles.get(getattr(msg, "type", None))
+        parts.append(f"{role}: {msg.content}\n" if role else f"{msg.content}\n\n")
+    return "".join(parts) + "Assistant:"
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies"""
+
+    def __init__(self, window: int = 50, initial_deadline: float = 3.0, min_samples: int = 5):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Most recent latencies kept
+            initial_deadline: Hedging deadline used until `min_samples` latencies are known
+            min_samples: Latencies needed before percentiles are trusted
+        """
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.initial_deadline = initial_deadline
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            return float(np.percentile(self._latencies, q))
+
+    def deadline(self) -> float:
+        """How long to wait before hedging: the p95 latency"""
+        p95 = self.percentile(95)
+        return self.initial_deadline if p95 is None else p95
+
+
+class CircuitBreaker:
+    """Stops sending requests to a model after repeated failures, then retries one after a cool-down"""
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30.0):
+        """
+        Initialize the breaker
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_seconds: Time the circuit stays open before a trial request is allowed
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_seconds:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now; in half-open state only one trial at a time"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """A request let through was abandoned before it succeeded or failed; allow another trial"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class ModelRoute:
+    """One model in the chain with its latency history and circuit breaker"""
+
+    def __init__(self, name: str, client, breaker: Optional[CircuitBreaker] = None,
+                 tracker: Optional[LatencyTracker] = None,
+                 first_chunk_tracker: Optional[LatencyTracker] = None):
+        """
+        Initialize the route
+
+        Args:
+            name: Model name shown in logs and stats
+            client: LangChain chat model, or a google.generativeai model
+            breaker: Circuit breaker for this model
+            tracker: Latencies of complete replies, for hedging `invoke`
+            first_chunk_tracker: Times to first chunk, for hedging streams
+        """
+        self.name = name
+        self.client = client
+        self.breaker = breaker or CircuitBreaker()
+        self.tracker = tracker or LatencyTracker()
+        self.first_chunk_tracker = first_chunk_tracker or LatencyTracker()
+        self.calls = 0
+        self.failures = 0
+        self.wins = 0
+
+    def call(self, messages) -> str:
+        """Blocking request; records latency and updates the breaker"""
+        self.calls += 1
+        started = time.perf_counter()
+        settled = False
+        try:
+            if hasattr(self.client, "invoke"):
+                reply = self.client.invoke(messages).content.strip()
+            else:
+                # Direct Google AI interface
+                reply = self.client.generate_content(_messages_to_prompt(messages)).text.strip()
+            self.tracker.record(time.perf_counter() - started)
+            self.breaker.record_success()
+            settled = True
+            return reply
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            settled = True
+            raise
+        finally:
+            if not settled:
+                # Interrupted (e.g. KeyboardInterrupt): don't leave a half-open trial in flight
+                self.breaker.release_trial()
+
+    async def acall(self, messages) -> str:
+        """Async call on the client's own async interface, without occupying a thread"""
+        self.calls += 1
+        started = time.perf_counter()
+        settled = False
+        try:
+            if hasattr(self.client, "ainvoke"):
+                reply = (await self.client.ainvoke(messages)).content.strip()
+            else:
+                response = await self.client.generate_content_async(_messages_to_prompt(messages))
+                reply = response.text.strip()
+            self.tracker.record(time.perf_counter() - started)
+            self.breaker.record_success()
+            settled = True
+            return reply
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            settled = True
+            raise
+        finally:
+            if not settled:
+                # Cancelled, e.g. the caller went away
+                self.breaker.release_trial()
+
+    def stream(self, messages) -> Iterator[str]:
+        if hasattr(self.client, "stream"):
+            for chunk in self.client.stream(messages):
+                if chunk.content:
+                    yield chunk.content
+        else:
+            for chunk in self.client.generate_content(_messages_to_prompt(messages), stream=True):
+                if chunk.text:
+                    yield chunk.text
+
+    async def astream(self, messages) -> AsyncIterator[str]:
+        if hasattr(self.client, "astream"):
+            async for chunk in self.client.astream(messages):
+                if chunk.content:
+                    yield chunk.content
+        else:
+            response = await self.client.generate_content_async(_messages_to_prompt(messages), stream=True)
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+
+
+class _StreamRace:
+    """Bookkeeping of one streamed request racing models for the first chunk (for stream and astream)"""
+
+    def __init__(self, router: "LLMRouter",
+                 launch: Callable[[ModelRoute], None],
+                 stop: Callable[[ModelRoute], None]):
+        self.router = router
+        self.launch = launch
+        self.stop = stop
+        self.remaining = iter(router.routes)
+        self.started_at: Dict[ModelRoute, float] = {}
+        self.running = set()
+        self.hedges = set()
+        self.newest: Optional[ModelRoute] = None
+        self.winner: Optional[ModelRoute] = None
+        self.exhausted = False
+
+    def start(self) -> None:
+        primary = self.router._next_route(self.remaining)
+        if primary is None:
+            raise RuntimeError("All LLM models are unavailable (circuit breakers open)")
+        self._launch(primary)
+
+    def _launch(self, route: ModelRoute) -> None:
+        self.running.add(route)
+        self.newest = route
+        self.launch(route)
+
+    def timeout(self) -> Optional[float]:
+        """How long to wait for the next chunk; None once hedging no longer applies"""
+        if self.winner is not None or self.exhausted or not self.router.hedge:
+            return None
+        return self.router._until_hedge(self.newest.first_chunk_tracker, self.started_at.get(self.newest))
+
+    def on_timeout(self) -> None:
+        """No chunk yet: hedge to the next model once the newest one is past its p95 time to first chunk"""
+        if self.newest not in self.started_at or self.timeout() > 0:
+            # Still queued, or it only just started
+            return
+        backup = self.router._next_route(self.remaining)
+        if backup is None:
+            self.exhausted = True
+            return
+        print(f"⏱️ {self.newest.name} is past its p95 time to first chunk, hedging to {backup.name}")
+        self.router.hedged_requests += 1
+        self.hedges.add(backup)
+        self._launch(backup)
+
+    def on_item(self, route: ModelRoute, item) -> bool:
+        """Handle a chunk, end marker or error from a model; True for a winning chunk to pass on"""
+        if self.winner is not None and route is not self.winner:
+            return False
+        if isinstance(item, Exception):
+            self.running.discard(route)
+            if self.winner is not None:
+                raise item
+            print(f"Warning: {route.name} failed: {item}")
+            if not self.running:
+                # Every model started so far failed; fail over right away
+                backup = self.router._next_route(self.remaining)
+                if backup is None:
+                    raise item
+                self.router.failovers += 1
+                self._launch(backup)
+            return False
+        if self.winner is None:
+            self.winner = route
+            route.wins += 1
+            if route in self.hedges:
+                self.router.hedge_wins += 1
+            for loser in self.running - {route}:
+                self.stop(loser)
+        return item is not _END
+
+
+class LLMRouter:
+    """LangChain-style chat model that fails over and hedges across a chain of models"""
+
+    def __init__(self, routes: Sequence[ModelRoute], hedge: bool = True, max_concurrency: int = 16):
+        """
+        Initialize the router
+
+        Args:
+            routes: Models in order of preference
+            hedge: Send a backup request to the next model when the current one
+                runs past its p95 latency
+            max_concurrency: Requests in flight per model, across all sessions; each
+                model has its own pool, so slow or losing calls to one model never
+                delay requests to another
+        """
+        if not routes:
+            raise ValueError("LLMRouter needs at least one model")
+        self.routes = list(routes)
+        self.hedge = hedge
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self._background = set()
+        self._executors = {
+            route: ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"llm-{index}")
+            for index, route in enumerate(self.routes)
+        }
+
+    def _next_route(self, remaining: Iterator[ModelRoute]) -> Optional[ModelRoute]:
+        """Next model whose breaker lets a request through (asked lazily, as half-open breakers admit one trial)"""
+        for route in remaining:
+            if route.breaker.allow():
+                return route
+        return None
+
+    def _submit(self, route: ModelRoute, messages, started_at: Dict[ModelRoute, float]) -> Future:
+        """Queue a request on the model's own pool, noting when it actually starts running"""
+        def run() -> str:
+            started_at[route] = time.perf_counter()
+            return route.call(messages)
+        return self._executors[route].submit(run)
+
+    @staticmethod
+    def _until_hedge(tracker: LatencyTracker, began: Optional[float]) -> float:
+        """Seconds left before hedging; the deadline only runs once the request has left the queue"""
+        if began is None:
+            return QUEUE_POLL_SECONDS
+        return max(0.0, began + tracker.deadline() - time.perf_counter())
+
+    def invoke(self, messages) -> LLMReply:
+        """Return the first successful reply, hedging slow requests to the next model"""
+        remaining = iter(self.routes)
+        primary = self._next_route(remaining)
+        if primary is None:
+            raise RuntimeError("All LLM models are unavailable (circuit breakers open)")
+
+        started_at: Dict[ModelRoute, float] = {}
+        pending: Dict[Future, ModelRoute] = {self._submit(primary, messages, started_at): primary}
+        newest = primary
+        hedges = set()
+        exhausted = False
+        last_error: Optional[Exception] = None
+
+        while pending:
+            timeout = self._until_hedge(newest.tracker, started_at.get(newest)) if self.hedge and not exhausted else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                if newest not in started_at or self._until_hedge(newest.tracker, started_at[newest]) > 0:
+                    # Still queued, or it only just started
+                    continue
+                backup = self._next_route(remaining)
+                if backup is None:
+                    exhausted = True
+                    continue
+                print(f"⏱️ {newest.name} is past its p95 deadline, hedging to {backup.name}")
+                self.hedged_requests += 1
+                pending[self._submit(backup, messages, started_at)] = backup
+                hedges.add(backup)
+                newest = backup
+                continue
+
+            for future in done:
+                route = pending.pop(future)
+                try:
+                    reply = future.result()
+                except Exception as e:
+                    print(f"Warning: {route.name} failed: {e}")
+                    last_error = e
+                    continue
+                route.wins += 1
+                if route in hedges:
+                    self.hedge_wins += 1
+                # Losing requests finish in the background and still feed the latency stats
+                return LLMReply(reply)
+
+            # Every finished request failed; fail over right away
+            if not pending and not exhausted:
+                backup = self._next_route(remaining)
+                if backup is None:
+                    exhausted = True
+                else:
+                    self.failovers += 1
+                    pending[self._submit(backup, messages, started_at)] = backup
+                    newest = backup
+        raise last_error or RuntimeError("No LLM model produced a reply")
+
+    async def ainvoke(self, messages) -> LLMReply:
+        """Async invoke: the same hedging and failover, on the models' native async clients"""
+        remaining = iter(self.routes)
+        primary = self._next_route(remaining)
+        if primary is None:
+            raise RuntimeError("All LLM models are unavailable (circuit breakers open)")
+
+        started_at: Dict[ModelRoute, float] = {}
+        pending: Dict[asyncio.Future, ModelRoute] = {}
+
+        def launch(route: ModelRoute) -> None:
+            started_at[route] = time.perf_counter()
+            pending[asyncio.ensure_future(route.acall(messages))] = route
+
+        launch(primary)
+        newest = primary
+        hedges = set()
+        exhausted = False
+        last_error: Optional[Exception] = None
+        try:
+            while pending:
+                timeout = self._until_hedge(newest.tracker, started_at[newest]) if self.hedge and not exhausted else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    backup = self._next_route(remaining)
+                    if backup is None:
+                        exhausted = True
+                        continue
+                    print(f"⏱️ {newest.name} is past its p95 deadline, hedging to {backup.name}")
+                    self.hedged_requests += 1
+                    launch(backup)
+                    hedges.add(backup)
+                    newest = backup
+                    continue
+
+                for task in done:
+                    route = pending.pop(task)
+                    try:
+                        reply = task.result()
+                    except Exception as e:
+                        print(f"Warning: {route.name} failed: {e}")
+                        last_error = e
+                        continue
+                    route.wins += 1
+                    if route in hedges:
+                        self.hedge_wins += 1
+                    # Losing requests finish in the background and still feed the latency stats
+                    for loser in pending:
+                        self._keep_in_background(loser)
+                    pending.clear()
+                    return LLMReply(reply)
+
+                # Every finished request failed; fail over right away
+                if not pending and not exhausted:
+                    backup = self._next_route(remaining)
+                    if backup is None:
+                        exhausted = True
+                    else:
+                        self.failovers += 1
+                        launch(backup)
+                        newest = backup
+            raise last_error or RuntimeError("No LLM model produced a reply")
+        finally:
+            # Only left over when the caller was cancelled or an error escaped
+            for task in pending:
+                task.cancel()
+
+    def _keep_in_background(self, task: asyncio.Future) -> None:
+        """Hold a reference to a losing request until it finishes, and swallow its error"""
+        self._background.add(task)
+        task.add_done_callback(lambda done: (self._background.discard(done),
+                                             done.cancelled() or done.exception()))
+
+    def _stream_worker(self, route: ModelRoute, messages, chunks: "queue.Queue",
+                       started_at: Dict[ModelRoute, float], stop: threading.Event) -> None:
+        """Pass one model's chunks to `chunks`; runs on the model's pool until done or stopped"""
+        began = started_at[route] = time.perf_counter()
+        route.calls += 1
+        settled = False
+        stream = route.stream(messages)
+        try:
+            first = True
+            for text in stream:
+                if stop.is_set():
+                    return
+                if first:
+                    route.first_chunk_tracker.record(time.perf_counter() - began)
+                    first = False
+                chunks.put((route, text))
+            route.breaker.record_success()
+            settled = True
+            chunks.put((route, _END))
+        except Exception as e:
+            route.failures += 1
+            route.breaker.record_failure()
+            settled = True
+            chunks.put((route, e))
+        finally:
+            stream.close()
+            if not settled:
+                # Another model answered first, or the caller abandoned the stream
+                route.breaker.release_trial()
+
+    def stream(self, messages) -> Iterator[LLMReply]:
+        """
+        Stream from the first healthy model, hedging on time to first chunk
+
+        Once a model has streamed its first chunk the reply stays on it; until then,
+        failed models are replaced and slow ones are hedged as in `invoke`.
+        """
+        chunks: "queue.Queue" = queue.Queue()
+        stops: Dict[ModelRoute, threading.Event] = {}
+
+        def launch(route: ModelRoute) -> None:
+            stops[route] = threading.Event()
+            self._executors[route].submit(self._stream_worker, route, messages, chunks, race.started_at, stops[route])
+
+        race = _StreamRace(self, launch, lambda route: stops[route].set())
+        try:
+            race.start()
+            while True:
+                try:
+                    route, item = chunks.get(timeout=race.timeout())
+                except queue.Empty:
+                    race.on_timeout()
+                    continue
+                if race.on_item(route, item):
+                    yield LLMReply(item)
+                elif item is _END and route is race.winner:
+                    return
+        finally:
+            for stop in stops.values():
+                stop.set()
+
+    async def _astream_worker(self, route: ModelRoute, messages, chunks: asyncio.Queue) -> None:
+        """Async _stream_worker; runs as a task until done or cancelled"""
+        began = time.perf_counter()
+        route.calls += 1
+        settled = False
+        stream = route.astream(messages)
+        try:
+            first = True
+            async for text in stream:
+                if first:
+                    route.first_chunk_tracker.record(time.perf_counter() - began)
+                    first = False
+                chunks.put_nowait((route, text))
+            route.breaker.record_success()
+            settled = True
+            chunks.put_nowait((route, _END))
+        except Exception as e:
+            route.failures += 1
+            route.breaker.record_failure()
+            settled = True
+            chunks.put_nowait((route, e))
+        finally:
+            await stream.aclose()
+            if not settled:
+                route.breaker.release_trial()
+
+    async def astream(self, messages) -> AsyncIterator[LLMReply]:
+        """Async stream: hedges and fails over until the first chunk arrives, then stays on that model"""
+        chunks: asyncio.Queue = asyncio.Queue()
+        tasks: Dict[ModelRoute, asyncio.Task] = {}
+
+        def launch(route: ModelRoute) -> None:
+            race.started_at[route] = time.perf_counter()
+            tasks[route] = asyncio.ensure_future(self._astream_worker(route, messages, chunks))
+
+        race = _StreamRace(self, launch, lambda route: tasks[route].cancel())
+        try:
+            race.start()
+            while True:
+                try:
+                    route, item = await asyncio.wait_for(chunks.get(), race.timeout())
+                except asyncio.TimeoutError:
+                    race.on_timeout()
+                    continue
+                if race.on_item(route, item):
+                    yield LLMReply(item)
+                elif item is _END and route is race.winner:
+                    return
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    def probe(self) -> Dict[str, Any]:
+        """
+        Check that a model is reachable without generating anything
+
+        Counts the tokens of a short string on the first model whose breaker isn't
+        open. Nothing is recorded: latency stats and breakers are left untouched.
+        """
+        last_error: Optional[Exception] = None
+        for route in self.routes:
+            if route.breaker.state == "open":
+                continue
+            started = time.perf_counter()
+            try:
+                if hasattr(route.client, "get_num_tokens"):
+                    route.client.get_num_tokens("ping")
+                elif hasattr(route.client, "count_tokens"):
+                    # Direct Google AI interface
+                    route.client.count_tokens("ping")
+            except Exception as e:
+                last_error = e
+                continue
+            return {"ok": True, "model": route.name, "latency": time.perf_counter() - started}
+        return {"ok": False, "model": None, "error": str(last_error or "all circuit breakers are open")}
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model latency percentiles, failure counts and breaker states"""
+        models = {}
+        for route in self.routes:
+            models[route.name] = {
+                "calls": route.calls,
+                "failures": route.failures,
+                "wins": route.wins,
+                "p50": route.tracker.percentile(50),
+                "p95": route.tracker.percentile(95),
+                "first_chunk_p95": route.first_chunk_tracker.percentile(95),
+                "breaker": route.breaker.state,
+            }
+        return {
+            "models": models,
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+        }
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Long-form Speech Recognition
+Splits long recordings at pauses into chunks of about 30 seconds, transcribes
+the chunks in parallel worker processes that share the loaded Whisper model
+copy-on-write, and stitches the results back together on one timeline.
+"""
+
+import multiprocessing
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import WHISPER_SAMPLE_RATE
+from vad import VoiceActivityDetector
+
+# Whisper's encoder window; chunks never exceed it so each is a single pass
+MAX_CHUNK_SECONDS = 30.0
+
+# Set in each worker process by _init_worker
+_worker_model = None
+_worker_audio: Optional[np.ndarray] = None
+
+
+def plan_chunks(audio: np.ndarray,
+                vad: Optional[VoiceActivityDetector] = None,
+                chunk_seconds: float = MAX_CHUNK_SECONDS,
+                sample_rate: int = WHISPER_SAMPLE_RATE) -> List[Tuple[int, int]]:
+    """
+    Group speech into [start, end) sample ranges of at most `chunk_seconds`
+
+    Chunks are cut in the pauses between speech segments, so words are not split
+    and silence between chunks is never transcribed. Speech running longer than a
+    chunk without any pause is cut at the chunk length.
+    """
+    vad = vad or VoiceActivityDetector(sample_rate=sample_rate)
+    limit = int(chunk_seconds * sample_rate)
+
+    segments = []
+    for start, end in vad.speech_segments(audio):
+        while end - start > limit:
+            segments.append((start, start + limit))
+            start += limit
+        segments.append((start, end))
+
+    chunks = []
+    for start, end in segments:
+        if chunks and end - chunks[-1][0] <= limit:
+            chunks[-1] = (chunks[-1][0], end)
+        else:
+            chunks.append((start, end))
+    return chunks
+
+
+def _init_worker(threads: int, model, audio: np.ndarray) -> None:
+    """
+    Give each worker the model, the audio and its share of the CPU cores
+
+    Initializer arguments of a fork pool are inherited, not pickled, so the model
+    weights stay shared copy-on-write; the pool runs this again for any worker
+    it replaces, so respawned workers are set up too.
+    """
+    global _worker_model, _worker_audio
+    _worker_model, _worker_audio = model, audio
+    import torch
+    torch.set_num_threads(threads)
+
+
+def _transcribe_chunk(task: Tuple[int, int, Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+    """Transcribe one chunk of the worker's audio with the worker's model"""
+    start, end, options = task
+    return start, _worker_model.transcribe(_worker_audio[start:end], **options)
+
+
+def stitch(results: List[Tuple[int, Dict[str, Any]]],
+           sample_rate: int = WHISPER_SAMPLE_RATE) -> Dict[str, Any]:
+    """Join per-chunk results in order, shifting segment times onto the full recording"""
+    texts, segments = [], []
+    for start, result in sorted(results, key=lambda item: item[0]):
+        offset = start / sample_rate
+        text = result.get("text", "").strip()
+        if text:
+            texts.append(text)
+        for segment in result.get("segments", []):
+            segment = dict(segment)
+            segment["id"] = len(segments)
+            segment["start"] = round(segment["start"] + offset, 3)
+            segment["end"] = round(segment["end"] + offset, 3)
+            segments.append(segment)
+
+    language = results[0][1].get("language") if results else None
+    return {"text": " ".join(texts), "segments": segments, "language": language}
+
+
+def transcribe_long(model,
+                    audio: np.ndarray,
+                    workers: Optional[int] = None,
+                    vad: Optional[VoiceActivityDetector] = None,
+                    chunk_seconds: float = MAX_CHUNK_SECONDS,
+                    **transcribe_options) -> Dict[str, Any]:
+    """
+    Transcribe a long 16 kHz recording chunk by chunk across a process pool
+
+    Args:
+        model: Whisper model or ASR backend; forked workers share its weights copy-on-write
+        audio: 16 kHz mono float32 samples
+        workers: Worker processes (defaults to the CPU count)
+        vad: Detector used to find the pauses to cut at
+        chunk_seconds: Longest chunk, at most Whisper's 30-second window
+        transcribe_options: Passed to `model.transcribe` for every chunk
+
+    Returns:
+        A `model.transcribe`-style dict whose segment times refer to the full recording
+    """
+    chunks = plan_chunks(audio, vad, min(chunk_seconds, MAX_CHUNK_SECONDS))
+    if not chunks:
+        return {"text": "", "segments": [], "language": None}
+
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    tasks = [(start, end, transcribe_options) for start, end in chunks]
+
+    # Workers must inherit the model by fork; CUDA contexts and CTranslate2 thread
+    # pools don't survive a fork, and a single chunk isn't worth a pool
+    fork_safe = getattr(model, "fork_safe", getattr(getattr(model, "device", None), "type", "cpu") == "cpu")
+    use_pool = workers > 1 and fork_safe and "fork" in multiprocessing.get_all_start_methods()
+    if not use_pool:
+        return stitch([(start, model.transcribe(audio[start:end], **options))
+                       for start, end, options in tasks])
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    pool = multiprocessing.get_context("fork").Pool(
+        workers, initializer=_init_worker, initargs=(threads, model, audio)
+    )
+    with pool:
+        results = pool.map(_transcribe_chunk, tasks, chunksize=1)
+    return stitch(results)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Audio Playback
+Plays MP3 bytes or PCM samples straight from memory through a PyAudio
+callback stream. Completion is signalled with an event instead of polling,
+and playback can be interrupted mid-utterance (barge-in).
+"""
+
+import threading
+from typing import Optional, Union
+
+import numpy as np
+
+from audio_io import decode_audio_bytes, to_float32
+
+
+class PlaybackEngine:
+    """Non-blocking in-memory audio player with completion events and interruption"""
+
+    def __init__(self, frames_per_buffer: int = 1024):
+        """
+        Initialize the engine
+
+        Args:
+            frames_per_buffer: Frames handed to the sound card per callback
+        """
+        import pyaudio
+        self._pyaudio_module = pyaudio
+        self._pyaudio = pyaudio.PyAudio()
+        self.frames_per_buffer = frames_per_buffer
+
+        self._lock = threading.Lock()
+        self._stream = None
+        self._samples = np.zeros((0, 1), dtype=np.float32)
+        self._position = 0
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._done.set()
+        self.interrupted = False
+        # RMS of the block most recently sent to the speaker, for echo-aware gating
+        self.output_level = 0.0
+
+    @property
+    def is_playing(self) -> bool:
+        return not self._done.is_set()
+
+    def play(self, audio: Union[bytes, np.ndarray], sample_rate: Optional[int] = None) -> threading.Event:
+        """
+        Start playing encoded audio bytes or PCM samples and return immediately
+
+        Any playback already in progress is interrupted. The returned event is set
+        once every sample has been handed to the sound card or playback is stopped.
+        """
+        if isinstance(audio, (bytes, bytearray, memoryview)):
+            samples, sample_rate = decode_audio_bytes(bytes(audio))
+        else:
+            if sample_rate is None:
+                raise ValueError("sample_rate is required for PCM samples")
+            samples = audio
+        samples = to_float32(np.asarray(samples))
+        if samples.ndim == 1:
+            samples = samples[:, None]
+
+        self.stop()
+        with self._lock:
+            self._close_stream()
+            self._samples = np.ascontiguousarray(samples, dtype=np.float32)
+            self._position = 0
+            self.interrupted = False
+            self._stop.clear()
+            done = self._done = threading.Event()
+            pyaudio = self._pyaudio_module
+            self._stream = self._pyaudio.open(
+                format=pyaudio.paFloat32,
+                channels=samples.shape[1],
+                rate=int(sample_rate),
+                output=True,
+                frames_per_buffer=self.frames_per_buffer,
+                stream_callback=self._callback
+            )
+        return done
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """Feed the next block to the sound card; runs on PortAudio's thread"""
+        pyaudio = self._pyaudio_module
+        if self._stop.is_set():
+            self.output_level = 0.0
+            self._done.set()
+            return b"", pyaudio.paComplete
+
+        block = self._samples[self._position:self._position + frame_count]
+        self._position += len(block)
+        self.output_level = float(np.sqrt(np.mean(np.square(block)))) if len(block) else 0.0
+
+        if len(block) < frame_count:
+            # Last block: pad with silence and finish
+            padded = np.zeros((frame_count, self._samples.shape[1]), dtype=np.float32)
+            padded[:len(block)] = block
+            self.output_level = 0.0
+            self._done.set()
+            return padded.tobytes(), pyaudio.paComplete
+        return block.tobytes(), pyaudio.paContinue
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until playback finishes or is stopped; returns False on timeout"""
+        return self._done.wait(timeout)
+
+    def stop(self) -> None:
+        """Cut the current playback short (barge-in)"""
+        if self.is_playing:
+            self.interrupted = True
+            self._stop.set()
+            self._done.set()
+            self.output_level = 0.0
+
+    def _close_stream(self) -> None:
+        """Release the previous stream; the caller holds the lock"""
+        if self._stream is not None:
+            try:
+                # Stopping waits for buffers already queued on the device to drain
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+
+    def close(self) -> None:
+        """Stop playback and release the audio device"""
+        self.stop()
+        with self._lock:
+            self._close_stream()
+        self._pyaudio.terminate()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+Reuses LLM replies for questions that were already answered in the same
+conversation state. The exact layer matches normalized text; the optional
+semantic layer matches paraphrases by cosine similarity over an in-memory
+NumPy embedding matrix. Entries expire after a TTL and the least recently
+used ones are evicted when the cache is full.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+NGRAM_DIMENSIONS = 1024
+
+# Default cosine similarity a semantic match must reach, per embedding. Hashed
+# n-grams score rewordings lower than a model embedding does: "what's the time" /
+# "what is the time now" scores 0.87, while "what is the weather today" /
+# "what is the weather tomorrow" already scores 0.83 and must not match.
+SIMILARITY_THRESHOLDS = {"ngram": 0.85, "gemini": 0.92}
+
+_CONTRACTIONS = {
+    "what's": "what is", "who's": "who is", "where's": "where is", "how's": "how is",
+    "it's": "it is", "that's": "that is", "there's": "there is", "let's": "let us",
+    "i'm": "i am", "you're": "you are", "we're": "we are", "they're": "they are",
+    "don't": "do not", "doesn't": "does not", "isn't": "is not", "aren't": "are not",
+    "can't": "cannot", "won't": "will not",
+}
+
+
+def normalize_message(text: str) -> str:
+    """Lowercase, drop punctuation, expand common contractions and collapse whitespace"""
+    words = re.sub(r"[^\w\s']", " ", text.lower().replace("\u2019", "'")).split()
+    return " ".join(_CONTRACTIONS.get(word, word) for word in words)
+
+
+def ngram_embedding(texts: List[str], dimensions: int = NGRAM_DIMENSIONS) -> np.ndarray:
+    """
+    Offline embedding: hashed character trigrams and words, L2-normalized
+
+    Catches rewordings that share most of their wording ("what's the time" /
+    "what is the time now") at the "ngram" threshold in SIMILARITY_THRESHOLDS,
+    not true paraphrases ("what time is it"); use a model embedding for those.
+    """
+    vectors = np.zeros((len(texts), dimensions), dtype=np.float32)
+    for row, text in enumerate(texts):
+        text = f" {normalize_message(text)} "
+        features = [text[i:i + 3] for i in range(len(text) - 2)] + text.split()
+        for feature in features:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+            vectors[row, int.from_bytes(digest, "little") % dimensions] += 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _numbers(text: str) -> List[str]:
+    return re.findall(r"\d+", text)
+
+
+class _Entry:
+    __slots__ = ("response", "context", "numbers", "expires_at", "slot")
+
+    def __init__(self, response: str, context: str, numbers: List[str], expires_at: float, slot: Optional[int]):
+        self.response = response
+        self.context = context
+        self.numbers = numbers
+        self.expires_at = expires_at
+        self.slot = slot
+
+
+class ResponseCache:
+    """Two-layer (exact, then semantic) LRU cache of replies with a time-to-live"""
+
+    def __init__(self,
+                 max_entries: int = 500,
+                 ttl_seconds: float = 3600.0,
+                 embed: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 similarity_threshold: float = 0.92):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Replies kept before the least recently used is evicted
+            ttl_seconds: Age after which a reply is no longer served
+            embed: Maps texts to embedding rows; enables the semantic layer
+            similarity_threshold: Cosine similarity a semantic match must reach
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+
+        self._lock = threading.Lock()
+        # The reply to a missed lookup is usually stored next, so its embedding is kept
+        self._last_embedding: Optional[tuple] = None
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Semantic index: one row per entry slot; freed slots are reused
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_keys: List[Optional[str]] = [None] * max_entries
+        self._slot_contexts = np.full(max_entries, "", dtype=object)
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _embed(self, message: str) -> np.ndarray:
+        """Embedding of one message, reusing the one computed by the previous lookup"""
+        last = self._last_embedding
+        if last is not None and last[0] == message:
+            return last[1]
+        vector = np.asarray(self.embed([message]), dtype=np.float32)[0]
+        self._last_embedding = (message, vector)
+        return vector
+
+    @staticmethod
+    def make_key(message: str, context: str) -> str:
+        return hashlib.sha256(f"{context}\0{normalize_message(message)}".encode("utf-8")).hexdigest()
+
+    def get(self, message: str, context: str) -> Optional[str]:
+        """Cached reply to `message` given the conversation state hash `context`, or None"""
+        key = self.make_key(message, context)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry.response
+            if entry is not None:
+                self._remove(key)
+            if self.embed is None or self._vectors is None:
+                self.misses += 1
+                return None
+
+        # Embedding may be a network call, so it runs outside the lock
+        query = self._embed(message)
+        with self._lock:
+            match = self._nearest(query, context, _numbers(message), now)
+            if match is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(match)
+            self.semantic_hits += 1
+            return self._entries[match].response
+
+    def _nearest(self, query: np.ndarray, context: str, numbers: List[str], now: float) -> Optional[str]:
+        """Most similar live entry in the same conversation state; the caller holds the lock"""
+        candidates = np.flatnonzero(self._slot_contexts == context)
+        if len(candidates) == 0:
+            return None
+        scores = self._vectors[candidates] @ query
+        for index in np.argsort(scores)[::-1]:
+            if scores[index] < self.similarity_threshold:
+                return None
+            key = self._slot_keys[candidates[index]]
+            entry = self._entries[key]
+            if entry.expires_at <= now:
+                self._remove(key)
+            elif entry.numbers == numbers:
+                # "5 minutes" and "6 minutes" embed almost identically but need different replies
+                return key
+        return None
+
+    def put(self, message: str, context: str, response: str) -> None:
+        """Store a reply, evicting the least recently used entry when full"""
+        if self.max_entries <= 0:
+            return
+        vector = None
+        if self.embed is not None:
+            vector = self._embed(message)
+
+        key = self.make_key(message, context)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            slot = None
+            if vector is not None:
+                if self._vectors is None:
+                    self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+                slot = self._free_slots.pop()
+                self._vectors[slot] = vector
+                self._slot_keys[slot] = key
+                self._slot_contexts[slot] = context
+            self._entries[key] = _Entry(response, context, _numbers(message), time.monotonic() + self.ttl_seconds, slot)
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry and free its index slot; the caller holds the lock"""
+        entry = self._entries.pop(key)
+        if entry.slot is not None:
+            self._slot_keys[entry.slot] = None
+            self._slot_contexts[entry.slot] = ""
+            self._free_slots.append(entry.slot)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.exact_hits + self.semantic_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.exact_hits + self.semantic_hits) / lookups if lookups else 0.0,
+            }
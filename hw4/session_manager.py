@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Session Manager
+Per-browser-session state with idle-TTL and LRU eviction and a cap on the
+total memory held by all sessions.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator
+
+
+class _Session:
+    """One resident session and its bookkeeping"""
+
+    def __init__(self, state: Any, size: int):
+        self.state = state
+        self.size = size
+        self.lock = threading.Lock()
+        self._async_lock = None
+        self.last_access = time.monotonic()
+
+    @property
+    def async_lock(self) -> asyncio.Lock:
+        # Created on first async use so it belongs to the serving event loop
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        return self._async_lock
+
+
+class SessionManager:
+    """Creates, reuses and evicts per-session state objects"""
+
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 size_fn: Callable[[Any], int],
+                 idle_ttl_seconds: float = 1800.0,
+                 max_sessions: int = 10000,
+                 max_total_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the session manager
+
+        Args:
+            factory: Creates the state for a new session
+            size_fn: Approximate resident bytes of one session's state
+            idle_ttl_seconds: Sessions idle for longer than this are evicted
+            max_sessions: Most sessions kept at once; the least recently used go first
+            max_total_bytes: Cap on the summed size of all sessions
+        """
+        self.factory = factory
+        self.size_fn = size_fn
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_total_bytes = max_total_bytes
+        self.evictions = 0
+        self._total_bytes = 0
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _get_or_create(self, session_id: str) -> _Session:
+        """Look up a session (marking it most recently used) or create it"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                state = self.factory()
+                session = _Session(state, self.size_fn(state))
+                self._sessions[session_id] = session
+                self._total_bytes += session.size
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_access = time.monotonic()
+            self._evict_locked(keep=session_id)
+            return session
+
+    def get(self, session_id: str) -> Any:
+        """Return the state for a session, creating it if needed"""
+        return self._get_or_create(session_id).state
+
+    @contextmanager
+    def acquire(self, session_id: str) -> Iterator[Any]:
+        """Use a session's state while holding its lock, so its requests run one at a time"""
+        session = self._get_or_create(session_id)
+        with session.lock:
+            try:
+                yield session.state
+            finally:
+                self._update_size(session_id, session)
+
+    @asynccontextmanager
+    async def acquire_async(self, session_id: str) -> AsyncIterator[Any]:
+        """Async `acquire` that waits for the session without blocking the event loop"""
+        session = self._get_or_create(session_id)
+        async with session.async_lock:
+            try:
+                yield session.state
+            finally:
+                self._update_size(session_id, session)
+
+    def _update_size(self, session_id: str, session: _Session) -> None:
+        """Re-measure a session after use; sizes are cached between requests"""
+        size = self.size_fn(session.state)
+        with self._lock:
+            session.last_access = time.monotonic()
+            # The session may have been evicted while it was in use
+            if self._sessions.get(session_id) is session:
+                self._total_bytes += size - session.size
+                session.size = size
+                self._evict_locked(keep=session_id)
+
+    def remove(self, session_id: str) -> None:
+        """Drop a session immediately"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._total_bytes -= session.size
+
+    def evict(self) -> None:
+        """Apply the idle TTL, session count and memory limits"""
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self, keep: str = None) -> None:
+        """Evict expired and least recently used sessions; the caller holds the lock"""
+        now = time.monotonic()
+        # The OrderedDict is kept in LRU order, so expired sessions are at the front
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session_id == keep or now - session.last_access <= self.idle_ttl_seconds:
+                break
+            self._drop_oldest()
+
+        while len(self._sessions) > self.max_sessions and self._drop_oldest(keep):
+            pass
+
+        while self._total_bytes > self.max_total_bytes and self._drop_oldest(keep):
+            pass
+
+    def _drop_oldest(self, keep: str = None) -> bool:
+        """Remove the least recently used session other than `keep`"""
+        for session_id in self._sessions:
+            if session_id != keep:
+                self._total_bytes -= self._sessions.pop(session_id).size
+                self.evictions += 1
+                return True
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        """Return session counts and the approximate resident size"""
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "evictions": self.evictions,
+                "resident_bytes": self._total_bytes,
+            }
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Speculative LLM Requests
+Starts the LLM request from a partial transcript as soon as it stops changing,
+so the reply is often ready by the time the final transcript is. If the final
+transcript (or the conversation it is answered in) turns out different, the
+speculative reply is discarded and the request is made again.
+"""
+
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+
+def normalize_transcript(text: str) -> List[str]:
+    """Words of a transcript, ignoring case and punctuation"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+class SpeculationStats:
+    """Counters across turns: how often speculation paid off and how many calls were wasted"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.calls = 0
+        self.hits = 0
+        self.wasted_calls = 0
+
+    def record(self, calls: int = 0, hits: int = 0, wasted_calls: int = 0, turns: int = 0) -> None:
+        with self._lock:
+            self.calls += calls
+            self.hits += hits
+            self.wasted_calls += wasted_calls
+            self.turns += turns
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "calls": self.calls,
+                "hits": self.hits,
+                "wasted_calls": self.wasted_calls,
+                "hit_rate": self.hits / self.turns if self.turns else 0.0,
+            }
+
+
+class SpeculativeResponder:
+    """Speculates on one utterance: fed partial transcripts, resolved with the final one"""
+
+    def __init__(self,
+                 generate: Callable[[str], str],
+                 executor: ThreadPoolExecutor,
+                 stats: SpeculationStats,
+                 context: Optional[Callable[[], Any]] = None,
+                 stable_partials: int = 2,
+                 min_words: int = 2):
+        """
+        Initialize the responder
+
+        Args:
+            generate: Produces a reply for a message without recording it in memory
+            executor: Runs speculative requests in the background
+            stats: Shared counters updated when the utterance resolves
+            context: Returns a token identifying the conversation state; a speculative
+                reply is only used if the token is unchanged when it resolves
+            stable_partials: Consecutive identical partials that make a transcript stable
+            min_words: Shortest partial worth speculating on
+        """
+        self.generate = generate
+        self.executor = executor
+        self.stats = stats
+        self.context = context or (lambda: None)
+        self.stable_partials = stable_partials
+        self.min_words = min_words
+
+        self._lock = threading.Lock()
+        self._last_words: List[str] = []
+        self._repeats = 0
+        self._words: Optional[List[str]] = None
+        self._context = None
+        self._future: Optional[Future] = None
+        self._calls = 0
+        self._wasted = 0
+        self._resolved = False
+
+    def on_partial(self, text: str) -> None:
+        """Feed a partial transcript; starts (or restarts) a request once it is stable"""
+        words = normalize_transcript(text)
+        with self._lock:
+            if self._resolved:
+                return
+            if words == self._last_words:
+                self._repeats += 1
+            else:
+                self._last_words, self._repeats = words, 1
+
+            if self._repeats < self.stable_partials or len(words) < self.min_words or words == self._words:
+                return
+            self._discard()
+            self._words = words
+            self._context = self.context()
+            self._future = self.executor.submit(self.generate, text)
+            self._calls += 1
+        print(f"🔮 Speculating on: {text}")
+
+    def _discard(self) -> None:
+        """Drop the current speculation; the caller holds the lock"""
+        if self._future is not None:
+            # Requests already in flight can't be aborted; their result is ignored
+            self._future.cancel()
+            self._wasted += 1
+            self._future = None
+            self._words = None
+
+    def resolve(self, final_text: str) -> str:
+        """Return the reply for the final transcript, reusing the speculation when it still applies"""
+        with self._lock:
+            self._resolved = True
+            future = self._future
+            hit = (future is not None
+                   and self._words == normalize_transcript(final_text)
+                   and self._context == self.context())
+            if future is not None and not hit:
+                self._discard()
+
+        reply = None
+        if hit:
+            try:
+                reply = future.result()
+            except Exception as e:
+                print(f"❌ Speculative request failed: {e}")
+                hit = False
+                self._wasted += 1
+        if reply is None:
+            reply = self.generate(final_text)
+        else:
+            print("🔮 Speculative reply reused")
+
+        self.stats.record(calls=self._calls, hits=int(hit), wasted_calls=self._wasted, turns=1)
+        return reply
+
+    def cancel(self) -> None:
+        """Abandon the utterance (e.g. nothing was transcribed)"""
+        with self._lock:
+            if self._resolved:
+                return
+            self._resolved = True
+            self._discard()
+        self.stats.record(calls=self._calls, wasted_calls=self._wasted)
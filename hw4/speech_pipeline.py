@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Speech Pipeline
+Splits a streamed LLM reply into sentences and overlaps text-to-speech and
+playback, so the first sentence is heard while the rest is still generated.
+"""
+
+import queue
+import re
+import threading
+from typing import Any, Callable, List, Optional
+
+# A sentence ends at terminal punctuation (optionally followed by a closing
+# quote or bracket) and whitespace, or at a newline
+_SENTENCE_END = re.compile(r'(?<=[.!?…])["\')\]]*\s+|\n+')
+
+_STOP = object()
+
+
+class SentenceSplitter:
+    """Accumulates streamed text and emits complete sentences"""
+
+    def __init__(self, min_chars: int = 20):
+        """
+        Initialize the splitter
+
+        Args:
+            min_chars: Sentences shorter than this are merged with the next one,
+                so short fragments like "Sure." don't each cost a TTS request
+        """
+        self.min_chars = min_chars
+        self._pending = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any sentences it completed"""
+        self._pending += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._pending):
+            candidate = self._pending[start:match.end()].strip()
+            if len(candidate) >= self.min_chars:
+                sentences.append(candidate)
+                start = match.end()
+        self._pending = self._pending[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever text is left once the stream has ended"""
+        remainder = self._pending.strip()
+        self._pending = ""
+        return remainder or None
+
+
+class SpeechPipeline:
+    """Queue-connected TTS and playback workers"""
+
+    def __init__(self,
+                 synthesize: Callable[[str], Optional[Any]],
+                 play: Callable[[Any], Optional[bool]],
+                 cleanup: Optional[Callable[[Any], None]] = None,
+                 max_pending: int = 4):
+        """
+        Initialize the pipeline
+
+        Args:
+            synthesize: Converts one sentence to audio (MP3 bytes or a file path)
+            play: Plays the audio, blocking until it finishes; returning False
+                means playback was interrupted and the rest of the reply is dropped
+            cleanup: Releases the audio once it has been played (e.g. removes a file)
+            max_pending: Synthesized sentences allowed to wait for playback
+        """
+        self.synthesize = synthesize
+        self.play = play
+        self.cleanup = cleanup
+        self.interrupted = False
+        self._text_queue = queue.Queue()
+        self._audio_queue = queue.Queue(maxsize=max_pending)
+        self._threads = []
+
+    def start(self) -> None:
+        """Start the TTS and playback workers"""
+        self._threads = [
+            threading.Thread(target=self._tts_worker, daemon=True),
+            threading.Thread(target=self._playback_worker, daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, sentence: str) -> None:
+        """Queue a sentence for synthesis and playback"""
+        self._text_queue.put(sentence)
+
+    def finish(self) -> None:
+        """Signal the end of the reply and wait until everything has been played"""
+        self._text_queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _tts_worker(self) -> None:
+        """Synthesize sentences in order and hand them to the playback worker"""
+        while True:
+            sentence = self._text_queue.get()
+            if sentence is _STOP:
+                self._audio_queue.put(_STOP)
+                return
+            if self.interrupted:
+                continue
+            try:
+                audio = self.synthesize(sentence)
+            except Exception as e:
+                print(f"❌ Error converting text to speech: {e}")
+                continue
+            if audio:
+                self._audio_queue.put(audio)
+
+    def _playback_worker(self) -> None:
+        """Play synthesized sentences in order"""
+        while True:
+            audio = self._audio_queue.get()
+            if audio is _STOP:
+                return
+            try:
+                # After a barge-in the remaining sentences are drained unplayed
+                if not self.interrupted and self.play(audio) is False:
+                    self.interrupted = True
+            finally:
+                if self.cleanup is not None:
+                    self.cleanup(audio)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Streaming Speech Recognition
+Runs Whisper over a sliding window while audio is still being captured and
+detects the end of speech so the final transcript is ready almost immediately.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from audio_buffer import AudioRingBuffer
+from audio_io import WHISPER_SAMPLE_RATE, resample_poly
+from vad import SILENCE_RMS
+
+# Time constants of the adaptive noise floor: it follows quieter frames quickly,
+# louder non-speech slowly, and sustained "speech" (a room that got noisier) very slowly
+NOISE_FALL_SECONDS = 0.25
+NOISE_RISE_SECONDS = 5.0
+SPEECH_RISE_SECONDS = 30.0
+
+
+class EnergyEndpointer:
+    """Detects the end of an utterance from frame energy"""
+
+    def __init__(self,
+                 sample_rate: int,
+                 threshold: Optional[float] = None,
+                 silence_seconds: float = 0.8,
+                 min_speech_seconds: float = 0.3,
+                 noise_ratio: float = 3.0):
+        """
+        Initialize the endpointer
+
+        Args:
+            sample_rate: Sample rate of the frames passed to `process`
+            threshold: Fixed RMS level above which a frame counts as speech; when
+                None the level follows the microphone's noise floor
+            silence_seconds: Trailing silence that ends an utterance
+            min_speech_seconds: Speech required before an endpoint can fire
+            noise_ratio: With an adaptive level, frames must be this many times
+                louder than the noise floor to count as speech
+        """
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.silence_seconds = silence_seconds
+        self.min_speech_seconds = min_speech_seconds
+        self.noise_ratio = noise_ratio
+        # Kept across utterances: the microphone and room don't change between turns
+        self.noise_floor: Optional[float] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the current utterance"""
+        self.speech_seconds = 0.0
+        self.trailing_silence = 0.0
+        self.ended = False
+
+    @property
+    def speech_started(self) -> bool:
+        return self.speech_seconds >= self.min_speech_seconds
+
+    @property
+    def speech_level(self) -> float:
+        """RMS level a frame must reach to count as speech"""
+        if self.threshold is not None:
+            return self.threshold
+        return max(SILENCE_RMS, (self.noise_floor or 0.0) * self.noise_ratio)
+
+    def is_speech(self, rms: float) -> bool:
+        """Whether a frame of this RMS level counts as speech"""
+        return rms > 0 and rms >= self.speech_level
+
+    def process(self, samples: np.ndarray) -> bool:
+        """Feed one frame of mono float samples; returns True once the utterance has ended"""
+        if self.ended or len(samples) == 0:
+            return self.ended
+
+        frame_seconds = len(samples) / self.sample_rate
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float32))))
+        if self.noise_floor is None and rms > 0:
+            self.noise_floor = rms
+        speech = self.is_speech(rms)
+        # Zeroed frames (muted by the echo gate) say nothing about the room
+        if rms > 0:
+            if rms < self.noise_floor:
+                time_constant = NOISE_FALL_SECONDS
+            else:
+                time_constant = SPEECH_RISE_SECONDS if speech else NOISE_RISE_SECONDS
+            self.noise_floor += (rms - self.noise_floor) * min(frame_seconds / time_constant, 1.0)
+
+        if speech:
+            self.speech_seconds += frame_seconds
+            self.trailing_silence = 0.0
+        elif self.speech_started:
+            self.trailing_silence += frame_seconds
+            if self.trailing_silence >= self.silence_seconds:
+                self.ended = True
+        return self.ended
+
+
+class StreamingTranscriber:
+    """Transcribes a growing ring buffer in the background, committing text as the window slides"""
+
+    def __init__(self,
+                 transcribe_fn: Callable[[np.ndarray], Dict[str, Any]],
+                 audio_buffer: AudioRingBuffer,
+                 window_seconds: float = 15.0,
+                 interval_seconds: float = 1.0,
+                 on_partial: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the streaming transcriber
+
+        Args:
+            transcribe_fn: Whisper-style transcribe callable taking 16 kHz float32 samples
+            audio_buffer: Ring buffer that the capture callback writes into
+            window_seconds: Longest stretch of uncommitted audio decoded at once
+            interval_seconds: Delay between partial decodes
+            on_partial: Called with the running transcript after each partial decode
+        """
+        self.transcribe_fn = transcribe_fn
+        self.audio_buffer = audio_buffer
+        self.window_seconds = window_seconds
+        self.interval_seconds = interval_seconds
+        self.on_partial = on_partial
+
+        self.committed_text = ""
+        self.partial_text = ""
+        self._committed_position = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self, position: Optional[int] = None) -> None:
+        """Start decoding partial transcripts in a background thread, from `position` or the current end of the buffer"""
+        self.committed_text = ""
+        self.partial_text = ""
+        self._committed_position = self.audio_buffer.total_written if position is None else position
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def finish(self) -> str:
+        """Stop the background thread and decode only the not-yet-committed tail"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        tail_text = self._decode_pending(final=True)
+        return self._join(self.committed_text, tail_text)
+
+    def _run(self) -> None:
+        """Background loop producing partial transcripts"""
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                pending_text = self._decode_pending(final=False)
+            except Exception as e:
+                print(f"❌ Error in streaming transcription: {e}")
+                continue
+
+            self.partial_text = self._join(self.committed_text, pending_text)
+            if self.on_partial and self.partial_text:
+                self.on_partial(self.partial_text)
+
+    def _decode_pending(self, final: bool) -> str:
+        """Decode audio after the committed position, committing finished segments when the window is full"""
+        samples = self.audio_buffer.read_from(self._committed_position)
+        if len(samples) == 0:
+            return ""
+
+        audio = resample_poly(samples, self.audio_buffer.sample_rate, WHISPER_SAMPLE_RATE)
+        window_full = not final and len(samples) >= self.window_seconds * self.audio_buffer.sample_rate
+        if window_full:
+            audio = audio[:int(self.window_seconds * WHISPER_SAMPLE_RATE)]
+
+        result = self.transcribe_fn(audio)
+        segments = result.get("segments") or []
+        if not window_full or not segments:
+            return result.get("text", "").strip()
+
+        # Keep the last segment open (it may be cut mid-word) and commit the rest
+        committed = segments[:-1] or segments
+        self.committed_text = self._join(self.committed_text, "".join(s["text"] for s in committed).strip())
+        self._committed_position += int(committed[-1]["end"] * self.audio_buffer.sample_rate)
+        return "" if committed is segments else segments[-1]["text"].strip()
+
+    @staticmethod
+    def _join(first: str, second: str) -> str:
+        return " ".join(part for part in (first, second) if part)
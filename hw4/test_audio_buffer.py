@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory recording ring buffer (no audio device needed)
+"""
+
+import numpy as np
+
+from audio_buffer import AudioRingBuffer
+
+
+def test_wraparound_keeps_the_most_recent_audio():
+    """Writes past the end wrap around and reads come back in chronological order"""
+    buffer = AudioRingBuffer(max_seconds=1.0, sample_rate=10)
+    samples = np.arange(25, dtype=np.float32)
+    for start in range(0, 25, 7):
+        buffer.write(samples[start:start + 7])
+
+    assert len(buffer) == 10 and buffer.overflowed
+    assert np.array_equal(buffer.read(), samples[15:])
+    assert np.array_equal(buffer.read(last_seconds=0.3), samples[22:])
+
+
+def test_read_from_is_clamped_to_what_is_buffered():
+    """Absolute stream positions stay valid across wraparound; overwritten audio is skipped"""
+    buffer = AudioRingBuffer(max_seconds=1.0, sample_rate=10)
+    samples = np.arange(20, dtype=np.float32)
+    buffer.write(samples[:12])
+    position = buffer.total_written
+    buffer.write(samples[12:])
+
+    assert np.array_equal(buffer.read_from(position), samples[12:])
+    assert np.array_equal(buffer.read_from(0), samples[10:])
+    assert len(buffer.read_from(buffer.total_written)) == 0
+
+
+def test_oversized_write_and_clear():
+    """A single write longer than the buffer keeps its tail; clear empties without reallocating"""
+    buffer = AudioRingBuffer(max_seconds=1.0, sample_rate=10)
+    samples = np.arange(13, dtype=np.float32)
+    buffer.write(samples)
+    assert np.array_equal(buffer.read(), samples[3:])
+
+    storage = buffer._buffer
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.total_written == 0 and not buffer.overflowed
+    assert buffer._buffer is storage
+
+
+def test_stereo_pcm16_is_downmixed():
+    """Interleaved 16-bit stereo becomes mono float32 in [-1, 1)"""
+    buffer = AudioRingBuffer(max_seconds=1.0, sample_rate=10, channels=2)
+    pcm = np.array([16384, 0, -32768, -32768, 32767, 32767], dtype=np.int16)
+    mono = buffer.write_pcm16(pcm.tobytes())
+
+    assert np.allclose(mono, [0.25, -1.0, 32767 / 32768])
+    assert np.array_equal(buffer.read(), mono)
+
+
+if __name__ == "__main__":
+    test_wraparound_keeps_the_most_recent_audio()
+    test_read_from_is_clamped_to_what_is_buffered()
+    test_oversized_write_and_clear()
+    test_stereo_pcm16_is_downmixed()
+    print("✅ Ring buffer tests passed!")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for in-process resampling of uploads to Whisper's 16 kHz (no ffmpeg needed)
+"""
+
+import numpy as np
+
+from audio_io import WHISPER_SAMPLE_RATE, prepare_for_whisper, resample_poly
+
+
+def _sine(frequency: float, sample_rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return np.sin(2 * np.pi * frequency * t).astype(np.float32)
+
+
+def _interior(audio: np.ndarray, margin: int = 400) -> np.ndarray:
+    """Drop the filter's edge transients"""
+    return audio[margin:-margin]
+
+
+def test_tone_survives_common_rates():
+    """A 1 kHz tone comes out at the right length, pitch and level from 8, 44.1 and 48 kHz"""
+    expected = _sine(1000, WHISPER_SAMPLE_RATE)
+    for rate in (8000, 44100, 48000):
+        out = resample_poly(_sine(1000, rate), rate)
+        assert out.dtype == np.float32
+        assert len(out) == WHISPER_SAMPLE_RATE
+        assert np.max(np.abs(_interior(out - expected))) < 0.01
+
+
+def test_content_above_16k_nyquist_is_filtered():
+    """A 10 kHz tone can't be represented at 16 kHz and must not fold back as a 6 kHz alias"""
+    out = resample_poly(_sine(10000, 48000), 48000)
+    assert np.sqrt(np.mean(_interior(out) ** 2)) < 0.01
+
+
+def test_matching_rate_and_empty_input_pass_through():
+    audio = _sine(440, WHISPER_SAMPLE_RATE)
+    assert resample_poly(audio, WHISPER_SAMPLE_RATE) is audio
+    assert len(resample_poly(np.zeros(0, dtype=np.float32), 44100)) == 0
+
+
+def test_gradio_stereo_int16_upload():
+    """A Gradio (rate, samples) tuple of int16 stereo becomes 16 kHz mono float32"""
+    left = (_sine(1000, 44100) * 16384).astype(np.int16)
+    stereo = np.stack([left, left], axis=1)
+    out = prepare_for_whisper((44100, stereo))
+
+    assert out.dtype == np.float32 and len(out) == WHISPER_SAMPLE_RATE
+    assert np.max(np.abs(_interior(out - _sine(1000, WHISPER_SAMPLE_RATE) * 0.5))) < 0.01
+
+
+if __name__ == "__main__":
+    test_tone_survives_common_rates()
+    test_content_above_16k_nyquist_is_filtered()
+    test_matching_rate_and_empty_input_pass_through()
+    test_gradio_stereo_int16_upload()
+    print("✅ Resampling tests passed!")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for batched transcription error isolation (no Whisper weights needed)
+"""
+
+import threading
+
+import numpy as np
+
+import batch_asr
+from batch_asr import MicroBatcher, transcribe_batch
+
+SAMPLE_RATE = 16000
+
+
+def _fake_decode_clips(model, clips, **decode_options):
+    """Stands in for one padded forward pass; a NaN clip fails the whole batch"""
+    if any(np.isnan(clip).any() for clip in clips):
+        raise ValueError("NaN in mel batch")
+    return [f"{len(clip) / SAMPLE_RATE:.0f}s" for clip in clips]
+
+
+class _LongFormModel:
+    """Only `transcribe` is used, for clips past Whisper's 30 second window"""
+
+    def transcribe(self, audio, **options):
+        return {"text": f" long {len(audio) / SAMPLE_RATE:.0f}s "}
+
+
+def test_bad_inputs_only_fail_themselves():
+    """An unreadable upload and a clip that breaks the batched pass don't fail their neighbours"""
+    bad_clip = np.full(SAMPLE_RATE, np.nan, dtype=np.float32)
+    audios = [
+        np.zeros(2 * SAMPLE_RATE, dtype=np.float32),
+        "/nonexistent/upload.wav",
+        bad_clip,
+        np.zeros(40 * SAMPLE_RATE, dtype=np.float32),
+        np.zeros(3 * SAMPLE_RATE, dtype=np.float32),
+    ]
+
+    original = batch_asr.decode_clips
+    batch_asr.decode_clips = _fake_decode_clips
+    try:
+        results = transcribe_batch(_LongFormModel(), audios)
+    finally:
+        batch_asr.decode_clips = original
+
+    assert results[0] == "2s"
+    assert isinstance(results[1], Exception)
+    assert isinstance(results[2], ValueError)
+    assert results[3] == "long 40s"
+    assert results[4] == "3s"
+
+
+def test_micro_batcher_isolates_failures():
+    """Per-item exceptions reach only their own future, and a crashed batch doesn't stop the scheduler"""
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        if "crash" in items:
+            raise RuntimeError("batch crashed")
+        return [ValueError(item) if item.startswith("bad") else item.upper() for item in items]
+
+    batcher = MicroBatcher(batch_fn, window_ms=200, max_batch_size=8)
+    futures = {}
+    threads = [threading.Thread(target=lambda item=item: futures.__setitem__(item, batcher.submit(item)))
+               for item in ("a", "bad-b", "c")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert futures["a"].result(timeout=5) == "A"
+    assert futures["c"].result(timeout=5) == "C"
+    assert isinstance(futures["bad-b"].exception(timeout=5), ValueError)
+    assert len(batches) == 1 and sorted(batches[0]) == ["a", "bad-b", "c"]
+
+    crashed = [batcher.submit("crash"), batcher.submit("d")]
+    for future in crashed:
+        assert isinstance(future.exception(timeout=5), RuntimeError)
+    assert batcher.submit("e").result(timeout=5) == "E"
+
+
+if __name__ == "__main__":
+    test_bad_inputs_only_fail_themselves()
+    test_micro_batcher_isolates_failures()
+    print("✅ Batch ASR tests passed!")
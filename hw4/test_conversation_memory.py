@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for the rolling conversation memory (no API key needed)
+"""
+
+import threading
+import time
+
+from conversation_memory import RollingConversationMemory
+
+
+def _save_turns(memory: RollingConversationMemory, count: int) -> None:
+    for i in range(count):
+        memory.save_context({"input": f"question {i} " + "word " * 20}, {"output": f"answer {i} " + "word " * 20})
+
+
+def test_slow_summary_does_not_delay_saving():
+    """Folding waits on the summarizer in the background; saving a turn returns at once"""
+    release = threading.Event()
+
+    def slow_summary(previous, messages, max_tokens):
+        release.wait(5)
+        return f"summary of {len(messages)} messages"
+
+    memory = RollingConversationMemory(max_tokens=100, keep_turns=2, summarize_fn=slow_summary)
+    _save_turns(memory, 1)  # imports langchain's message classes
+    began = time.perf_counter()
+    _save_turns(memory, 5)
+    assert time.perf_counter() - began < 1.0
+    # The turns are all there verbatim until the fold lands
+    assert len(memory.messages) == 12 and memory.summary == ""
+
+    release.set()
+    assert memory.wait_for_fold(5)
+    assert memory.summary.startswith("summary of")
+    assert len(memory.messages) == 4
+
+
+def test_clear_discards_a_fold_in_flight():
+    """A fold that finishes after `clear` doesn't leak the old conversation into the new one"""
+    release = threading.Event()
+    memory = RollingConversationMemory(max_tokens=100, keep_turns=2,
+                                       summarize_fn=lambda previous, messages, max_tokens: release.wait(5) and "old")
+    _save_turns(memory, 6)
+    memory.clear()
+    release.set()
+
+    assert memory.wait_for_fold(5)
+    assert memory.summary == "" and memory.messages == []
+
+
+if __name__ == "__main__":
+    test_slow_summary_does_not_delay_saving()
+    test_clear_discards_a_fold_in_flight()
+    print("✅ Conversation memory tests passed!")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk LRU cache behind the TTS and transcript caches
+"""
+
+import os
+import tempfile
+
+from disk_cache import DiskLRUCache
+
+
+def _age(cache: DiskLRUCache, key: str, seconds_ago: float) -> None:
+    """Backdate an entry's last use; mtime resolution can't separate back-to-back writes"""
+    when = os.path.getmtime(cache.path_for(key)) - seconds_ago
+    os.utime(cache.path_for(key), (when, when))
+
+
+def test_least_recently_used_entry_is_evicted():
+    """A lookup refreshes an entry, so the one not read for longest goes when the cache is full"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskLRUCache(cache_dir, max_bytes=250, suffix=".mp3")
+        cache.put("a", b"x" * 100)
+        cache.put("b", b"y" * 100)
+        _age(cache, "a", 20)
+        _age(cache, "b", 10)
+
+        assert cache.get_bytes("a") == b"x" * 100
+        cache.put("c", b"z" * 100)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+
+def test_oversized_entry_and_partial_writes():
+    """Eviction ignores in-progress temp files, and an entry bigger than the cache doesn't survive"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DiskLRUCache(cache_dir, max_bytes=100)
+        with open(os.path.join(cache_dir, ".tmp-writing"), "wb") as f:
+            f.write(b"w" * 1000)
+
+        cache.put("small", b"s" * 50)
+        assert cache.get("small") is not None
+        cache.put("huge", b"h" * 500)
+
+        assert cache.get("huge") is None
+        assert os.path.exists(os.path.join(cache_dir, ".tmp-writing"))
+
+
+def test_key_parts_are_unambiguous():
+    assert DiskLRUCache.make_key("ab", "c") != DiskLRUCache.make_key("a", "bc")
+    assert DiskLRUCache.make_key("hello", "en") == DiskLRUCache.make_key("hello", "en")
+
+
+if __name__ == "__main__":
+    test_least_recently_used_entry_is_evicted()
+    test_oversized_entry_and_partial_writes()
+    test_key_parts_are_unambiguous()
+    print("✅ Disk cache tests passed!")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for the hands-free echo gate (no audio device needed)
+"""
+
+import numpy as np
+
+from duplex import EchoGate
+
+SAMPLE_RATE = 16000
+
+
+def _frame(rms: float, rng) -> np.ndarray:
+    return (rng.standard_normal(1024) * rms).astype(np.float32)
+
+
+def test_calibrated_gate_passes_voice_quieter_than_playback():
+    """With a quiet microphone the user's voice is below the playback level, yet not echo"""
+    rng = np.random.default_rng(0)
+    level = [0.1]
+    gate = EchoGate(lambda: level[0], SAMPLE_RATE)
+
+    # The probe plays at 0.1 and reaches the microphone at about 0.004
+    gate.start_calibration()
+    for _ in range(30):
+        assert not gate.filter(_frame(0.004, rng)).any()
+    ratio = gate.finish_calibration()
+
+    assert 0.05 <= ratio < 0.2
+    assert not gate.filter(_frame(0.004, rng)).any()
+    assert gate.filter(_frame(0.05, rng)).any()
+
+
+def test_calibration_without_playback_keeps_the_ratio():
+    """If the player never produced sound, nothing is measured and the ratio is unchanged"""
+    gate = EchoGate(lambda: 0.0, SAMPLE_RATE, echo_ratio=1.5)
+    gate.start_calibration()
+    gate.filter(_frame(0.01, np.random.default_rng(0)))
+
+    assert gate.finish_calibration() is None
+    assert gate.echo_ratio == 1.5
+
+
+if __name__ == "__main__":
+    test_calibrated_gate_passes_voice_quieter_than_playback()
+    test_calibration_without_playback_keeps_the_ratio()
+    print("✅ Echo gate tests passed!")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for LLM routing with the offline stub backend (no API key needed)
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_router import CircuitBreaker, LatencyTracker, LLMRouter, ModelRoute, StubLLM
+from voice_ai_app import VoiceAI, ERROR_RESPONSE
+
+
+async def _collect(stream) -> str:
+    return "".join([chunk async for chunk in stream])
+
+
+def test_astream_ai_response_with_stub():
+    """The async streaming path used by the web UI replies through the router"""
+    voice_ai = VoiceAI(llm_models=["stub"], vad_trim=False)
+
+    reply = asyncio.run(_collect(voice_ai.astream_ai_response("hello there")))
+
+    assert reply != ERROR_RESPONSE
+    assert reply.strip() == "You said: hello there"
+    messages = voice_ai.memory.chat_memory.messages
+    assert [msg.content for msg in messages] == ["hello there", "You said: hello there"]
+
+
+def test_astream_fails_over_before_first_chunk():
+    """A failing model is skipped until a model produces its first chunk"""
+    voice_ai = VoiceAI(llm_models=["stub"], vad_trim=False)
+    failing = ModelRoute("failing", StubLLM(fail=True))
+    working = ModelRoute("working", StubLLM(reply="from the backup"))
+    voice_ai._shared.llm = LLMRouter([failing, working])
+
+    reply = asyncio.run(_collect(voice_ai.astream_ai_response("hi")))
+
+    assert reply.strip() == "from the backup"
+    assert failing.failures == 1
+
+
+def test_queue_time_does_not_trigger_hedges():
+    """Requests queued behind other sessions' calls are only hedged on their own running time"""
+    primary = ModelRoute("primary", StubLLM(latency=0.15, reply="primary"),
+                         tracker=LatencyTracker(initial_deadline=0.3))
+    backup = ModelRoute("backup", StubLLM(reply="backup"))
+    router = LLMRouter([primary, backup], max_concurrency=1)
+
+    # Each request waits up to 0.6s for the single primary slot, but runs for only 0.15s
+    with ThreadPoolExecutor(max_workers=5) as sessions:
+        replies = list(sessions.map(lambda _: router.invoke("hi").content, range(5)))
+
+    assert replies == ["primary"] * 5
+    assert router.hedged_requests == 0
+
+
+def test_streams_hedge_on_time_to_first_chunk():
+    """A model slower than its p95 time to first chunk is raced against the next one"""
+    def make_router():
+        slow = ModelRoute("slow", StubLLM(latency=2.0, reply="slow"),
+                          first_chunk_tracker=LatencyTracker(initial_deadline=0.2))
+        return LLMRouter([slow, ModelRoute("fast", StubLLM(reply="fast reply"))])
+
+    async def collect(router):
+        return "".join([chunk.content async for chunk in router.astream("hi")])
+
+    for run in (lambda router: asyncio.run(collect(router)),
+                lambda router: "".join(chunk.content for chunk in router.stream("hi"))):
+        router = make_router()
+        started = time.perf_counter()
+        reply = run(router)
+
+        assert time.perf_counter() - started < 1.0
+        assert reply.strip() == "fast reply"
+        assert router.hedge_wins == 1
+        assert router.routes[1].first_chunk_tracker.percentile(50) is None  # fewer than min_samples
+        assert len(router.routes[1].first_chunk_tracker._latencies) == 1
+
+
+def test_ainvoke_is_natively_async():
+    """Concurrent async requests hedge like invoke and don't queue on a thread pool"""
+    async def run():
+        slow = ModelRoute("slow", StubLLM(latency=2.0, reply="slow"), tracker=LatencyTracker(initial_deadline=0.2))
+        router = LLMRouter([slow, ModelRoute("fast", StubLLM(reply="fast"))])
+        started = time.perf_counter()
+        replies = await asyncio.gather(*[router.ainvoke("hi") for _ in range(50)])
+        return time.perf_counter() - started, replies, router
+
+    elapsed, replies, router = asyncio.run(run())
+    assert elapsed < 1.0
+    assert {reply.content for reply in replies} == {"fast"}
+    assert router.hedge_wins == 50
+
+
+def test_abandoned_stream_releases_half_open_trial():
+    """A client disconnecting mid-stream must not leave the breaker's trial in flight forever"""
+    route = ModelRoute("model", StubLLM(reply="one two three"),
+                       breaker=CircuitBreaker(failure_threshold=1, reset_seconds=0.05))
+    router = LLMRouter([route])
+
+    async def read_one_chunk():
+        stream = router.astream("hi")
+        await stream.__anext__()
+        await stream.aclose()
+
+    route.breaker.record_failure()
+    time.sleep(0.06)
+    asyncio.run(read_one_chunk())
+    assert route.breaker.allow()
+
+    route.breaker.record_failure()
+    time.sleep(0.06)
+    stream = router.stream("hi")
+    next(stream)
+    stream.close()
+    assert router.invoke("hi").content == "one two three"
+
+
+if __name__ == "__main__":
+    test_astream_ai_response_with_stub()
+    test_astream_fails_over_before_first_chunk()
+    test_queue_time_does_not_trigger_hedges()
+    test_streams_hedge_on_time_to_first_chunk()
+    test_ainvoke_is_natively_async()
+    test_abandoned_stream_releases_half_open_trial()
+    print("✅ LLM router tests passed!")
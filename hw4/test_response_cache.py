@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM response cache with the offline stub backend (no API key needed)
+"""
+
+import asyncio
+
+from llm_router import LLMRouter, ModelRoute, StubLLM
+from response_cache import SIMILARITY_THRESHOLDS, ResponseCache, ngram_embedding
+from voice_ai_app import VoiceAI, ERROR_RESPONSE
+
+
+class _FlakyEmbedding:
+    """Embeds the first `working_calls` requests, then fails like an unreachable API"""
+
+    def __init__(self, working_calls: int):
+        self.working_calls = working_calls
+
+    def __call__(self, texts):
+        if self.working_calls <= 0:
+            raise ConnectionError("embedding API unreachable")
+        self.working_calls -= 1
+        return ngram_embedding(texts)
+
+
+class _CountingEmbedding:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts):
+        self.calls += 1
+        return ngram_embedding(texts)
+
+
+def test_ngram_threshold_matches_rewording_but_not_near_miss():
+    """At the ngram default threshold a reworded question hits and a different one misses"""
+    cache = ResponseCache(embed=ngram_embedding, similarity_threshold=SIMILARITY_THRESHOLDS["ngram"])
+    cache.put("what's the time", "ctx", "It is noon.")
+    cache.put("what is the weather today", "ctx", "Sunny.")
+
+    assert cache.get("what is the time now", "ctx") == "It is noon."
+    assert cache.get("What's the weather today?", "ctx") == "Sunny."
+    assert cache.get("what is the weather tomorrow", "ctx") is None
+    assert cache.get("turn off the lights", "ctx") is None
+    assert cache.semantic_hits == 1 and cache.exact_hits == 1
+
+
+def test_missed_lookup_and_store_embed_once():
+    """The reply stored after a missed lookup reuses the lookup's embedding"""
+    embed = _CountingEmbedding()
+    cache = ResponseCache(embed=embed)
+    cache.put("hello there", "ctx", "Hi!")
+    embed.calls = 0
+
+    assert cache.get("how are you", "ctx") is None
+    cache.put("how are you", "ctx", "Fine, thanks.")
+    assert embed.calls == 1
+
+
+def test_cache_errors_do_not_break_replies():
+    """A failing cache lookup or store is a miss, never an error reply"""
+    voice_ai = VoiceAI(llm_models=["stub"], vad_trim=False, response_cache_size=10)
+    voice_ai.response_cache = ResponseCache(max_entries=10, embed=_FlakyEmbedding(working_calls=1))
+
+    # The first reply is cached; the second turn's semantic lookup and store both fail
+    first = voice_ai.get_ai_response("hello there")
+    second = voice_ai.get_ai_response("how are you")
+
+    assert first.strip() == "You said: hello there"
+    assert second.strip() == "You said: how are you"
+    assert ERROR_RESPONSE not in (first, second)
+    assert len(voice_ai.memory.chat_memory.messages) == 4
+
+
+def test_streamed_replies_use_the_cache():
+    """Both streaming paths store their reply and serve a repeat question from the cache"""
+    voice_ai = VoiceAI(llm_models=["stub"], vad_trim=False, response_cache_size=10)
+    first = voice_ai.for_session()
+    streamed = "".join(first.stream_ai_response("hello there")).strip()
+
+    # A new session starts from the same (empty) conversation, so the reply is reused
+    voice_ai._shared.llm = LLMRouter([ModelRoute("failing", StubLLM(fail=True))])
+    second = voice_ai.for_session()
+
+    async def collect():
+        return [chunk async for chunk in second.astream_ai_response("Hello there!")]
+
+    chunks = asyncio.run(collect())
+    assert chunks == [streamed]
+    assert voice_ai.response_cache.exact_hits == 1
+    assert [msg.content for msg in second.memory.chat_memory.messages] == ["Hello there!", streamed]
+
+
+if __name__ == "__main__":
+    test_ngram_threshold_matches_rewording_but_not_near_miss()
+    test_missed_lookup_and_store_embed_once()
+    test_cache_errors_do_not_break_replies()
+    test_streamed_replies_use_the_cache()
+    print("✅ Response cache tests passed!")
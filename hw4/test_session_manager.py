@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for per-session state eviction (no Gradio or model needed)
+"""
+
+import time
+
+from session_manager import SessionManager
+
+
+def _manager(**limits) -> SessionManager:
+    """Sessions are dicts whose "size" entry is what size_fn reports"""
+    return SessionManager(factory=lambda: {"size": 100}, size_fn=lambda state: state["size"], **limits)
+
+
+def test_idle_sessions_expire():
+    """Sessions idle past the TTL are dropped; recently used ones stay"""
+    sessions = _manager(idle_ttl_seconds=0.1)
+    sessions.get("old")
+    time.sleep(0.15)
+    sessions.get("recent")
+    sessions.evict()
+
+    assert sessions.stats() == {"sessions": 1, "evictions": 1, "resident_bytes": 100}
+    assert sessions.get("recent") is not None and len(sessions) == 1
+
+
+def test_least_recently_used_session_goes_first():
+    """Over the session cap, the session untouched for longest is evicted"""
+    sessions = _manager(max_sessions=2)
+    first = sessions.get("a")
+    sessions.get("b")
+    assert sessions.get("a") is first  # a is now more recent than b
+    sessions.get("c")
+
+    assert len(sessions) == 2 and sessions.evictions == 1
+    assert sessions.get("a") is first
+    assert sessions.evictions == 1
+
+
+def test_growing_session_evicts_others_but_not_itself():
+    """Re-measured sizes count toward the byte cap; the session in use is never the one dropped"""
+    sessions = _manager(max_total_bytes=350)
+    for session_id in ("a", "b", "c"):
+        sessions.get(session_id)
+
+    with sessions.acquire("c") as state:
+        state["size"] = 300
+    assert sessions.stats() == {"sessions": 1, "evictions": 2, "resident_bytes": 300}
+
+    # Even alone over the cap, the session in use survives
+    with sessions.acquire("c") as state:
+        state["size"] = 1000
+    assert len(sessions) == 1 and sessions.stats()["resident_bytes"] == 1000
+
+
+if __name__ == "__main__":
+    test_idle_sessions_expire()
+    test_least_recently_used_session_goes_first()
+    test_growing_session_evicts_others_but_not_itself()
+    print("✅ Session manager tests passed!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for end-of-speech detection on quiet and noisy microphones (no audio device needed)
+"""
+
+import time
+
+import numpy as np
+
+from streaming_asr import EnergyEndpointer
+from voice_ai_app import VoiceAI
+
+SAMPLE_RATE = 16000
+FRAME = 1024
+
+
+def _tone(seconds: float, rms: float) -> np.ndarray:
+    """Voiced tone modulated at syllable rate"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    wave = np.sin(2 * np.pi * 180 * t) * (0.55 + 0.45 * np.sin(2 * np.pi * 3 * t))
+    return (wave / np.sqrt(np.mean(wave ** 2)) * rms).astype(np.float32)
+
+
+def _noise(seconds: float, rms: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * rms).astype(np.float32)
+
+
+def _endpoint_seconds(endpointer: EnergyEndpointer, audio: np.ndarray):
+    """Seconds into `audio` at which the utterance ends, or None"""
+    for start in range(0, len(audio), FRAME):
+        if endpointer.process(audio[start:start + FRAME]):
+            return (start + FRAME) / SAMPLE_RATE
+    return None
+
+
+def test_quiet_microphone_detects_speech():
+    """Speech far below 0.01 RMS is heard against a clean microphone's noise floor"""
+    for floor, level in ((3e-4, 0.003), (3e-4, 0.007), (0.003, 0.05)):
+        audio = np.concatenate([_noise(1.0, floor), _tone(3.0, level) + _noise(3.0, floor, 1), _noise(2.0, floor, 2)])
+        ended = _endpoint_seconds(EnergyEndpointer(SAMPLE_RATE), audio)
+        assert ended is not None and 4.0 < ended < 5.0
+
+
+def test_steady_noise_is_not_speech():
+    """Background noise at any level never starts an utterance"""
+    for rms in (3e-4, 0.005, 0.02):
+        endpointer = EnergyEndpointer(SAMPLE_RATE)
+        assert _endpoint_seconds(endpointer, _noise(30.0, rms)) is None
+        assert endpointer.speech_seconds == 0
+
+
+def test_fixed_threshold_is_respected():
+    """An explicit threshold turns adaptation off"""
+    audio = np.concatenate([_noise(1.0, 3e-4), _tone(3.0, 0.004), _noise(2.0, 3e-4)])
+    assert _endpoint_seconds(EnergyEndpointer(SAMPLE_RATE, threshold=0.01), audio) is None
+
+
+def test_wait_gives_up_without_speech():
+    """A streamed recording nobody speaks into stops after the no-speech timeout, not MAX_RECORD_SECONDS"""
+    voice_ai = VoiceAI(llm_models=["stub"], no_speech_timeout_seconds=0.2)
+    began = time.perf_counter()
+    assert not voice_ai.wait_for_end_of_speech()
+    assert time.perf_counter() - began < 1.0
+
+
+if __name__ == "__main__":
+    test_quiet_microphone_detects_speech()
+    test_steady_noise_is_not_speech()
+    test_fixed_threshold_is_respected()
+    test_wait_gives_up_without_speech()
+    print("✅ Endpointer tests passed!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for transcript cache keys (no Whisper model or ASR server needed)
+"""
+
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from voice_ai_app import VoiceAI
+
+
+class _CountingClient:
+    """Stands in for ASRClient and counts model lookups"""
+
+    def __init__(self):
+        self.model_calls = 0
+
+    def model(self) -> str:
+        self.model_calls += 1
+        return "faster-whisper:small (int8)"
+
+
+class _LoadedEngine:
+    def __repr__(self) -> str:
+        return "whisper:base"
+
+
+def test_server_model_is_asked_once():
+    """Every session reuses the model name the ASR server reported the first time"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        voice_ai = VoiceAI(llm_models=["stub"], asr_cache_dir=cache_dir)
+        client = _CountingClient()
+        voice_ai.asr_client = client
+        audio = np.zeros(16000, dtype=np.float32)
+
+        first_key, _ = voice_ai._cached_transcript(audio)
+        second_key, _ = voice_ai.for_session()._cached_transcript(audio)
+        assert first_key == second_key
+        assert client.model_calls == 1
+
+
+def test_key_does_not_wait_for_warm_up():
+    """A loaded engine names the key at once, even while its warm-up pass is still running"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        voice_ai = VoiceAI(llm_models=["stub"], asr_cache_dir=cache_dir)
+        voice_ai._shared.asr_engine = _LoadedEngine()
+        release = threading.Event()
+        voice_ai._shared.asr_warm_up = threading.Thread(target=release.wait, args=(5,), daemon=True)
+        voice_ai._shared.asr_warm_up.start()
+
+        began = time.perf_counter()
+        key, cached = voice_ai._cached_transcript(np.zeros(16000, dtype=np.float32))
+        assert time.perf_counter() - began < 1.0
+        assert key is not None and cached is None
+        assert voice_ai._shared.asr_model == "whisper:base"
+        release.set()
+
+
+if __name__ == "__main__":
+    test_server_model_is_asked_once()
+    test_key_does_not_wait_for_warm_up()
+    print("✅ Transcript cache tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for silence trimming on quiet recordings (no audio files or model needed)
+"""
+
+import numpy as np
+
+from vad import VoiceActivityDetector
+from voice_ai_app import VoiceAI
+
+SAMPLE_RATE = 16000
+
+
+def _tone(seconds: float, rms: float, depth: float = 1.0) -> np.ndarray:
+    """Voiced tone whose level is modulated at syllable rate by `depth` (0 to 1)"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    wave = np.sin(2 * np.pi * 180 * t) * (1 - depth / 2 + depth / 2 * np.sin(2 * np.pi * 3 * t))
+    return (wave / np.sqrt(np.mean(wave ** 2)) * rms).astype(np.float32)
+
+
+def _noise(seconds: float, rms: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * rms).astype(np.float32)
+
+
+def test_quiet_speech_is_kept():
+    """Speech well under 0.01 RMS on a clean microphone survives trimming"""
+    audio = np.concatenate([_noise(0.5, 3e-4), _tone(2.0, 0.007), _noise(0.5, 3e-4)])
+    trimmed = VoiceActivityDetector().trim(audio)
+    assert 2.0 <= len(trimmed) / SAMPLE_RATE < 3.0
+
+
+def test_speech_without_surrounding_silence_is_kept():
+    """A recording that is speech from start to end has no quiet tenth to take as the noise floor"""
+    vad = VoiceActivityDetector()
+    for depth in (0.9, 0.3):
+        assert len(vad.trim(_tone(3.0, 0.1, depth))) == 3 * SAMPLE_RATE
+
+
+def test_steady_noise_is_trimmed_away():
+    """Background noise with no speech in it is not mistaken for continuous speech"""
+    vad = VoiceActivityDetector()
+    for rms in (0.001, 0.003, 0.01):
+        assert len(vad.trim(_noise(3.0, rms))) == 0
+
+
+def test_trimming_everything_falls_back_to_the_recording():
+    """Only truly silent recordings are skipped; otherwise Whisper gets the untrimmed audio"""
+    voice_ai = VoiceAI(llm_models=["stub"], vad_energy_threshold=0.05)
+    quiet = np.concatenate([_noise(0.5, 3e-4), _tone(2.0, 0.007)])
+
+    assert len(voice_ai.vad.trim(quiet)) == 0
+    assert np.array_equal(voice_ai._prepare_for_asr(quiet), quiet)
+    # Ordinary microphone noise with no speech never reaches Whisper
+    for rms in (3e-4, 0.003, 0.01):
+        assert voice_ai._prepare_for_asr(_noise(1.0, rms)) is None
+
+    # The recording passed on untrimmed counts as neither silent nor trimmed
+    stats = voice_ai.vad.stats()
+    assert stats["inputs"] == 4
+    assert stats["silent_inputs"] == 3
+    assert abs(stats["seconds_removed"] - 3.0) < 1e-6
+
+
+if __name__ == "__main__":
+    test_quiet_speech_is_kept()
+    test_speech_without_surrounding_silence_is_kept()
+    test_steady_noise_is_trimmed_away()
+    test_trimming_everything_falls_back_to_the_recording()
+    print("✅ VAD tests passed!")
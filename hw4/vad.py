@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Voice Activity Detection
+Vectorized short-time energy and zero-crossing-rate detector that trims
+silence before transcription and rejects recordings with no speech at all.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import WHISPER_SAMPLE_RATE
+
+# RMS below which a frame is silence whatever the noise floor (about -54 dBFS);
+# quiet but clean microphones can put speech itself well under 0.01
+SILENCE_RMS = 0.002
+
+# Recordings whose loud frames are at most this much louder than their quiet
+# ones hold a steady level throughout: background noise or hum, not speech
+STATIONARY_RANGE = 1.25
+
+
+def frame_features(audio: np.ndarray, frame_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame RMS energy and zero-crossing rate of mono float audio"""
+    n_frames = len(audio) // frame_samples
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+    frames = audio[:n_frames * frame_samples].reshape(n_frames, frame_samples)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(frame_samples - 1)
+    return rms, zcr.astype(np.float32)
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """[start, end) frame ranges where a boolean mask is True"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+class VoiceActivityDetector:
+    """Energy/zero-crossing VAD that cuts leading, trailing and long internal silence"""
+
+    def __init__(self,
+                 sample_rate: int = WHISPER_SAMPLE_RATE,
+                 frame_ms: float = 30.0,
+                 energy_threshold: Optional[float] = None,
+                 noise_ratio: float = 3.0,
+                 fricative_zcr: float = 0.25,
+                 min_speech_ms: float = 120.0,
+                 padding_ms: float = 200.0,
+                 max_pause_seconds: float = 0.6):
+        """
+        Initialize the detector
+
+        Args:
+            sample_rate: Sample rate of the audio passed to `trim`
+            frame_ms: Analysis frame length
+            energy_threshold: Minimum RMS level treated as voiced speech; by default
+                only the noise floor (and SILENCE_RMS) sets the level
+            noise_ratio: Frames must be this many times louder than the estimated
+                noise floor, so steady background noise isn't speech
+            fricative_zcr: Zero-crossing rate above which quieter frames (s, f, sh)
+                still count as speech when at least half the energy threshold
+            min_speech_ms: Shorter bursts of activity (clicks, bumps) are ignored
+            padding_ms: Audio kept on each side of speech so word edges aren't clipped
+            max_pause_seconds: Internal pauses longer than this are shortened to it
+        """
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, int(sample_rate * frame_ms / 1000))
+        self.energy_threshold = SILENCE_RMS if energy_threshold is None else energy_threshold
+        self.noise_ratio = noise_ratio
+        self.fricative_zcr = fricative_zcr
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.padding_frames = int(round(padding_ms / frame_ms))
+        self.max_pause_samples = int(max_pause_seconds * sample_rate)
+
+        self.inputs = 0
+        self.silent_inputs = 0
+        self.seconds_in = 0.0
+        self.seconds_removed = 0.0
+        self._lock = threading.Lock()
+
+    def _noise_floor(self, rms: np.ndarray) -> float:
+        """
+        Estimate the background level from per-frame RMS
+
+        The quietest tenth of the recording approximates the noise floor, but
+        speech with no silence around it has no quiet tenth; the estimate is
+        then capped so the threshold stays at or below half the loud-frame level.
+        """
+        quiet, loud = (float(level) for level in np.percentile(rms, [10, 90]))
+        if loud <= quiet * STATIONARY_RANGE:
+            return loud
+        return min(quiet, loud / (2 * self.noise_ratio))
+
+    def speech_mask(self, audio: np.ndarray) -> np.ndarray:
+        """Boolean speech flag for each analysis frame, including padding"""
+        rms, zcr = frame_features(audio, self.frame_samples)
+        if len(rms) == 0:
+            return np.zeros(0, dtype=bool)
+
+        noise_floor = self._noise_floor(rms)
+        threshold = max(self.energy_threshold, noise_floor * self.noise_ratio)
+        voiced = rms > threshold
+        unvoiced = (rms > threshold * 0.5) & (zcr > self.fricative_zcr)
+        active = voiced | unvoiced
+
+        mask = np.zeros(len(active), dtype=bool)
+        for start, end in _runs(active):
+            if end - start >= self.min_speech_frames:
+                mask[max(0, start - self.padding_frames):end + self.padding_frames] = True
+        return mask
+
+    def is_silent(self, audio: np.ndarray) -> bool:
+        """
+        Whether no frame of `audio` rises above its own noise floor
+
+        Unlike `trim`, this ignores `energy_threshold`: a recording whose speech is
+        quieter than the configured level is not silent, only quiet.
+        """
+        rms, _ = frame_features(np.asarray(audio, dtype=np.float32), self.frame_samples)
+        if len(rms) == 0:
+            return True
+        return float(rms.max()) <= max(SILENCE_RMS, self._noise_floor(rms) * self.noise_ratio)
+
+    def speech_segments(self, audio: np.ndarray) -> List[Tuple[int, int]]:
+        """[start, end) sample ranges that contain speech"""
+        audio = np.asarray(audio, dtype=np.float32)
+        segments = [
+            (start * self.frame_samples, min(end * self.frame_samples, len(audio)))
+            for start, end in _runs(self.speech_mask(audio))
+        ]
+        # Frames are whole, so speech running into a partial final frame keeps its tail
+        if segments and segments[-1][1] >= (len(audio) // self.frame_samples) * self.frame_samples:
+            segments[-1] = (segments[-1][0], len(audio))
+        return segments
+
+    def trim(self, audio: np.ndarray) -> np.ndarray:
+        """Return only the speech in `audio`; empty when there is none (not counted in the stats)"""
+        audio = np.asarray(audio, dtype=np.float32)
+        segments = self.speech_segments(audio)
+
+        pieces = []
+        gap = np.zeros(self.max_pause_samples, dtype=np.float32)
+        for i, (start, end) in enumerate(segments):
+            if i > 0:
+                # Keep short pauses as they are, but cap long ones
+                pause = start - segments[i - 1][1]
+                pieces.append(audio[segments[i - 1][1]:start] if pause <= self.max_pause_samples else gap)
+            pieces.append(audio[start:end])
+        return np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+
+    def record(self, samples_in: int, samples_kept: int) -> None:
+        """
+        Count one input in the stats once the caller has decided what to keep
+
+        `samples_kept` is 0 for a recording skipped as silent, and `samples_in`
+        when it was passed on untrimmed.
+        """
+        with self._lock:
+            self.inputs += 1
+            self.silent_inputs += int(samples_kept == 0)
+            self.seconds_in += samples_in / self.sample_rate
+            self.seconds_removed += (samples_in - samples_kept) / self.sample_rate
+
+    def stats(self) -> Dict[str, float]:
+        """Return how much audio was trimmed and how many inputs were all silence"""
+        with self._lock:
+            return {
+                "inputs": self.inputs,
+                "silent_inputs": self.silent_inputs,
+                "seconds_in": self.seconds_in,
+                "seconds_removed": self.seconds_removed,
+            }
@@ -5,32 +5,134 @@ A lightweight application that allows users to talk to an AI agent and hear resp
 Uses OpenAI Whisper for speech-to-text, LangChain + Gemini for LLM, and gTTS for text-to-speech.
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import copy
+import hashlib
+import importlib
+import io
+import json
 import os
 import sys
 import tempfile
 import threading
-import time
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Tuple, Union
 from pathlib import Path
 
-import pyaudio
+import numpy as np
 import wave
-import whisper
-from gtts import gTTS
-import pygame
 from dotenv import load_dotenv
 
-# LangChain imports
-from langchain_community.llms import GooglePalm
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.schema import HumanMessage, SystemMessage
-from langchain.memory import ConversationBufferMemory
-from langchain.agents import initialize_agent, AgentType
-from langchain.tools import Tool
+# Heavy dependencies (pyaudio, whisper/torch, pygame, gTTS, LangChain, google.generativeai)
+# are imported on first use through _lazy_import so that text-only chat and UI startup
+# don't pay for them
+from audio_buffer import AudioRingBuffer
+from audio_io import WHISPER_SAMPLE_RATE, load_audio_file, prepare_for_whisper, resample_poly
+from streaming_asr import EnergyEndpointer, StreamingTranscriber
+from speech_pipeline import SentenceSplitter, SpeechPipeline
+from disk_cache import DiskLRUCache
+from conversation_memory import RollingConversationMemory
+from vad import VoiceActivityDetector
+from asr_server import ASRClient
+from duplex import DuplexConversation
+from speculative_llm import SpeculationStats, SpeculativeResponder
+from response_cache import SIMILARITY_THRESHOLDS, ResponseCache, ngram_embedding
 
 # Load environment variables
 load_dotenv()
 
+ERROR_RESPONSE = "Sorry, I encountered an error while processing your request."
+
+# Free tier models, in order of preference; "stub" is an offline echo backend
+DEFAULT_LLM_MODELS = ["models/gemini-flash-latest", "models/gemini-pro-latest", "models/gemini-2.0-flash"]
+
+# Audio accepted by the transcription methods: a file path, encoded file bytes,
+# a (sample_rate, samples) tuple, or 16 kHz mono float32 samples
+AudioInput = Union[str, bytes, np.ndarray, Tuple[int, np.ndarray]]
+
+# Seconds spent importing and constructing each subsystem, in load order
+STARTUP_TIMINGS: Dict[str, float] = {}
+
+
+@contextmanager
+def _timed(label: str):
+    """Record how long a block takes in STARTUP_TIMINGS"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS[label] = time.perf_counter() - started
+
+
+def _lazy_import(module_name: str):
+    """Import a module on first use, recording how long the import took"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with _timed(f"import {module_name}"):
+        return importlib.import_module(module_name)
+
+
+def format_startup_report() -> str:
+    """Format STARTUP_TIMINGS as a startup-time breakdown"""
+    lines = ["⏱️ Startup time breakdown:"]
+    for label, seconds in STARTUP_TIMINGS.items():
+        lines.append(f"   {label:<45} {seconds * 1000:9.1f} ms")
+    lines.append(f"   {'total':<45} {sum(STARTUP_TIMINGS.values()) * 1000:9.1f} ms")
+    return "\n".join(lines)
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean flag from the environment"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def llm_models_from_env() -> List[str]:
+    """GEMINI_MODEL followed by LLM_FALLBACK_MODELS, without duplicates"""
+    primary = os.getenv("GEMINI_MODEL", DEFAULT_LLM_MODELS[0])
+    fallbacks = os.getenv("LLM_FALLBACK_MODELS", ",".join(DEFAULT_LLM_MODELS[1:])).split(",")
+    models = []
+    for model in [primary] + fallbacks:
+        model = model.strip()
+        if model and model not in models:
+            models.append(model)
+    return models
+
+
+class _SharedResources:
+    """Lazily constructed subsystems shared by a VoiceAI and its per-session views"""
+    
+    def __init__(self):
+        self.asr_engine = None
+        self.asr_model = None
+        self.asr_warm_up = None
+        self.llm = None
+        self.mixer_ready = False
+        self.asr_executor = None
+        self.gtts_client = None
+        self.tts_client = None
+        self.player = None
+        self.llm_executor = None
+        self.embeddings = None
+        # One lock per resource, so a slow build (e.g. loading Whisper during the
+        # background warm-up) never blocks construction of an unrelated resource
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+    
+    def lock(self, resource: str):
+        """The lock guarding construction of one resource"""
+        with self._locks_guard:
+            return self._locks.setdefault(resource, threading.RLock())
+
+
 class VoiceAI:
     """Main Voice AI application class"""
     
@@ -38,89 +140,467 @@ class VoiceAI:
                  gemini_api_key: Optional[str] = None,
                  tts_language: str = "en",
                  whisper_model: str = "base",
+                 asr_backend: str = "whisper",
+                 whisper_quantize: bool = False,
+                 target_rtf: float = 0.5,
+                 decode_profile: str = "default",
                  sample_rate: int = 16000,
                  chunk_size: int = 1024,
-                 channels: int = 1):
+                 channels: int = 1,
+                 in_memory_recording: bool = False,
+                 max_record_seconds: float = 120.0,
+                 speech_threshold: Optional[float] = None,
+                 end_of_speech_seconds: float = 0.8,
+                 no_speech_timeout_seconds: float = 8.0,
+                 pipelined_tts: bool = False,
+                 speculative_llm: bool = False,
+                 batch_window_ms: float = 0.0,
+                 max_batch_size: int = 8,
+                 tts_cache_dir: Optional[str] = None,
+                 tts_cache_max_mb: float = 100.0,
+                 tts_connections: int = 8,
+                 asr_cache_dir: Optional[str] = None,
+                 asr_cache_max_mb: float = 20.0,
+                 memory_token_budget: Optional[int] = None,
+                 memory_keep_turns: int = 4,
+                 asr_workers: int = 1,
+                 vad_trim: bool = True,
+                 vad_energy_threshold: Optional[float] = None,
+                 longform_workers: int = 0,
+                 longform_min_seconds: float = 60.0,
+                 asr_server_socket: Optional[str] = None,
+                 llm_models: Optional[List[str]] = None,
+                 llm_hedging: bool = True,
+                 response_cache_size: int = 0,
+                 response_cache_ttl_seconds: float = 3600.0,
+                 response_cache_embeddings: Optional[str] = None,
+                 response_cache_threshold: Optional[float] = None,
+                 headless: bool = False):
         """
         Initialize the Voice AI application
         
         Args:
             gemini_api_key: Google Gemini API key
             tts_language: Language code for text-to-speech (e.g., 'en', 'fr', 'es')
-            whisper_model: Whisper model size ('tiny', 'base', 'small', 'medium', 'large')
+            whisper_model: Whisper model size ('tiny', 'base', 'small', 'medium', 'large'),
+                or 'auto' for the largest size that meets `target_rtf` on this machine
+            asr_backend: Speech recognition engine running the model ('whisper' for
+                the reference implementation, 'faster-whisper' for CTranslate2)
+            whisper_quantize: Run the model's linear layers in int8 (CPU only)
+            target_rtf: Real-time factor (processing time / audio length) that
+                'auto' model selection must meet
+            decode_profile: 'default' for Whisper's own settings, or 'fast' for a
+                language hint from `tts_language`, greedy decoding with bounded
+                temperature fallback and torch threads split between ASR workers
             sample_rate: Audio sample rate for recording
             chunk_size: Audio chunk size for recording
             channels: Number of audio channels
+            in_memory_recording: Record into a preallocated ring buffer and pass the
+                samples straight to Whisper instead of writing a temporary WAV file
+            max_record_seconds: Capacity of the ring buffer; only the most recent
+                audio is kept when a recording runs longer
+            speech_threshold: RMS level treated as speech when streaming; by default
+                it follows the microphone's noise floor
+            end_of_speech_seconds: Trailing silence that ends a streamed utterance
+            no_speech_timeout_seconds: A streamed recording in which no speech has
+                started by then is stopped
+            pipelined_tts: Stream the LLM reply and speak it sentence by sentence
+                while the rest is still being generated
+            speculative_llm: When streaming, start the LLM request as soon as the
+                partial transcript stops changing, and reuse the reply if the final
+                transcript matches (speculated replies are spoken whole, not pipelined)
+            batch_window_ms: When positive, concurrent transcribe_audio calls arriving
+                within this window are decoded together as one batch
+            max_batch_size: Largest number of requests decoded in one batch
+            tts_cache_dir: Directory for cached speech keyed by (text, language);
+                caching is disabled when None
+            tts_cache_max_mb: Size limit of the speech cache before LRU eviction
+            tts_connections: Long replies are split by gTTS into ~100 character
+                parts; up to this many are fetched concurrently over pooled connections
+            asr_cache_dir: Directory for cached transcripts keyed by the decoded audio,
+                model and decode options; caching is disabled when None
+            asr_cache_max_mb: Size limit of the transcript cache before LRU eviction
+            memory_token_budget: When set, keep conversation history within this many
+                tokens by folding older turns into a running summary
+            memory_keep_turns: Most recent turns kept verbatim in budgeted memory
+            asr_workers: Threads available to the async API for CPU-bound Whisper calls
+            vad_trim: Cut silence out of recordings before transcription and skip
+                Whisper entirely for recordings with no speech
+            vad_energy_threshold: Minimum RMS level the trimmer treats as speech; by
+                default it adapts to each recording's noise floor
+            longform_workers: When positive, recordings longer than
+                `longform_min_seconds` are split at pauses into ~30 second chunks
+                that this many worker processes transcribe in parallel
+            longform_min_seconds: Shortest recording sent through long-form mode
+            asr_server_socket: Unix socket of a running asr_server.py; when set,
+                transcription is done by that process and no model is loaded here
+            llm_models: Gemini models in order of preference; requests fail over down
+                the chain, and "stub" adds an offline echo backend
+            llm_hedging: When a model runs past its p95 latency, also ask the next
+                model and use whichever reply arrives first
+            response_cache_size: Replies kept in memory and reused when the same
+                message arrives in the same conversation state (0 disables)
+            response_cache_ttl_seconds: Age after which a cached reply is not reused
+            response_cache_embeddings: Also reuse replies to similar messages, compared
+                with 'ngram' (offline hashed n-grams) or 'gemini' embeddings
+            response_cache_threshold: Cosine similarity a similar message must reach
+                (defaults to the embedding's entry in SIMILARITY_THRESHOLDS)
+            headless: Never play audio on this machine; the processing methods return
+                the synthesized reply as MP3 bytes instead (for serving remote clients)
         """
         self.tts_language = tts_language
+        self.headless = headless
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
         self.channels = channels
         self.is_recording = False
         self.audio_frames = []
+        self.in_memory_recording = in_memory_recording
+        self.max_record_seconds = max_record_seconds
+        self.audio_buffer = None
+        if in_memory_recording:
+            self.audio_buffer = AudioRingBuffer(max_record_seconds, sample_rate, channels)
+        
+        # Streaming recognition state
+        self.endpointer = EnergyEndpointer(
+            sample_rate,
+            threshold=speech_threshold,
+            silence_seconds=end_of_speech_seconds
+        )
+        self.end_of_speech = threading.Event()
+        self.speech_heard = threading.Event()
+        self.no_speech_timeout_seconds = no_speech_timeout_seconds
+        self.streaming_transcriber = None
+        self.pipelined_tts = pipelined_tts
+        self.speculative_llm = speculative_llm
+        self.speculation_stats = SpeculationStats()
+        
+        # Silence trimming in front of Whisper
+        self.vad = None
+        if vad_trim:
+            self.vad = VoiceActivityDetector(energy_threshold=vad_energy_threshold)
+        
+        # Parallel chunked transcription for long uploads
+        self.longform_workers = longform_workers
+        self.longform_min_seconds = longform_min_seconds
+        self.speech_threshold = speech_threshold
+        self.vad_energy_threshold = vad_energy_threshold
+        
+        # Optional on-disk cache of synthesized speech
+        self.tts_cache = None
+        if tts_cache_dir:
+            self.tts_cache = DiskLRUCache(tts_cache_dir, int(tts_cache_max_mb * 1024 * 1024), suffix=".mp3")
+        
+        self.tts_connections = tts_connections
         
-        # Initialize pygame for audio playback
-        pygame.mixer.init()
+        # Optional on-disk cache of transcripts
+        self.asr_cache = None
+        if asr_cache_dir:
+            self.asr_cache = DiskLRUCache(asr_cache_dir, int(asr_cache_max_mb * 1024 * 1024), suffix=".txt")
         
-        # Initialize Whisper
-        print(f"Loading Whisper model: {whisper_model}")
-        self.whisper_model = whisper.load_model(whisper_model)
+        # Optional in-memory cache of LLM replies
+        self.response_cache = None
+        if response_cache_size > 0:
+            embed = None
+            if response_cache_embeddings == "ngram":
+                embed = ngram_embedding
+            elif response_cache_embeddings == "gemini":
+                embed = self._embed_with_gemini
+            elif response_cache_embeddings:
+                raise ValueError(f"Unknown response cache embeddings '{response_cache_embeddings}'; "
+                                 f"choose 'ngram' or 'gemini'")
+            if response_cache_threshold is None:
+                response_cache_threshold = SIMILARITY_THRESHOLDS.get(response_cache_embeddings, 0.92)
+            self.response_cache = ResponseCache(
+                max_entries=response_cache_size,
+                ttl_seconds=response_cache_ttl_seconds,
+                embed=embed,
+                similarity_threshold=response_cache_threshold
+            )
+        
+        # Subsystems below are constructed on first use
+        self.whisper_model_name = whisper_model
+        self.asr_backend = asr_backend
+        self.whisper_quantize = whisper_quantize
+        self.target_rtf = target_rtf
+        self.decode_profile = decode_profile
+        self._shared = _SharedResources()
+        self._memory = None
+        self.memory_token_budget = memory_token_budget
+        self.memory_keep_turns = memory_keep_turns
+        self.asr_workers = asr_workers
+        
+        # Optional shared inference server that owns the Whisper model
+        self.asr_client = ASRClient(asr_server_socket) if asr_server_socket else None
+        
+        # Optional micro-batching scheduler in front of Whisper
+        self.asr_batcher = None
+        if batch_window_ms > 0 and self.asr_client is None:
+            batch_asr = _lazy_import("batch_asr")
+            self.asr_batcher = batch_asr.MicroBatcher(
+                self._transcribe_requests,
+                window_ms=batch_window_ms,
+                max_batch_size=max_batch_size
+            )
         
         # Initialize LangChain with Gemini
+        self.llm_models = list(llm_models or DEFAULT_LLM_MODELS)
+        self.llm_hedging = llm_hedging
         self._setup_llm(gemini_api_key)
         
         print("Voice AI initialized successfully!")
     
-    def _setup_llm(self, api_key: Optional[str] = None):
-        """Setup LangChain with Google Gemini"""
-        api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in environment variables")
+    @property
+    def asr_engine(self):
+        """Speech recognition backend with the Whisper model, loaded on first use"""
+        engine = self._load_asr_engine()
         
-        # Initialize Gemini LLM (Free tier compatible)
+        # Requests arriving during the warm-up pass wait for it rather than share the model with it
+        warm_up = self._shared.asr_warm_up
+        if warm_up is not None and warm_up is not threading.current_thread():
+            warm_up.join()
+        return engine
+    
+    def _load_asr_engine(self):
+        """Load the speech recognition backend if needed, without waiting for its warm-up pass"""
+        shared = self._shared
+        if shared.asr_engine is None:
+            with shared.lock("asr_engine"):
+                if shared.asr_engine is None:
+                    asr_backends = _lazy_import("asr_backends")
+                    model_name = self.whisper_model_name
+                    if model_name == "auto":
+                        with _timed("select whisper model size"):
+                            model_name = _lazy_import("asr_calibration").select_model_size(
+                                self.target_rtf, self.asr_backend, self.whisper_quantize
+                            )
+                    precision = ", int8" if self.whisper_quantize else ""
+                    # Split the cores between concurrent ASR workers instead of oversubscribing
+                    threads = 0
+                    if self.decode_profile == "fast":
+                        threads = max(1, (os.cpu_count() or 1) // max(1, self.asr_workers))
+                    print(f"Loading Whisper model: {model_name} ({self.asr_backend}{precision})")
+                    with _timed(f"load whisper model ({self.asr_backend}:{model_name})"):
+                        shared.asr_engine = asr_backends.load_backend(
+                            self.asr_backend, model_name, quantize=self.whisper_quantize, threads=threads
+                        )
+        return shared.asr_engine
+    
+    def _asr_model_identity(self) -> str:
+        """Backend and model that actually decode, e.g. 'whisper:small (int8)'; resolved once"""
+        shared = self._shared
+        if shared.asr_model is None:
+            with shared.lock("asr_model"):
+                if shared.asr_model is None:
+                    # 'auto' and the precision are only settled once a model is loaded,
+                    # and the ASR server may run a different model than configured here
+                    if self.asr_client is not None:
+                        shared.asr_model = self.asr_client.model()
+                    else:
+                        shared.asr_model = repr(self._load_asr_engine())
+        return shared.asr_model
+    
+    @property
+    def llm(self):
+        """Gemini client, constructed on first use"""
+        shared = self._shared
+        if shared.llm is None:
+            with shared.lock("llm"):
+                if shared.llm is None:
+                    shared.llm = self._create_llm()
+        return shared.llm
+    
+    @property
+    def memory(self):
+        """Conversation memory, constructed on first use"""
+        if self._memory is None:
+            with self._shared.lock("memory"):
+                if self._memory is None and self.memory_token_budget:
+                    self._memory = RollingConversationMemory(
+                        max_tokens=self.memory_token_budget,
+                        keep_turns=self.memory_keep_turns,
+                        summarize_fn=self._summarize_history
+                    )
+                elif self._memory is None:
+                    memory_module = _lazy_import("langchain.memory")
+                    self._memory = memory_module.ConversationBufferMemory(
+                        memory_key="chat_history",
+                        return_messages=True
+                    )
+        return self._memory
+    
+    def _ensure_mixer(self):
+        """Initialize the pygame mixer on first playback and return pygame"""
+        pygame = _lazy_import("pygame")
+        shared = self._shared
+        if not shared.mixer_ready:
+            with shared.lock("mixer"):
+                if not shared.mixer_ready:
+                    with _timed("init pygame mixer"):
+                        pygame.mixer.init()
+                    shared.mixer_ready = True
+        return pygame
+    
+    @property
+    def player(self):
+        """In-memory PyAudio playback engine, created on first playback"""
+        shared = self._shared
+        if shared.player is None:
+            with shared.lock("player"):
+                if shared.player is None:
+                    with _timed("init audio output"):
+                        shared.player = _lazy_import("playback").PlaybackEngine()
+        return shared.player
+    
+    @property
+    def asr_executor(self) -> ThreadPoolExecutor:
+        """Bounded executor that runs Whisper for the async API"""
+        shared = self._shared
+        if shared.asr_executor is None:
+            with shared.lock("asr_executor"):
+                if shared.asr_executor is None:
+                    shared.asr_executor = ThreadPoolExecutor(
+                        max_workers=self.asr_workers,
+                        thread_name_prefix="whisper"
+                    )
+        return shared.asr_executor
+    
+    @property
+    def llm_executor(self) -> ThreadPoolExecutor:
+        """Executor for LLM requests started ahead of the final transcript"""
+        shared = self._shared
+        if shared.llm_executor is None:
+            with shared.lock("llm_executor"):
+                if shared.llm_executor is None:
+                    shared.llm_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm")
+        return shared.llm_executor
+    
+    @property
+    def gtts_client(self):
+        """Connection-pooled async gTTS client, created on first use"""
+        shared = self._shared
+        if shared.gtts_client is None:
+            with shared.lock("gtts_client"):
+                if shared.gtts_client is None:
+                    shared.gtts_client = _lazy_import("gtts_client").AsyncGTTSClient(self.tts_connections)
+        return shared.gtts_client
+    
+    @property
+    def tts_client(self):
+        """Connection-pooled blocking gTTS client, created on first use"""
+        shared = self._shared
+        if shared.tts_client is None:
+            with shared.lock("tts_client"):
+                if shared.tts_client is None:
+                    shared.tts_client = _lazy_import("gtts_client").GTTSClient(self.tts_connections)
+        return shared.tts_client
+    
+    def for_session(self, tts_language: Optional[str] = None) -> "VoiceAI":
+        """
+        Return a lightweight per-session view of this VoiceAI
+        
+        The view shares the Whisper model, Gemini client, caches and batching
+        scheduler, but has its own conversation memory and TTS language.
+        """
+        session = copy.copy(self)
+        session._memory = None
+        session.tts_language = tts_language or self.tts_language
+        
+        # Sessions never record from the server microphone, so they get no ring buffer
+        session.is_recording = False
+        session.audio_frames = []
+        session.in_memory_recording = False
+        session.audio_buffer = None
+        session.endpointer = copy.copy(self.endpointer)
+        session.end_of_speech = threading.Event()
+        session.speech_heard = threading.Event()
+        session.streaming_transcriber = None
+        return session
+    
+    def conversation_size(self) -> int:
+        """Approximate bytes held by this instance's conversation state"""
+        if self._memory is None:
+            return 0
+        size = len(getattr(self._memory, "summary", ""))
+        for msg in self._memory.chat_memory.messages:
+            size += len(msg.content)
+        return size
+    
+    def warm_up(self) -> None:
+        """Load every lazily constructed subsystem now (used for the startup report)"""
+        self.warm_up_asr()
+        self.llm
+        self.memory
+        self.player
+        self.tts_client
+        _lazy_import("pyaudio")
+    
+    def warm_up_asr(self) -> None:
+        """Load the model and decode a short synthetic clip so the first request skips cold-start costs"""
+        if self.asr_client is not None:
+            return
         try:
-            # Try the latest free tier model first
-            self.llm = ChatGoogleGenerativeAI(
-                model="models/gemini-flash-latest",
-                google_api_key=api_key,
-                temperature=0.7
-            )
+            engine = self.asr_engine
+            clip = _lazy_import("asr_calibration").calibration_clip(2.0)
+            with _timed("whisper warm-up pass"):
+                engine.transcribe(clip, **self._decode_options())
+            print("✅ Whisper warmed up")
         except Exception as e:
-            print(f"Warning: ChatGoogleGenerativeAI with gemini-flash-latest failed, trying gemini-pro-latest: {e}")
-            try:
-                self.llm = ChatGoogleGenerativeAI(
-                    model="models/gemini-pro-latest",
-                    google_api_key=api_key,
-                    temperature=0.7
-                )
-            except Exception as e2:
-                print(f"Warning: ChatGoogleGenerativeAI failed, trying gemini-2.0-flash: {e2}")
-                try:
-                    self.llm = ChatGoogleGenerativeAI(
-                        model="models/gemini-2.0-flash",
-                        google_api_key=api_key,
-                        temperature=0.7
-                    )
-                except Exception as e3:
-                    print(f"Warning: ChatGoogleGenerativeAI failed, trying direct API: {e3}")
-                    # Fallback to direct Google Generative AI
-                    import google.generativeai as genai
-                    genai.configure(api_key=api_key)
-                    self.llm = genai.GenerativeModel('models/gemini-flash-latest')
-        
-        # Setup conversation memory
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
+            print(f"❌ Error warming up Whisper: {e}")
+    
+    def start_asr_warm_up(self) -> None:
+        """Warm up Whisper on a background thread so startup isn't delayed"""
+        shared = self._shared
+        with shared.lock("asr_warm_up"):
+            if shared.asr_warm_up is None:
+                shared.asr_warm_up = threading.Thread(target=self.warm_up_asr, daemon=True)
+                shared.asr_warm_up.start()
+    
+    def _setup_llm(self, api_key: Optional[str] = None):
+        """Validate the Gemini configuration; the client itself is created on first use"""
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        offline = all(model == "stub" for model in self.llm_models)
+        if not api_key and not offline:
+            raise ValueError("GEMINI_API_KEY not found in environment variables")
+        self.gemini_api_key = api_key
         
         # Define system prompt
         self.system_prompt = """You are a helpful AI assistant. 
         Keep your responses concise and conversational, as they will be converted to speech.
         Aim for responses that are 1-2 sentences long for better user experience.
         Be friendly, helpful, and engaging in your responses."""
+    
+    def _create_llm(self):
+        """Create a router over the Gemini model chain; models that fail to initialize are skipped"""
+        llm_router = _lazy_import("llm_router")
+        routes = []
+        with _timed("create gemini client"):
+            for model in self.llm_models:
+                if model == llm_router.STUB_MODEL:
+                    routes.append(llm_router.ModelRoute(model, llm_router.StubLLM()))
+                    continue
+                try:
+                    ChatGoogleGenerativeAI = _lazy_import("langchain_google_genai").ChatGoogleGenerativeAI
+                    # Initialize Gemini LLM (Free tier compatible)
+                    client = ChatGoogleGenerativeAI(
+                        model=model,
+                        google_api_key=self.gemini_api_key,
+                        temperature=0.7
+                    )
+                    routes.append(llm_router.ModelRoute(model, client))
+                except Exception as e:
+                    print(f"Warning: ChatGoogleGenerativeAI with {model} failed: {e}")
+            
+            if not routes:
+                print("Warning: ChatGoogleGenerativeAI failed, trying direct API")
+                # Fallback to direct Google Generative AI
+                genai = _lazy_import("google.generativeai")
+                genai.configure(api_key=self.gemini_api_key)
+                model = self.llm_models[0]
+                routes.append(llm_router.ModelRoute(f"{model} (direct)", genai.GenerativeModel(model)))
         
-        print("LangChain with Gemini initialized successfully!")
+        print(f"LLM router initialized: {' -> '.join(route.name for route in routes)}")
+        return llm_router.LLMRouter(routes, hedge=self.llm_hedging)
     
     def start_recording(self) -> None:
         """Start recording audio from microphone"""
@@ -130,8 +610,11 @@ class VoiceAI:
         
         self.is_recording = True
         self.audio_frames = []
+        if self.in_memory_recording:
+            self.audio_buffer.clear()
         
         # Initialize PyAudio
+        pyaudio = _lazy_import("pyaudio")
         self.audio = pyaudio.PyAudio()
         
         # Open audio stream
@@ -149,8 +632,8 @@ class VoiceAI:
         
         print("🎤 Recording started... (Press Enter to stop)")
     
-    def stop_recording(self) -> Optional[str]:
-        """Stop recording and return the audio file path"""
+    def stop_recording(self) -> Optional[Union[str, np.ndarray]]:
+        """Stop recording and return the audio file path (or samples when recording in memory)"""
         if not self.is_recording:
             print("Not currently recording!")
             return None
@@ -169,6 +652,9 @@ class VoiceAI:
         if hasattr(self, 'audio'):
             self.audio.terminate()
         
+        if self.in_memory_recording:
+            return self._get_recorded_samples()
+        
         # Save audio to temporary file
         if self.audio_frames:
             audio_file = self._save_audio_to_file()
@@ -178,18 +664,130 @@ class VoiceAI:
             print("No audio recorded!")
             return None
     
+    def start_streaming(self, on_partial=None) -> None:
+        """Start callback-driven recording with live partial transcripts and end-of-speech detection"""
+        if self.is_recording:
+            print("Already recording!")
+            return
+        
+        if self.audio_buffer is None:
+            self.audio_buffer = AudioRingBuffer(self.max_record_seconds, self.sample_rate, self.channels)
+        self.audio_buffer.clear()
+        self.endpointer.reset()
+        self.end_of_speech.clear()
+        self.speech_heard.clear()
+        self.is_recording = True
+        
+        self.streaming_transcriber = StreamingTranscriber(
+            self._run_whisper,
+            self.audio_buffer,
+            on_partial=on_partial or self._print_partial
+        )
+        self.streaming_transcriber.start()
+        
+        # PyAudio calls back from its own thread, so no recording thread is needed
+        pyaudio = _lazy_import("pyaudio")
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=self.channels,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk_size,
+            stream_callback=self._stream_callback
+        )
+        self.stream.start_stream()
+        
+        print("🎤 Listening... (stops automatically when you finish speaking)")
+    
+    def _stream_callback(self, in_data, frame_count, time_info, status):
+        """PyAudio input callback: buffer the frame and update the endpointer"""
+        samples = self.audio_buffer.write_pcm16(in_data)
+        if self.endpointer.process(samples):
+            self.end_of_speech.set()
+        if self.endpointer.speech_started:
+            self.speech_heard.set()
+        return (None, sys.modules["pyaudio"].paContinue)
+    
+    def _print_partial(self, text: str) -> None:
+        """Default partial transcript handler"""
+        print(f"📝 ... {text}")
+    
+    def wait_for_end_of_speech(self, timeout: Optional[float] = None) -> bool:
+        """Block until the endpointer detects the end of the utterance, or no speech starts in time"""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.max_record_seconds)
+        if not self.speech_heard.wait(min(self.no_speech_timeout_seconds, deadline - time.monotonic())):
+            print("🔇 No speech heard, stopping")
+            return False
+        return self.end_of_speech.wait(max(deadline - time.monotonic(), 0.0))
+    
+    def stop_streaming(self) -> str:
+        """Stop streaming capture and return the final transcript"""
+        if not self.is_recording or self.streaming_transcriber is None:
+            print("Not currently streaming!")
+            return ""
+        
+        self.is_recording = False
+        self.stream.stop_stream()
+        self.stream.close()
+        self.audio.terminate()
+        
+        # Most of the utterance is already committed; only the tail is decoded here
+        try:
+            transcribed_text = self.streaming_transcriber.finish()
+        except Exception as e:
+            print(f"❌ Error transcribing audio: {e}")
+            transcribed_text = ""
+        finally:
+            self.streaming_transcriber = None
+        
+        print("🎤 Recording stopped!")
+        print(f"📝 Transcription: {transcribed_text}")
+        return transcribed_text
+    
+    def listen(self, speculation: Optional[SpeculativeResponder] = None) -> str:
+        """Record one utterance with streaming recognition and return its transcript"""
+        self.start_streaming(on_partial=self.partial_handler(speculation))
+        self.wait_for_end_of_speech()
+        return self.stop_streaming()
+    
+    def start_speculation(self) -> Optional[SpeculativeResponder]:
+        """Begin speculating on the next utterance, or None when speculative_llm is off"""
+        if not self.speculative_llm:
+            return None
+        return SpeculativeResponder(
+            self._generate_response,
+            self.llm_executor,
+            self.speculation_stats,
+            context=self._conversation_state
+        )
+    
+    def partial_handler(self, speculation: Optional[SpeculativeResponder] = None):
+        """Partial transcript callback that also feeds the speculation, if any"""
+        if speculation is None:
+            return self._print_partial
+        
+        def on_partial(text: str) -> None:
+            self._print_partial(text)
+            speculation.on_partial(text)
+        return on_partial
+    
     def _record_audio(self) -> None:
         """Internal method to record audio in a separate thread"""
         while self.is_recording:
             try:
                 data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-                self.audio_frames.append(data)
+                if self.in_memory_recording:
+                    self.audio_buffer.write_pcm16(data)
+                else:
+                    self.audio_frames.append(data)
             except Exception as e:
                 print(f"Error recording audio: {e}")
                 break
     
     def _save_audio_to_file(self) -> str:
         """Save recorded audio frames to a temporary WAV file"""
+        pyaudio = _lazy_import("pyaudio")
         temp_file = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
         
         with wave.open(temp_file.name, 'wb') as wf:
@@ -200,152 +798,739 @@ class VoiceAI:
         
         return temp_file.name
     
-    def transcribe_audio(self, audio_file_path: str) -> str:
-        """Transcribe audio file to text using Whisper"""
+    def _get_recorded_samples(self) -> Optional[np.ndarray]:
+        """Return the ring buffer contents as 16 kHz mono float32 samples"""
+        if len(self.audio_buffer) == 0:
+            print("No audio recorded!")
+            return None
+        
+        if self.audio_buffer.overflowed:
+            print(f"⚠️ Recording exceeded buffer; keeping the last {self.audio_buffer.duration:.1f}s")
+        
+        samples = resample_poly(self.audio_buffer.read(), self.sample_rate, WHISPER_SAMPLE_RATE)
+        print("🎤 Recording stopped!")
+        return samples
+    
+    def prepare_audio(self, audio: AudioInput) -> Union[str, np.ndarray]:
+        """
+        Decode, downmix and resample audio to 16 kHz mono float32 in memory
+        
+        Accepts a file path, encoded file bytes, a (sample_rate, samples) tuple as
+        produced by Gradio, or samples already at 16 kHz. Paths in formats that can't
+        be decoded in-process are returned unchanged for Whisper's ffmpeg loader.
+        """
+        if isinstance(audio, str):
+            samples = load_audio_file(audio)
+            return samples if samples is not None else audio
+        return prepare_for_whisper(audio)
+    
+    def _decode_options(self) -> Dict[str, Any]:
+        """Whisper transcribe options for the configured decode profile and this session's language"""
+        return _lazy_import("asr_backends").decode_options(self.decode_profile, self.tts_language)
+    
+    def _run_whisper(self, audio: AudioInput, **options) -> Dict[str, Any]:
+        """Run Whisper on any supported audio input, locally or on the ASR server"""
+        options = {**self._decode_options(), **options}
+        # Whisper decodes paths through ffmpeg but takes arrays as-is
+        audio = self.prepare_audio(audio)
+        if self.asr_client is not None:
+            if isinstance(audio, str):
+                audio = _lazy_import("whisper").load_audio(audio)
+            return self.asr_client.transcribe(audio, **options)
+        return self.asr_engine.transcribe(audio, **options)
+    
+    def _prepare_for_asr(self, audio: AudioInput) -> Union[str, np.ndarray, None]:
+        """Decode audio and trim its silence; None means there is no speech to transcribe"""
+        prepared = self.prepare_audio(audio)
+        if self.vad is None and not self.longform_workers and self.asr_cache is None:
+            return prepared
+        if isinstance(prepared, str):
+            # Formats only ffmpeg can read still get trimmed
+            prepared = _lazy_import("whisper").load_audio(prepared)
+        
+        # Long-form chunking skips the silence itself and keeps the original timeline
+        if self.vad is None or self._use_longform(prepared):
+            return prepared
+        
+        trimmed = self.vad.trim(prepared)
+        if len(trimmed) == 0 and not self.vad.is_silent(prepared):
+            # Better to decode some silence than to drop quiet speech the detector missed
+            print("⚠️ No speech detected above the VAD threshold, transcribing the whole recording")
+            trimmed = prepared
+        self.vad.record(len(prepared), len(trimmed))
+        if len(trimmed) == 0:
+            print("🔇 No speech detected, skipping transcription")
+            return None
+        saved = (len(prepared) - len(trimmed)) / WHISPER_SAMPLE_RATE
+        if saved > 0:
+            print(f"✂️ Trimmed {saved:.1f}s of silence")
+        return trimmed
+    
+    def _use_longform(self, audio: Union[str, np.ndarray]) -> bool:
+        """Whether prepared audio is long enough for parallel chunked transcription"""
+        return (
+            self.longform_workers > 0
+            and self.asr_client is None
+            and isinstance(audio, np.ndarray)
+            and len(audio) > self.longform_min_seconds * WHISPER_SAMPLE_RATE
+        )
+    
+    def transcribe_long_audio(self, audio: AudioInput) -> Dict[str, Any]:
+        """
+        Transcribe a long recording in ~30 second chunks across worker processes
+        
+        Returns Whisper's result dict (text and segments) with segment timestamps
+        relative to the start of the full recording.
+        """
+        samples = self.prepare_audio(audio)
+        if isinstance(samples, str):
+            samples = _lazy_import("whisper").load_audio(samples)
+        
+        longform_asr = _lazy_import("longform_asr")
+        vad = self.vad or VoiceActivityDetector(energy_threshold=self.vad_energy_threshold)
+        duration = len(samples) / WHISPER_SAMPLE_RATE
+        started = time.perf_counter()
+        result = longform_asr.transcribe_long(
+            self.asr_engine, samples, workers=self.longform_workers or None, vad=vad,
+            **self._decode_options()
+        )
+        print(f"⏱️ Transcribed {duration:.0f}s of audio in {time.perf_counter() - started:.1f}s "
+              f"({len(result['segments'])} segments)")
+        return result
+    
+    def _cached_transcript(self, samples: Union[str, np.ndarray]) -> Tuple[Optional[str], Optional[str]]:
+        """Return (cache key, cached transcript or None); the key is None when caching is off"""
+        if self.asr_cache is None or not isinstance(samples, np.ndarray):
+            return None, None
+        # Key on the model that actually decodes, not the requested one
+        cache_key = DiskLRUCache.make_key(
+            hashlib.sha256(np.ascontiguousarray(samples, dtype=np.float32).tobytes()).hexdigest(),
+            self._asr_model_identity(),
+            json.dumps(self._decode_options(), sort_keys=True)
+        )
+        cached = self.asr_cache.get_bytes(cache_key)
+        return cache_key, cached.decode("utf-8") if cached is not None else None
+    
+    def _store_transcript(self, cache_key: Optional[str], transcript: str) -> None:
+        """Save a transcript in the cache"""
+        if cache_key is not None and transcript:
+            try:
+                self.asr_cache.put(cache_key, transcript.encode("utf-8"))
+            except OSError as e:
+                print(f"⚠️ Could not cache transcript: {e}")
+    
+    def transcribe_audio(self, audio: AudioInput) -> str:
+        """Transcribe an audio file, bytes or samples to text using Whisper"""
         print("🔄 Transcribing audio...")
         try:
-            result = self.whisper_model.transcribe(audio_file_path)
-            transcribed_text = result["text"].strip()
+            audio = self._prepare_for_asr(audio)
+            if audio is None:
+                return ""
+            cache_key, cached = self._cached_transcript(audio)
+            if cached is not None:
+                print(f"📝 Transcription (cached): {cached}")
+                return cached
+            
+            if self._use_longform(audio):
+                transcribed_text = self.transcribe_long_audio(audio)["text"]
+            elif self.asr_batcher is not None:
+                transcribed_text = self.asr_batcher.submit((audio, self._decode_options())).result()
+            else:
+                transcribed_text = self._run_whisper(audio)["text"].strip()
             print(f"📝 Transcription: {transcribed_text}")
+            self._store_transcript(cache_key, transcribed_text)
             return transcribed_text
         except Exception as e:
             print(f"❌ Error transcribing audio: {e}")
             return ""
     
-    def get_ai_response(self, user_message: str) -> str:
-        """Get AI response using LangChain and Gemini"""
+    def _summarize_history(self, summary: str, messages: list, max_tokens: int) -> str:
+        """Fold older turns into the running conversation summary using the LLM"""
+        lines = []
+        for i, msg in enumerate(messages):
+            role = "User" if i % 2 == 0 else "Assistant"
+            lines.append(f"{role}: {msg.content}")
+        prompt = (
+            f"Update the summary of a conversation between a user and a voice assistant. "
+            f"Keep names, facts and open questions; stay under {max_tokens} tokens.\n\n"
+            f"Current summary:\n{summary or '(none)'}\n\n"
+            f"New turns:\n" + "\n".join(lines) + "\n\nUpdated summary:"
+        )
+        return self.llm.invoke(prompt).content.strip()
+    
+    def _build_messages(self, user_message: str) -> list:
+        """Build the LangChain message list: system prompt, history, new message"""
+        schema = _lazy_import("langchain.schema")
+        messages = [schema.SystemMessage(content=self.system_prompt)]
+        summary = getattr(self.memory, "summary", "")
+        if summary:
+            messages.append(schema.SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+        messages.extend(self.memory.chat_memory.messages)
+        messages.append(schema.HumanMessage(content=user_message))
+        return messages
+    
+    def _transcribe_many(self, audios: List[AudioInput],
+                         options: Optional[Dict[str, Any]] = None) -> List[Union[str, Exception]]:
+        """Transcribe several inputs, in one batched pass when the backend supports it"""
+        options = self._decode_options() if options is None else options
+        engine = self.asr_engine
+        if engine.supports_batching:
+            return _lazy_import("batch_asr").transcribe_batch(engine.model, audios, **options)
+        
+        results = []
+        for audio in audios:
+            try:
+                results.append(self._run_whisper(audio, **options)["text"].strip())
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _transcribe_requests(self, requests: List[Tuple[AudioInput, Dict[str, Any]]]) -> List[Union[str, Exception]]:
+        """Micro-batcher callback: requests with the same decode options share one pass"""
+        groups: Dict[tuple, List[int]] = {}
+        for i, (_, options) in enumerate(requests):
+            groups.setdefault(tuple(sorted(options.items())), []).append(i)
+        
+        results: List[Union[str, Exception, None]] = [None] * len(requests)
+        for indices in groups.values():
+            outputs = self._transcribe_many([requests[i][0] for i in indices], requests[indices[0]][1])
+            for i, output in zip(indices, outputs):
+                results[i] = output
+        return results
+    
+    def transcribe_batch(self, audios: List[AudioInput]) -> List[str]:
+        """Transcribe several audio files or sample arrays together; failed inputs yield empty strings"""
+        if self.asr_client is not None:
+            # The server owns the model; send the inputs one at a time
+            return [self.transcribe_audio(audio) for audio in audios]
+        
+        print(f"🔄 Transcribing {len(audios)} audio inputs...")
+        transcripts = []
+        for audio, result in zip(audios, self._transcribe_many(audios)):
+            if isinstance(result, Exception):
+                name = audio if isinstance(audio, str) else "audio samples"
+                print(f"❌ Error transcribing {name}: {result}")
+                transcripts.append("")
+            else:
+                transcripts.append(result)
+        return transcripts
+    
+    def _generate_response(self, user_message: str) -> str:
+        """Call the LLM with the conversation so far, without recording the turn"""
+        # The router flattens the messages into a plain prompt for the direct Google AI route
+        return self.llm.invoke(self._build_messages(user_message)).content.strip()
+    
+    def _embed_with_gemini(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized Gemini text embeddings for the semantic response cache"""
+        shared = self._shared
+        if shared.embeddings is None:
+            with shared.lock("embeddings"):
+                if shared.embeddings is None:
+                    GoogleGenerativeAIEmbeddings = _lazy_import("langchain_google_genai").GoogleGenerativeAIEmbeddings
+                    shared.embeddings = GoogleGenerativeAIEmbeddings(
+                        model="models/text-embedding-004",
+                        google_api_key=self.gemini_api_key
+                    )
+        vectors = np.asarray(shared.embeddings.embed_documents(texts), dtype=np.float32)
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    
+    def _conversation_hash(self) -> str:
+        """Hash of everything besides the new message that shapes a reply"""
+        digest = hashlib.sha256(self.system_prompt.encode("utf-8"))
+        digest.update(getattr(self.memory, "summary", "").encode("utf-8"))
+        for msg in self.memory.chat_memory.messages:
+            digest.update(b"\0" + msg.content.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _cached_response(self, user_message: str) -> Tuple[Optional[str], Optional[str]]:
+        """Look up a reply in the response cache; returns (conversation_hash, cached_reply)"""
+        if self.response_cache is None:
+            return None, None
+        try:
+            context = self._conversation_hash()
+            return context, self.response_cache.get(user_message, context)
+        except Exception as e:
+            # A broken cache (e.g. the embedding API is down) only costs the hit
+            print(f"Warning: Response cache lookup failed: {e}")
+            return None, None
+    
+    def _store_response(self, context: Optional[str], user_message: str, ai_response: str) -> None:
+        if context is None or not ai_response or ai_response == ERROR_RESPONSE:
+            return
+        try:
+            self.response_cache.put(user_message, context, ai_response)
+        except Exception as e:
+            print(f"Warning: Could not cache response: {e}")
+    
+    def check_llm_health(self) -> Dict[str, Any]:
+        """Check that the LLM is reachable without generating a reply or touching memory"""
+        try:
+            return self.llm.probe()
+        except Exception as e:
+            return {"ok": False, "model": None, "error": str(e)}
+    
+    async def acheck_llm_health(self) -> Dict[str, Any]:
+        """Async check_llm_health"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.check_llm_health)
+    
+    def _conversation_state(self) -> Tuple[int, str]:
+        """Changes whenever a turn is recorded, invalidating replies generated before it"""
+        return len(self.memory.chat_memory.messages), getattr(self.memory, "summary", "")
+    
+    def get_ai_response(self, user_message: str, speculation: Optional[SpeculativeResponder] = None) -> str:
+        """Get AI response using LangChain and Gemini, reusing a matching speculative reply"""
         print("🤖 Getting AI response...")
         try:
-            # Check if using LangChain or direct Google AI
-            if hasattr(self.llm, 'invoke'):
-                # LangChain interface - Include conversation history
-                chat_history = self.memory.chat_memory.messages
-                
-                # Build messages with conversation history
-                messages = [SystemMessage(content=self.system_prompt)]
-                
-                # Add conversation history
-                for msg in chat_history:
-                    messages.append(msg)
-                
-                # Add current user message
-                messages.append(HumanMessage(content=user_message))
-                
-                response = self.llm.invoke(messages)
-                ai_response = response.content.strip()
-                
-                # Update memory
-                self.memory.save_context(
-                    {"input": user_message},
-                    {"output": ai_response}
-                )
+            context, cached = self._cached_response(user_message)
+            if cached:
+                print("💬 Response from cache")
+                ai_response = cached
+                if speculation is not None:
+                    speculation.cancel()
+            elif speculation is not None:
+                ai_response = speculation.resolve(user_message)
             else:
-                # Direct Google AI interface - Include conversation history
-                chat_history = self.memory.chat_memory.messages
-                
-                # Build context with history
-                context = self.system_prompt + "\n\n"
-                for i, msg in enumerate(chat_history):
-                    if i % 2 == 0:  # User message
-                        context += f"User: {msg.content}\n"
-                    else:  # AI response
-                        context += f"Assistant: {msg.content}\n"
-                
-                context += f"User: {user_message}\nAssistant:"
-                
-                response = self.llm.generate_content(context)
-                ai_response = response.text.strip()
-                
-                # Update memory
-                self.memory.save_context(
-                    {"input": user_message},
-                    {"output": ai_response}
-                )
+                ai_response = self._generate_response(user_message)
+            if not cached:
+                self._store_response(context, user_message, ai_response)
+            
+            # Update memory
+            self.memory.save_context(
+                {"input": user_message},
+                {"output": ai_response}
+            )
             
             print(f"💬 AI Response: {ai_response}")
             return ai_response
             
         except Exception as e:
             print(f"❌ Error getting AI response: {e}")
-            return "Sorry, I encountered an error while processing your request."
+            return ERROR_RESPONSE
+    
+    def stream_ai_response(self, user_message: str) -> Iterator[str]:
+        """Stream the AI response as text chunks, saving the full reply to memory at the end"""
+        context, cached = self._cached_response(user_message)
+        if cached:
+            print("💬 Response from cache")
+            yield cached
+            self.memory.save_context(
+                {"input": user_message},
+                {"output": cached}
+            )
+            return
+        
+        print("🤖 Streaming AI response...")
+        parts = []
+        try:
+            # The router fails over and hedges between models until the first chunk arrives
+            for chunk in self.llm.stream(self._build_messages(user_message)):
+                if chunk.content:
+                    parts.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            print(f"❌ Error getting AI response: {e}")
+            if not parts:
+                parts.append(ERROR_RESPONSE)
+                yield ERROR_RESPONSE
+            return
+        
+        ai_response = "".join(parts).strip()
+        self._store_response(context, user_message, ai_response)
+        self.memory.save_context(
+            {"input": user_message},
+            {"output": ai_response}
+        )
+        print(f"💬 AI Response: {ai_response}")
+    
+    def speak_streaming_response(self, user_message: str) -> str:
+        """Stream the AI response and speak it sentence by sentence as it is generated"""
+        splitter = SentenceSplitter()
+        pipeline = SpeechPipeline(self.text_to_speech_bytes, self.play_audio)
+        pipeline.start()
+        
+        parts = []
+        try:
+            for chunk in self.stream_ai_response(user_message):
+                parts.append(chunk)
+                for sentence in splitter.feed(chunk):
+                    pipeline.submit(sentence)
+            
+            remainder = splitter.flush()
+            if remainder:
+                pipeline.submit(remainder)
+        finally:
+            pipeline.finish()
+        
+        return "".join(parts).strip()
+    
+    def _cached_speech(self, text: str):
+        """Look up speech in the TTS cache; returns (cache_key, cached_file)"""
+        if self.tts_cache is None:
+            return None, None
+        cache_key = DiskLRUCache.make_key(text, self.tts_language)
+        return cache_key, self.tts_cache.get(cache_key)
+    
+    def _store_speech(self, cache_key: Optional[str], audio_bytes: bytes) -> str:
+        """Save synthesized MP3 bytes to the cache, or to a temporary file without one"""
+        if cache_key is not None:
+            return self.tts_cache.put(cache_key, audio_bytes)
+        
+        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as temp_file:
+            temp_file.write(audio_bytes)
+        return temp_file.name
     
     def text_to_speech(self, text: str) -> Optional[str]:
         """Convert text to speech and save as audio file"""
         if not text:
             return None
         
+        cache_key, cached_file = self._cached_speech(text)
+        if cached_file:
+            print(f"🔊 Audio from cache: {cached_file}")
+            return cached_file
+        
         print("🔊 Converting text to speech...")
         try:
-            # Create TTS object
-            tts = gTTS(text=text, lang=self.tts_language, slow=False)
+            # Parts of long replies are fetched in parallel and joined in order
+            audio_bytes = self.tts_client.synthesize(text, self.tts_language)
+            audio_file = self._store_speech(cache_key, audio_bytes)
             
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False)
-            tts.save(temp_file.name)
-            
-            print(f"🔊 Audio saved: {temp_file.name}")
-            return temp_file.name
+            print(f"🔊 Audio saved: {audio_file}")
+            return audio_file
             
         except Exception as e:
             print(f"❌ Error converting text to speech: {e}")
             return None
     
-    def play_audio(self, audio_file_path: str) -> None:
-        """Play audio file"""
+    def text_to_speech_bytes(self, text: str) -> Optional[bytes]:
+        """Convert text to MP3 bytes in memory, without writing a temporary file"""
+        if not text:
+            return None
+        
+        cache_key = DiskLRUCache.make_key(text, self.tts_language) if self.tts_cache is not None else None
+        if cache_key is not None:
+            cached = self.tts_cache.get_bytes(cache_key)
+            if cached:
+                print("🔊 Audio from cache")
+                return cached
+        
+        print("🔊 Converting text to speech...")
         try:
-            pygame.mixer.music.load(audio_file_path)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to complete
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-                
+            audio_bytes = self.tts_client.synthesize(text, self.tts_language)
+            if cache_key is not None:
+                self.tts_cache.put(cache_key, audio_bytes)
+            return audio_bytes
+        except Exception as e:
+            print(f"❌ Error converting text to speech: {e}")
+            return None
+    
+    def play_audio(self, audio: Union[str, bytes], wait: bool = True) -> bool:
+        """
+        Play an audio file or MP3 bytes from memory
+        
+        Returns False if playback failed or was cut short with stop_playback().
+        With wait=False it returns as soon as playback has started.
+        """
+        try:
+            if isinstance(audio, str):
+                audio = self._read_audio_file(audio)
+            try:
+                player = self.player
+                done = player.play(audio)
+            except Exception as e:
+                print(f"⚠️ In-memory playback unavailable ({e}), falling back to pygame")
+                return self._play_with_pygame(audio)
+            if not wait:
+                return True
+            done.wait()
+            return not player.interrupted
         except Exception as e:
             print(f"❌ Error playing audio: {e}")
+            return False
+    
+    def _play_with_pygame(self, audio: bytes) -> bool:
+        """Blocking playback through the pygame mixer"""
+        pygame = self._ensure_mixer()
+        pygame.mixer.music.load(io.BytesIO(audio), "mp3")
+        pygame.mixer.music.play()
+        while pygame.mixer.music.get_busy():
+            time.sleep(0.02)
+        return True
+    
+    def stop_playback(self) -> None:
+        """Interrupt the reply being played (barge-in)"""
+        if self._shared.player is not None:
+            self._shared.player.stop()
     
     def cleanup_audio_file(self, audio_file_path: str) -> None:
         """Clean up temporary audio file"""
+        if self.tts_cache is not None and self.tts_cache.contains_path(audio_file_path):
+            return  # Cached speech is reused, not deleted
         try:
             if os.path.exists(audio_file_path):
                 os.unlink(audio_file_path)
         except Exception as e:
             print(f"Warning: Could not delete audio file {audio_file_path}: {e}")
     
-    def process_voice_input(self, audio_file_path: str) -> None:
-        """Complete pipeline: audio -> text -> AI response -> speech"""
-        tts_file = None
+    def cleanup_input_audio(self, audio: AudioInput) -> None:
+        """Clean up an input recording once processed"""
+        # Only cleanup input file if it's a temporary file (starts with /tmp or /var/tmp)
+        if isinstance(audio, str) and (audio.startswith('/tmp/') or audio.startswith('/var/tmp/')):
+            self.cleanup_audio_file(audio)
+    
+    def _read_audio_file(self, audio_file_path: str) -> bytes:
+        """Read synthesized audio into memory for returning to a remote client"""
+        with open(audio_file_path, "rb") as f:
+            return f.read()
+    
+    def process_voice_input(self, audio_file_path: AudioInput) -> Dict[str, Any]:
+        """
+        Complete pipeline: audio -> text -> AI response -> speech
+        
+        Returns the turn as a dict with "transcript", "response" and "audio" (MP3 bytes,
+        only filled in headless mode; otherwise the reply is played on this machine).
+        """
+        turn = {"transcript": None, "response": None, "audio": None}
         try:
             # Step 1: Transcribe audio
             transcribed_text = self.transcribe_audio(audio_file_path)
             if not transcribed_text:
                 print("❌ No text transcribed from audio")
-                return
+                return turn
             
+            turn = self.process_transcript(transcribed_text)
+            
+        except Exception as e:
+            print(f"❌ Error in voice processing pipeline: {e}")
+        finally:
+            self.cleanup_input_audio(audio_file_path)
+        return turn
+    
+    def process_transcript(self, transcribed_text: str,
+                           speculation: Optional[SpeculativeResponder] = None) -> Dict[str, Any]:
+        """Pipeline after transcription: text -> AI response -> speech"""
+        turn = {"transcript": transcribed_text, "response": None, "audio": None}
+        if self.pipelined_tts and not self.headless and speculation is None:
+            try:
+                turn["response"] = self.speak_streaming_response(transcribed_text)
+            except Exception as e:
+                print(f"❌ Error in voice processing pipeline: {e}")
+            return turn
+        
+        try:
             # Step 2: Get AI response
-            ai_response = self.get_ai_response(transcribed_text)
+            ai_response = self.get_ai_response(transcribed_text, speculation)
             if not ai_response:
                 print("❌ No AI response received")
-                return
+                return turn
+            turn["response"] = ai_response
             
             # Step 3: Convert response to speech
-            tts_file = self.text_to_speech(ai_response)
-            if not tts_file:
+            audio = self.text_to_speech_bytes(ai_response)
+            if not audio:
                 print("❌ Failed to convert response to speech")
-                return
+                return turn
+            
+            # Step 4: Play the response (or hand it back when serving remote clients)
+            if self.headless:
+                turn["audio"] = audio
+            else:
+                print("🔊 Playing AI response...")
+                self.play_audio(audio)
+            
+        except Exception as e:
+            print(f"❌ Error in voice processing pipeline: {e}")
+        return turn
+    
+    # Async API: the same pipeline without blocking the caller's event loop
+    
+    async def atranscribe_audio(self, audio: AudioInput) -> str:
+        """Async transcribe_audio; Whisper runs on the bounded ASR executor"""
+        print("🔄 Transcribing audio...")
+        try:
+            loop = asyncio.get_running_loop()
+            audio = await loop.run_in_executor(None, self._prepare_for_asr, audio)
+            if audio is None:
+                return ""
+            cache_key, cached = await loop.run_in_executor(None, self._cached_transcript, audio)
+            if cached is not None:
+                print(f"📝 Transcription (cached): {cached}")
+                return cached
+            
+            if self._use_longform(audio):
+                result = await loop.run_in_executor(self.asr_executor, self.transcribe_long_audio, audio)
+                transcribed_text = result["text"]
+            elif self.asr_batcher is not None:
+                transcribed_text = await asyncio.wrap_future(
+                    self.asr_batcher.submit((audio, self._decode_options()))
+                )
+            else:
+                result = await loop.run_in_executor(self.asr_executor, self._run_whisper, audio)
+                transcribed_text = result["text"].strip()
+            print(f"📝 Transcription: {transcribed_text}")
+            await loop.run_in_executor(None, self._store_transcript, cache_key, transcribed_text)
+            return transcribed_text
+        except Exception as e:
+            print(f"❌ Error transcribing audio: {e}")
+            return ""
+    
+    async def aget_ai_response(self, user_message: str) -> str:
+        """Async get_ai_response through the model router"""
+        print("🤖 Getting AI response...")
+        try:
+            loop = asyncio.get_running_loop()
+            # Semantic lookups may call the embedding API, so keep them off the event loop
+            context, cached = await loop.run_in_executor(None, self._cached_response, user_message)
+            if cached:
+                print("💬 Response from cache")
+                ai_response = cached
+            else:
+                response = await self.llm.ainvoke(self._build_messages(user_message))
+                ai_response = response.content.strip()
+            if not cached:
+                await loop.run_in_executor(None, self._store_response, context, user_message, ai_response)
             
-            # Step 4: Play the response
-            print("🔊 Playing AI response...")
-            self.play_audio(tts_file)
+            # Budgeted memory may call the LLM to summarize, so keep it off the event loop
+            await loop.run_in_executor(
+                None,
+                self.memory.save_context,
+                {"input": user_message},
+                {"output": ai_response}
+            )
+            
+            print(f"💬 AI Response: {ai_response}")
+            return ai_response
+            
+        except Exception as e:
+            print(f"❌ Error getting AI response: {e}")
+            return ERROR_RESPONSE
+    
+    async def astream_ai_response(self, user_message: str) -> AsyncIterator[str]:
+        """Async stream_ai_response: yields text chunks as the model produces them"""
+        loop = asyncio.get_running_loop()
+        # Semantic lookups may call the embedding API, so keep them off the event loop
+        context, cached = await loop.run_in_executor(None, self._cached_response, user_message)
+        if cached:
+            print("💬 Response from cache")
+            yield cached
+            await loop.run_in_executor(
+                None,
+                self.memory.save_context,
+                {"input": user_message},
+                {"output": cached}
+            )
+            return
+        
+        print("🤖 Streaming AI response...")
+        parts = []
+        try:
+            # The router fails over and hedges between models until the first chunk arrives
+            async for chunk in self.llm.astream(self._build_messages(user_message)):
+                if chunk.content:
+                    parts.append(chunk.content)
+                    yield chunk.content
+        except Exception as e:
+            print(f"❌ Error getting AI response: {e}")
+            if not parts:
+                yield ERROR_RESPONSE
+            return
+        
+        ai_response = "".join(parts).strip()
+        await loop.run_in_executor(None, self._store_response, context, user_message, ai_response)
+        await loop.run_in_executor(
+            None,
+            self.memory.save_context,
+            {"input": user_message},
+            {"output": ai_response}
+        )
+        print(f"💬 AI Response: {ai_response}")
+    
+    async def atext_to_speech(self, text: str) -> Optional[str]:
+        """Async text_to_speech over the pooled HTTP client"""
+        if not text:
+            return None
+        
+        cache_key, cached_file = self._cached_speech(text)
+        if cached_file:
+            print(f"🔊 Audio from cache: {cached_file}")
+            return cached_file
+        
+        print("🔊 Converting text to speech...")
+        try:
+            audio_bytes = await self.gtts_client.synthesize(text, self.tts_language)
+            audio_file = self._store_speech(cache_key, audio_bytes)
+            print(f"🔊 Audio saved: {audio_file}")
+            return audio_file
+        except Exception as e:
+            print(f"❌ Error converting text to speech: {e}")
+            return None
+    
+    async def atext_to_speech_bytes(self, text: str) -> Optional[bytes]:
+        """Async text-to-speech that returns MP3 bytes and leaves no temporary file behind"""
+        if not text:
+            return None
+        
+        cache_key = DiskLRUCache.make_key(text, self.tts_language) if self.tts_cache is not None else None
+        if cache_key is not None:
+            cached = self.tts_cache.get_bytes(cache_key)
+            if cached:
+                print("🔊 Audio from cache")
+                return cached
+        
+        print("🔊 Converting text to speech...")
+        try:
+            audio_bytes = await self.gtts_client.synthesize(text, self.tts_language)
+            if cache_key is not None:
+                self.tts_cache.put(cache_key, audio_bytes)
+            return audio_bytes
+        except Exception as e:
+            print(f"❌ Error converting text to speech: {e}")
+            return None
+    
+    async def aprocess_voice_input(self, audio_file_path: AudioInput) -> Dict[str, Any]:
+        """Async complete pipeline: audio -> text -> AI response -> speech"""
+        turn = {"transcript": None, "response": None, "audio": None}
+        try:
+            transcribed_text = await self.atranscribe_audio(audio_file_path)
+            if not transcribed_text:
+                print("❌ No text transcribed from audio")
+                return turn
+            
+            turn = await self.aprocess_transcript(transcribed_text)
             
         except Exception as e:
             print(f"❌ Error in voice processing pipeline: {e}")
         finally:
-            # Cleanup audio files
-            if tts_file:
-                self.cleanup_audio_file(tts_file)
-            # Only cleanup input file if it's a temporary file (starts with /tmp or /var/tmp)
-            if audio_file_path and (audio_file_path.startswith('/tmp/') or audio_file_path.startswith('/var/tmp/')):
-                self.cleanup_audio_file(audio_file_path)
+            self.cleanup_input_audio(audio_file_path)
+        return turn
+    
+    async def aprocess_transcript(self, transcribed_text: str) -> Dict[str, Any]:
+        """Async pipeline after transcription: text -> AI response -> speech"""
+        turn = {"transcript": transcribed_text, "response": None, "audio": None}
+        try:
+            ai_response = await self.aget_ai_response(transcribed_text)
+            if not ai_response:
+                print("❌ No AI response received")
+                return turn
+            turn["response"] = ai_response
+            
+            audio = await self.atext_to_speech_bytes(ai_response)
+            if not audio:
+                print("❌ Failed to convert response to speech")
+                return turn
+            
+            if self.headless:
+                turn["audio"] = audio
+            else:
+                print("🔊 Playing AI response...")
+                await asyncio.get_running_loop().run_in_executor(None, self.play_audio, audio)
+            
+        except Exception as e:
+            print(f"❌ Error in voice processing pipeline: {e}")
+        return turn
+
+
+STARTUP_TIMINGS["import voice_ai_app"] = time.perf_counter() - _IMPORT_STARTED
 
 
 def main():
@@ -356,35 +1541,132 @@ def main():
     # Get configuration from environment
     tts_language = os.getenv("DEFAULT_TTS_LANGUAGE", "en")
     whisper_model = os.getenv("WHISPER_MODEL", "base")
+    asr_backend = os.getenv("ASR_BACKEND", "whisper")
+    whisper_quantize = _env_flag("WHISPER_QUANTIZE")
+    target_rtf = float(os.getenv("WHISPER_TARGET_RTF", "0.5"))
+    decode_profile = os.getenv("WHISPER_DECODE_PROFILE", "default")
+    asr_warm_up = _env_flag("ASR_WARMUP", True)
+    in_memory_recording = _env_flag("RECORD_IN_MEMORY")
+    max_record_seconds = float(os.getenv("MAX_RECORD_SECONDS", "120"))
+    streaming_asr = _env_flag("STREAMING_ASR")
+    speech_threshold = float(os.getenv("SPEECH_THRESHOLD", "0")) or None
+    no_speech_timeout_seconds = float(os.getenv("NO_SPEECH_TIMEOUT_SECONDS", "8"))
+    pipelined_tts = _env_flag("PIPELINED_TTS")
+    speculative_llm = _env_flag("SPECULATIVE_LLM")
+    tts_cache_dir = os.getenv("TTS_CACHE_DIR") or None
+    tts_cache_max_mb = float(os.getenv("TTS_CACHE_MAX_MB", "100"))
+    tts_connections = int(os.getenv("TTS_CONNECTIONS", "8"))
+    asr_cache_dir = os.getenv("ASR_CACHE_DIR") or None
+    asr_cache_max_mb = float(os.getenv("ASR_CACHE_MAX_MB", "20"))
+    memory_token_budget = int(os.getenv("MEMORY_TOKEN_BUDGET", "0")) or None
+    memory_keep_turns = int(os.getenv("MEMORY_KEEP_TURNS", "4"))
+    vad_trim = _env_flag("VAD_TRIM", True)
+    vad_energy_threshold = float(os.getenv("VAD_ENERGY_THRESHOLD", "0")) or None
+    longform_workers = int(os.getenv("LONGFORM_WORKERS", "0"))
+    longform_min_seconds = float(os.getenv("LONGFORM_MIN_SECONDS", "60"))
+    asr_server_socket = os.getenv("ASR_SERVER_SOCKET") or None
+    llm_models = llm_models_from_env()
+    llm_hedging = _env_flag("LLM_HEDGING", True)
+    response_cache_size = int(os.getenv("RESPONSE_CACHE_SIZE", "500"))
+    response_cache_ttl_seconds = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+    response_cache_embeddings = os.getenv("RESPONSE_CACHE_EMBEDDINGS") or None
+    response_cache_threshold = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0")) or None
+    echo_gate_ratio = float(os.getenv("ECHO_GATE_RATIO", "0")) or None
+    barge_in = _env_flag("BARGE_IN", True)
     
     try:
         # Initialize Voice AI
         voice_ai = VoiceAI(
             tts_language=tts_language,
-            whisper_model=whisper_model
+            whisper_model=whisper_model,
+            asr_backend=asr_backend,
+            whisper_quantize=whisper_quantize,
+            target_rtf=target_rtf,
+            decode_profile=decode_profile,
+            in_memory_recording=in_memory_recording,
+            max_record_seconds=max_record_seconds,
+            speech_threshold=speech_threshold,
+            no_speech_timeout_seconds=no_speech_timeout_seconds,
+            pipelined_tts=pipelined_tts,
+            speculative_llm=speculative_llm,
+            tts_cache_dir=tts_cache_dir,
+            tts_cache_max_mb=tts_cache_max_mb,
+            tts_connections=tts_connections,
+            asr_cache_dir=asr_cache_dir,
+            asr_cache_max_mb=asr_cache_max_mb,
+            memory_token_budget=memory_token_budget,
+            memory_keep_turns=memory_keep_turns,
+            vad_trim=vad_trim,
+            vad_energy_threshold=vad_energy_threshold,
+            longform_workers=longform_workers,
+            longform_min_seconds=longform_min_seconds,
+            asr_server_socket=asr_server_socket,
+            llm_models=llm_models,
+            llm_hedging=llm_hedging,
+            response_cache_size=response_cache_size,
+            response_cache_ttl_seconds=response_cache_ttl_seconds,
+            response_cache_embeddings=response_cache_embeddings,
+            response_cache_threshold=response_cache_threshold
         )
         
+        if "--startup-report" in sys.argv:
+            # Load every subsystem eagerly and print where the time went
+            voice_ai.warm_up()
+            print(format_startup_report())
+            return
+        
+        if asr_warm_up:
+            voice_ai.start_asr_warm_up()
+        
         print(f"🔧 Configuration:")
         print(f"   TTS Language: {tts_language}")
-        print(f"   Whisper Model: {whisper_model}")
+        print(f"   Whisper Model: {whisper_model} ({asr_backend}{', int8' if whisper_quantize else ''})")
+        print(f"   Decode Profile: {decode_profile}")
+        print(f"   LLM Models: {' -> '.join(llm_models)} (hedging {'on' if llm_hedging else 'off'})")
+        print(f"   ASR Server: {asr_server_socket or 'disabled'}")
+        print(f"   In-memory Recording: {in_memory_recording}")
+        print(f"   Streaming ASR: {streaming_asr} (speech threshold {speech_threshold or 'adaptive'})")
+        print(f"   Pipelined TTS: {pipelined_tts}")
+        print(f"   Speculative LLM: {speculative_llm}")
+        print(f"   TTS Cache: {tts_cache_dir or 'disabled'}")
+        print(f"   Transcript Cache: {asr_cache_dir or 'disabled'}")
+        print(f"   Response Cache: {response_cache_size or 'disabled'}"
+              f"{f' (+{response_cache_embeddings} similarity)' if response_cache_size and response_cache_embeddings else ''}")
+        print(f"   Memory Token Budget: {memory_token_budget or 'unlimited'}")
+        print(f"   Silence Trimming: {vad_trim}")
+        print(f"   Long-form Workers: {longform_workers or 'disabled'}")
+        print(f"   Barge-in: {barge_in} (echo gate ratio {echo_gate_ratio or 'calibrated at start'})")
         print()
         
         while True:
             print("🎙️ Voice AI Menu:")
-            print("1. Record audio (Press Enter to stop)")
+            if streaming_asr:
+                print("1. Record audio (stops when you finish speaking)")
+            else:
+                print("1. Record audio (Press Enter to stop)")
             print("2. Upload audio file")
             print("3. Text chat")
             print("4. Change TTS language")
-            print("5. Exit")
+            print("5. Hands-free conversation (Ctrl+C to return to the menu)")
+            print("6. Exit")
             
-            choice = input("\nSelect an option (1-5): ").strip()
+            choice = input("\nSelect an option (1-6): ").strip()
             
-            if choice == "1":
+            if choice == "1" and streaming_asr:
+                # Record with live transcription and automatic end of speech
+                speculation = voice_ai.start_speculation()
+                transcribed_text = voice_ai.listen(speculation)
+                if transcribed_text:
+                    voice_ai.process_transcript(transcribed_text, speculation)
+                elif speculation is not None:
+                    speculation.cancel()
+            
+            elif choice == "1":
                 # Record audio
                 voice_ai.start_recording()
                 input()  # Wait for Enter to stop
                 audio_file = voice_ai.stop_recording()
-                if audio_file:
+                if audio_file is not None:
                     voice_ai.process_voice_input(audio_file)
             
             elif choice == "2":
@@ -398,12 +1680,13 @@ def main():
             elif choice == "3":
                 # Text chat
                 user_input = input("You: ").strip()
-                if user_input:
+                if user_input and pipelined_tts:
+                    voice_ai.speak_streaming_response(user_input)
+                elif user_input:
                     ai_response = voice_ai.get_ai_response(user_input)
-                    tts_file = voice_ai.text_to_speech(ai_response)
-                    if tts_file:
-                        voice_ai.play_audio(tts_file)
-                        voice_ai.cleanup_audio_file(tts_file)
+                    audio = voice_ai.text_to_speech_bytes(ai_response)
+                    if audio:
+                        voice_ai.play_audio(audio)
             
             elif choice == "4":
                 # Change TTS language
@@ -413,6 +1696,34 @@ def main():
                     print(f"✅ TTS language changed to: {new_lang}")
             
             elif choice == "5":
+                # Microphone stays open while replies play; speak over a reply to interrupt it
+                DuplexConversation(voice_ai, echo_ratio=echo_gate_ratio, barge_in=barge_in).run()
+            
+            elif choice == "6":
+                if voice_ai.tts_cache is not None:
+                    stats = voice_ai.tts_cache.stats()
+                    print(f"📊 TTS cache: {stats['hits']} hits, {stats['misses']} misses")
+                if voice_ai.asr_cache is not None:
+                    stats = voice_ai.asr_cache.stats()
+                    print(f"📊 Transcript cache: {stats['hits']} hits, {stats['misses']} misses")
+                if voice_ai.response_cache is not None:
+                    stats = voice_ai.response_cache.stats()
+                    print(f"📊 Response cache: {stats['exact_hits']} exact and {stats['semantic_hits']} "
+                          f"similar hits, {stats['misses']} misses")
+                if voice_ai.vad is not None:
+                    stats = voice_ai.vad.stats()
+                    print(f"📊 Silence trimming: {stats['seconds_removed']:.1f}s of "
+                          f"{stats['seconds_in']:.1f}s removed, "
+                          f"{stats['silent_inputs']} silent recordings skipped")
+                if voice_ai._shared.llm is not None:
+                    for model, stats in voice_ai.llm.stats()["models"].items():
+                        latency = f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s" if stats["p95"] else "too few calls"
+                        print(f"📊 {model}: {stats['calls']} calls, {stats['failures']} failed, "
+                              f"{latency}, breaker {stats['breaker']}")
+                if voice_ai.speculative_llm:
+                    stats = voice_ai.speculation_stats.stats()
+                    print(f"📊 Speculative LLM: {stats['hits']}/{stats['turns']} replies reused "
+                          f"({stats['hit_rate']:.0%}), {stats['wasted_calls']} of {stats['calls']} calls wasted")
                 print("👋 Goodbye!")
                 break
             